@@ -0,0 +1,39 @@
+import numpy as np
+
+# Named aggregations used for the per-symbol summary table
+SUMMARY_AGGREGATIONS = {
+    "period_start": ("Date", "min"),
+    "period_end": ("Date", "max"),
+    "period_days": ("Date", "count"),
+    "avg_close": ("Close", "mean"),
+    "avg_daily_return": ("daily_return", "mean"),
+    "total_return": ("Close", lambda x: (x.iloc[-1] / x.iloc[0]) - 1 if len(x) > 1 and x.iloc[0] != 0 else np.nan),
+    "volatility_21": ("volatility_21", "mean"),
+    "avg_rolling_yield_21": ("rolling_yield_21", "mean"),
+    "avg_sharpe_21": ("sharpe_21", "mean"),
+    "avg_max_drawdown_63": ("max_drawdown_63", "mean"),
+    "avg_custom_risk_score": ("custom_risk_score", "mean"),
+}
+SUMMARY_METRICS = tuple(SUMMARY_AGGREGATIONS)
+
+
+def calculate_summary_statistics(filtered_df, metrics=SUMMARY_METRICS):
+    """Per-symbol summary statistics over an already filtered slice of the dataset"""
+    aggregations = {name: SUMMARY_AGGREGATIONS[name] for name in metrics}
+    return (
+        filtered_df
+        .groupby("symbol")
+        .agg(**aggregations)
+        .reset_index()
+    )
+
+
+def build_portfolio_context(summary, selected_symbols):
+    """Selection-wide averages and extremes that individual stock insights are measured against"""
+    return {
+        'avg_return': summary['total_return'].mean(),
+        'avg_volatility': summary['volatility_21'].mean() if 'volatility_21' in summary.columns else 0,
+        'portfolio_size': len(selected_symbols),
+        'best_performer': summary.loc[summary['total_return'].idxmax(), 'symbol'] if not summary.empty else None,
+        'worst_performer': summary.loc[summary['total_return'].idxmin(), 'symbol'] if not summary.empty else None
+    }
@@ -1,13 +1,44 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
 import datetime
+import os
+from analytics import calculate_summary_statistics, build_portfolio_context, SUMMARY_METRICS
+from compute_cache import get_cache, make_key, all_cache_stats
+from correlation import build_wide_returns, IncrementalCorrelation, available_lookbacks, load_neighbor_index, UNIVERSE_CORRELATION_DIR
+from datastore import current_version, dataset_path, read_snapshot, build_snapshot, delta_chain, read_delta, apply_delta, append_merge
+from intraday import provisional_meta, read_provisional
+from history_store import configured_store
+from reference_data import SYMBOL_NAMES, SECTOR_MAPPING, QUICK_CATEGORIES
+from styles import APP_STYLE_TAG
+from charts import (
+    normalized_performance_series, cached_figure_spec, basket_figure_inputs, figure_from_spec,
+    create_risk_return_scatter, create_performance_chart, create_portfolio_metrics_chart,
+    create_correlation_heatmap, DEFAULT_POINT_BUDGET,
+)
+from insights import build_insight_table, render_insights, performance_indicator, PERFORMANCE_INDICATORS
+from search_index import SymbolSearchIndex
+from instrumentation import timed, record, snapshot as instrumentation_snapshot
 TRANSFORMERS_AVAILABLE = False
 pipeline = None
 
+# Fragments rerun only their own body on interaction; without them every click reruns the whole app
+FRAGMENTS_AVAILABLE = hasattr(st, "fragment")
+if FRAGMENTS_AVAILABLE:
+    fragment = st.fragment
+else:
+    def fragment(func):
+        return func
+
+def rerun_fragment():
+    """Rerun the enclosing fragment only (full rerun on Streamlit versions without fragments)"""
+    if FRAGMENTS_AVAILABLE:
+        try:
+            st.rerun(scope="fragment")
+        except st.errors.StreamlitAPIException:
+            # Fragment-scoped reruns are only allowed while the fragment itself is rerunning
+            pass
+    st.rerun()
+
 # Page configuration
 st.set_page_config(
     page_title="BullBoard - Advanced Stock Analytics",
@@ -15,384 +46,8 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="expanded"
 )
-# Custom CSS styling
-st.markdown("""
-<style>
-    /* Import Google Fonts */
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-    
-    /* Global Styles */
-    .main > div {
-        padding-top: 2rem;
-    }
-    
-    h1, h2, h3 {
-        font-family: 'Inter', sans-serif;
-        font-weight: 600;
-    }
-    
-    /* Enhanced Header Styling */
-   .main-header {
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
-    padding: 2.5rem 2rem;
-    border-radius: 20px;
-    color: white;
-    margin-bottom: 2rem;
-    box-shadow: 0 12px 40px rgba(102, 126, 234, 0.3);
-    position: relative;
-    overflow: hidden;
-}
-
-.main-header::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    right: 0;
-    bottom: 0;
-    background: url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100"><defs><pattern id="grain" width="100" height="100" patternUnits="userSpaceOnUse"><circle cx="25" cy="25" r="1" fill="white" opacity="0.1"/><circle cx="75" cy="75" r="1" fill="white" opacity="0.1"/><circle cx="50" cy="10" r="0.5" fill="white" opacity="0.1"/><circle cx="20" cy="80" r="0.5" fill="white" opacity="0.1"/></pattern></defs><rect width="100" height="100" fill="url(%23grain)"/></svg>');
-    pointer-events: none;
-}
-
-.header-content {
-    display: flex;
-    justify-content: space-between;
-    align-items: center;
-    flex-wrap: wrap;
-    position: relative;
-    z-index: 1;
-}
-
-.logo-section {
-    display: flex;
-    align-items: center;
-    gap: 1rem;
-}
-
-.logo-icon {
-    font-size: 3.5rem;
-    filter: drop-shadow(2px 2px 4px rgba(0,0,0,0.3));
-}
-
-.logo-text h1 {
-    margin: 0;
-    font-size: 3rem;
-    font-weight: 800;
-    background: linear-gradient(45deg, #ffffff, #f8f9ff);
-    -webkit-background-clip: text;
-    -webkit-text-fill-color: transparent;
-    background-clip: text;
-    text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-}
-
-.tagline {
-    font-size: 1.2rem;
-    font-weight: 500;
-    opacity: 0.95;
-    margin-top: 0.25rem;
-}
-
-.value-props {
-    display: flex;
-    gap: 2rem;
-    flex-wrap: wrap;
-}
-
-.prop-item {
-    display: flex;
-    flex-direction: column;
-    align-items: center;
-    gap: 0.5rem;
-    padding: 1rem;
-    background: rgba(255, 255, 255, 0.15);
-    border-radius: 12px;
-    backdrop-filter: blur(10px);
-    border: 1px solid rgba(255, 255, 255, 0.2);
-    transition: transform 0.3s ease;
-}
-
-.prop-item:hover {
-    transform: translateY(-3px);
-    background: rgba(255, 255, 255, 0.2);
-}
-
-.prop-icon {
-    font-size: 1.8rem;
-}
-
-.prop-text {
-    font-size: 0.9rem;
-    font-weight: 600;
-    text-align: center;
-    white-space: nowrap;
-}
-
-.header-subtitle {
-    text-align: center;
-    margin-top: 1.5rem;
-    font-size: 1rem;
-    opacity: 0.9;
-    font-weight: 400;
-    position: relative;
-    z-index: 1;
-}
-
-/* Responsive adjustments */
-@media (max-width: 768px) {
-    .header-content {
-        flex-direction: column;
-        gap: 1.5rem;
-        text-align: center;
-    }
-    
-    .value-props {
-        justify-content: center;
-        gap: 1rem;
-    }
-    
-    .logo-text h1 {
-        font-size: 2.5rem;
-    }
-    
-    .tagline {
-        font-size: 1rem;
-    }
-}
-    
-/* Metric Cards - Fixed height and text positioning */
-.metric-card {
-    background: linear-gradient(145deg, #ffffff 0%, #f8fafc 50%, #ffffff 100%);
-    border: 1px solid #e2e8f0;
-    border-radius: 20px;
-    padding: 20px;
-    box-shadow: 
-        0 4px 6px -1px rgba(0, 0, 0, 0.1),
-        0 2px 4px -1px rgba(0, 0, 0, 0.06),
-        inset 0 1px 0 rgba(255, 255, 255, 0.6);
-    height: 160px; /* Increased from 140px */
-    display: flex;
-    flex-direction: column;
-    justify-content: space-between;
-    margin: 8px 0;
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-    position: relative;
-    overflow: hidden;
-}
-
-.metric-card:hover {
-    transform: translateY(-4px) scale(1.02);
-    box-shadow: 
-        0 12px 25px rgba(102, 126, 234, 0.15),
-        0 8px 10px rgba(0, 0, 0, 0.1),
-        inset 0 1px 0 rgba(255, 255, 255, 0.6);
-    border-color: rgba(102, 126, 234, 0.3);
-}
-
-.metric-card::before {
-    content: '';
-    position: absolute;
-    top: 0;
-    left: 0;
-    width: 5px;
-    height: 100%;
-    background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
-    border-radius: 0 2px 2px 0;
-}
-
-.metric-card::after {
-    content: '';
-    position: absolute;
-    top: -50%;
-    right: -50%;
-    width: 100px;
-    height: 100px;
-    background: radial-gradient(circle, rgba(102, 126, 234, 0.05) 0%, transparent 70%);
-    border-radius: 50%;
-}
-
-.metric-header {
-    display: flex;
-    align-items: center;
-    margin-bottom: 12px;
-    position: relative;
-    z-index: 1;
-}
-
-.metric-icon {
-    font-size: 18px;
-    margin-right: 10px;
-    filter: drop-shadow(0 1px 2px rgba(0, 0, 0, 0.1));
-}
-
-.metric-title {
-    font-size: 11px !important;
-    font-weight: 700 !important;
-    color: #64748b !important;
-    text-transform: uppercase !important;
-    letter-spacing: 0.8px !important;
-    line-height: 1.2 !important;
-}
-
-.metric-value {
-    font-size: 28px !important; /* Slightly smaller to make room */
-    font-weight: 800 !important;
-    color: #1e293b !important;
-    margin: 8px 0 12px 0 !important; /* Added bottom margin */
-    line-height: 1.1 !important;
-    position: relative;
-    z-index: 1;
-    text-shadow: 0 1px 2px rgba(0, 0, 0, 0.05);
-}
-
-.metric-subtitle {
-    font-size: 13px !important; /* Slightly smaller but still readable */
-    color: #667eea !important;
-    font-weight: 600 !important;
-    position: relative;
-    z-index: 1;
-    text-transform: capitalize;
-    line-height: 1.2 !important;
-    margin-bottom: 4px !important; /* Add bottom margin */
-    display: block !important; /* Ensure it displays properly */
-}
-
-/* Section Headers - Keep existing styles */
-.section-header {
-    display: flex;
-    align-items: center;
-    margin: 2rem 0 1.5rem 0;
-    padding-bottom: 0.75rem;
-    border-bottom: 2px solid #e2e8f0;
-}
-
-.section-icon {
-    font-size: 1.5rem;
-    margin-right: 0.75rem;
-}
-
-.section-header h2 {
-    margin: 0 !important;
-    color: #ffffff !important;
-    font-weight: 600 !important;
-    font-size: 1.5rem !important;
-}
-
-/* Fix for dark theme text visibility */
-h1, h2, h3, h4, h5, h6 {
-    color: #ffffff !important;
-}
-
-.main .block-container {
-    color: #ffffff;
-}
-
-/* Additional refinements */
-.element-container {
-    margin-bottom: 0 !important;
-}
-
-/* Responsive adjustments for cards */
-@media (max-width: 768px) {
-    .metric-card {
-        height: 120px;
-        padding: 16px;
-    }
-    
-    .metric-value {
-        font-size: 24px !important;
-    }
-    
-    .metric-title {
-        font-size: 10px !important;
-    }
-}
-
-/* Section Headers - Fixed colors */
-.section-header {
-    display: flex;
-    align-items: center;
-    margin: 2rem 0 1.5rem 0;
-    padding-bottom: 0.75rem;
-    border-bottom: 2px solid #e2e8f0;
-}
-
-.section-icon {
-    font-size: 1.5rem;
-    margin-right: 0.75rem;
-}
-
-.section-header h2 {
-    margin: 0 !important;
-    color: #ffffff !important;
-    font-weight: 600 !important;
-    font-size: 1.5rem !important;
-}
-
-/* Fix for dark theme text visibility */
-h1, h2, h3, h4, h5, h6 {
-    color: #ffffff !important;
-}
-
-.main .block-container {
-    color: #ffffff;
-}
-    
-    /* Status Cards */
-    .status-card {
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 0.5rem 0;
-        border-left: 4px solid;
-    }
-    
-    .status-success {
-        background: #d5f4e6;
-        border-color: #2ecc71;
-        color: #27ae60;
-    }
-    
-    .status-warning {
-        background: #fef9e7;
-        border-color: #f39c12;
-        color: #e67e22;
-    }
-    
-    .status-info {
-        background: #ebf3fd;
-        border-color: #3498db;
-        color: #2980b9;
-    }
-    
-    /* AI Insight Cards */
-    .ai-insight {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        padding: 1rem;
-        border-radius: 8px;
-        margin: 0.5rem 0;
-        border-left: 4px solid #ffd700;
-    }
-    
-    /* Section Headers */
-    .section-header {
-        display: flex;
-        align-items: center;
-        margin: 2rem 0 1rem 0;
-        padding-bottom: 0.5rem;
-        border-bottom: 2px solid #ecf0f1;
-    }
-    
-    .section-icon {
-        font-size: 1.5rem;
-        margin-right: 0.5rem;
-    }
-    
-    /* Hide Streamlit Branding */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-</style>
-""", unsafe_allow_html=True)
+# Custom CSS styling (combined and minified once per process in styles.py)
+st.markdown(APP_STYLE_TAG, unsafe_allow_html=True)
 
 def create_header():
     """Create an enhanced, more appealing header section"""
@@ -444,70 +99,6 @@ def create_metric_card(title, value, subtitle="", icon="📊"):
     # Return empty string to prevent "None" from appearing
     return ""
         
-def calculate_comprehensive_risk_profile(symbol, data):
-    """Calculate a comprehensive risk assessment"""
-    risk_factors = {}
-    
-    # 1. Volatility Risk
-    volatility = data.get('volatility_21', 0)
-    if volatility > 0.08:
-        risk_factors['volatility'] = {'level': 'High', 'score': 3, 'description': f'Significant price swings ({volatility:.1%} volatility)'}
-    elif volatility > 0.05:
-        risk_factors['volatility'] = {'level': 'Moderate', 'score': 2, 'description': f'Moderate price fluctuations ({volatility:.1%} volatility)'}
-    else:
-        risk_factors['volatility'] = {'level': 'Low', 'score': 1, 'description': f'Relatively stable price movements ({volatility:.1%} volatility)'}
-    
-    # 2. Drawdown Risk
-    max_drawdown = data.get('avg_max_drawdown_63', 0)
-    if max_drawdown > 0.20:
-        risk_factors['drawdown'] = {'level': 'High', 'score': 3, 'description': f'Large peak-to-trough declines ({max_drawdown:.1%})'}
-    elif max_drawdown > 0.10:
-        risk_factors['drawdown'] = {'level': 'Moderate', 'score': 2, 'description': f'Moderate downside exposure ({max_drawdown:.1%})'}
-    else:
-        risk_factors['drawdown'] = {'level': 'Low', 'score': 1, 'description': f'Limited downside risk ({max_drawdown:.1%})'}
-    
-    # 3. Consistency Risk
-    sharpe = data.get('avg_sharpe_21', 0)
-    if sharpe < 0.5:
-        risk_factors['consistency'] = {'level': 'High', 'score': 3, 'description': f'Inconsistent return patterns (Sharpe: {sharpe:.2f})'}
-    elif sharpe < 1.0:
-        risk_factors['consistency'] = {'level': 'Moderate', 'score': 2, 'description': f'Moderately consistent returns (Sharpe: {sharpe:.2f})'}
-    else:
-        risk_factors['consistency'] = {'level': 'Low', 'score': 1, 'description': f'Consistent return generation (Sharpe: {sharpe:.2f})'}
-    
-    return risk_factors
-
-def analyze_performance_context(symbol, data, portfolio_context):
-    """Analyze performance in context of market and peers"""
-    insights = []
-    
-    total_return = data.get('total_return', 0)
-    symbol_volatility = data.get('volatility_21', 0)
-    
-    # Market context
-    market_avg = portfolio_context.get('avg_return', 0)
-    market_volatility = portfolio_context.get('avg_volatility', 0.05)
-    
-    # Relative performance analysis
-    relative_performance = total_return - market_avg
-    if abs(relative_performance) > 0.05:  # 5% difference is significant
-        direction = "outperformed" if relative_performance > 0 else "underperformed"
-        insights.append(
-            f"📊 **Relative Performance**: {symbol} {direction} your selection average by {abs(relative_performance):.1%}"
-        )
-    
-    # Risk-adjusted comparison
-    if symbol_volatility < market_volatility * 0.8 and total_return > market_avg:
-        insights.append(
-            f"🎯 **Risk Efficiency**: {symbol} achieved above-average returns ({total_return:.1%}) with below-average risk ({symbol_volatility:.1%})"
-        )
-    elif symbol_volatility > market_volatility * 1.2 and total_return < market_avg:
-        insights.append(
-            f"⚠️ **Risk-Return Mismatch**: {symbol} shows higher risk ({symbol_volatility:.1%}) than average but lower returns ({total_return:.1%})"
-        )
-    
-    return insights
-
 def detect_market_regime(portfolio_data):
     """Detect current market regime with confidence levels"""
     positive_stocks = (portfolio_data['total_return'] > 0).sum()
@@ -546,111 +137,6 @@ def detect_market_regime(portfolio_data):
             'characteristics': 'Mixed signals with no clear directional bias'
         }
 
-def calculate_quality_metrics(symbol, data):
-    """Calculate objective quality metrics (0-100 scale)"""
-    metrics = {}
-    
-    # Consistency Score (based on Sharpe ratio)
-    sharpe = data.get('avg_sharpe_21', 0)
-    consistency_score = min(100, max(0, (sharpe + 1) * 40))  # Normalize to 0-100
-    
-    # Efficiency Score (return per unit of risk)
-    risk_score = data.get('avg_custom_risk_score', 0.01)
-    total_return = data.get('total_return', 0)
-    if risk_score > 0:
-        efficiency_score = min(100, max(0, (total_return / risk_score) * 5))
-    else:
-        efficiency_score = 0
-    
-    # Growth Score (annualized return potential)
-    avg_return = data.get('avg_rolling_yield_21', 0)
-    annualized_return = avg_return * 252
-    growth_score = min(100, max(0, (annualized_return + 0.1) * 200))  # Normalize
-    
-    # Overall score (weighted average)
-    overall_score = (consistency_score * 0.4 + efficiency_score * 0.4 + growth_score * 0.2)
-    
-    return {
-        'consistency': round(consistency_score, 1),
-        'efficiency': round(efficiency_score, 1),
-        'growth': round(growth_score, 1),
-        'overall': round(overall_score, 1)
-    }
-
-def generate_comprehensive_analysis(symbol, data, portfolio_context):
-    """Generate comprehensive, objective stock analysis - guaranteed insights"""
-    insights = []
-    
-    # Get all analysis components
-    risk_profile = calculate_comprehensive_risk_profile(symbol, data)
-    performance_context = analyze_performance_context(symbol, data, portfolio_context)
-    quality_metrics = calculate_quality_metrics(symbol, data)
-    
-    # Extract key metrics
-    total_return = data.get('total_return', 0)
-    volatility = data.get('volatility_21', 0)
-    sharpe_ratio = data.get('avg_sharpe_21', 0)
-    avg_return = data.get('avg_rolling_yield_21', 0)
-    
-    # 1. PERFORMANCE SUMMARY (Always included)
-    if total_return > 0.20:
-        insights.append(f"🚀 **Performance**: {symbol} generated strong {total_return:.1%} returns during the selected period")
-    elif total_return > 0.05:
-        insights.append(f"📈 **Performance**: {symbol} gained {total_return:.1%} over the analysis period")
-    elif total_return > 0:
-        insights.append(f"📊 **Performance**: {symbol} posted modest {total_return:.1%} returns")
-    elif total_return > -0.10:
-        insights.append(f"📉 **Performance**: {symbol} declined {abs(total_return):.1%} during the period")
-    else:
-        insights.append(f"📉 **Performance**: {symbol} experienced significant decline of {abs(total_return):.1%}")
-    
-    # 2. RISK ASSESSMENT (Always included)
-    volatility_info = risk_profile['volatility']
-    insights.append(f"📊 **Risk Profile**: {volatility_info['description']}")
-    
-    # 3. EFFICIENCY ANALYSIS (Always included)
-    if sharpe_ratio > 1.2:
-        insights.append(f"⭐ **Efficiency**: Excellent risk-adjusted performance with Sharpe ratio of {sharpe_ratio:.2f}")
-    elif sharpe_ratio > 0.8:
-        insights.append(f"✅ **Efficiency**: Good risk-adjusted performance with Sharpe ratio of {sharpe_ratio:.2f}")
-    elif sharpe_ratio > 0.3:
-        insights.append(f"📊 **Efficiency**: Moderate risk-adjusted performance with Sharpe ratio of {sharpe_ratio:.2f}")
-    else:
-        insights.append(f"⚠️ **Efficiency**: Below-average risk-adjusted performance with Sharpe ratio of {sharpe_ratio:.2f}")
-    
-    # 4. TREND ANALYSIS (Always included)
-    if avg_return > 0.001:
-        annualized_trend = avg_return * 252
-        insights.append(f"📈 **Trend**: Daily average return of {avg_return:.3%} projects to {annualized_trend:.1%} annualized")
-    elif avg_return < -0.001:
-        annualized_trend = avg_return * 252
-        insights.append(f"📉 **Trend**: Daily average decline of {abs(avg_return):.3%} projects to {abs(annualized_trend):.1%} annualized")
-    else:
-        insights.append(f"📊 **Trend**: Flat trend with minimal daily movement averaging {avg_return:.3%}")
-    
-    # 5. QUALITY METRICS (Always included)  
-    if quality_metrics['overall'] > 70:
-        insights.append(f"🏆 **Quality Score**: High rating of {quality_metrics['overall']}/100 across key metrics")
-    elif quality_metrics['overall'] > 50:
-        insights.append(f"📊 **Quality Score**: Moderate rating of {quality_metrics['overall']}/100 across key metrics")
-    else:
-        insights.append(f"📊 **Quality Score**: Below-average rating of {quality_metrics['overall']}/100 across key metrics")
-    
-    # 6. CONTEXT INSIGHTS (if available)
-    insights.extend(performance_context)
-    
-    # 7. DRAWDOWN ANALYSIS (Always included)
-    drawdown_info = risk_profile['drawdown']
-    insights.append(f"📊 **Downside Risk**: {drawdown_info['description']}")
-    
-    # 8. FINAL FACTUAL SUMMARY (Always included)
-    risk_category = "high-risk" if volatility > 0.08 else "moderate-risk" if volatility > 0.05 else "low-risk"
-    return_category = "strong gains" if total_return > 0.15 else "moderate gains" if total_return > 0.05 else "modest gains" if total_return > 0 else "negative returns"
-    
-    insights.append(f"📋 **Profile**: {symbol} is a {risk_category} stock showing {return_category} over your selected timeframe")
-    
-    return insights
-
 def generate_market_regime_insights(summary_data):
     """Generate market regime analysis"""
     regime = detect_market_regime(summary_data)
@@ -699,183 +185,105 @@ def generate_portfolio_optimization_insights(summary_data):
     
     return insights
 
-def create_risk_return_scatter(summary):
-    """Create interactive risk vs return scatter plot"""
-    
-    # Remove rows with NaN values that cause plotting issues
-    clean_summary = summary.dropna(subset=['avg_custom_risk_score', 'avg_rolling_yield_21', 'total_return'])
-    
-    if clean_summary.empty:
-        st.warning("No valid data available for risk-return analysis.")
-        return None
-    
-    fig = px.scatter(
-        clean_summary,
-        x='avg_custom_risk_score',
-        y='avg_rolling_yield_21',
-        size=abs(clean_summary['total_return']) + 0.01,  # Ensure no zero/negative sizes
-        color='total_return',
-        hover_name='symbol',
-        title="Risk vs Return Analysis",
-        labels={
-            'avg_custom_risk_score': 'Risk Score',
-            'avg_rolling_yield_21': 'Average Return',
-            'total_return': 'Total Return'
-        },
-        color_continuous_scale='RdYlGn'
+def get_performance_series(load_filtered_history, selected_symbols, current_dataset_version, start_date, end_date):
+    """Downsampled base-100 series, cached per (dataset version, basket, range); history is loaded only on a miss"""
+    series_cache = get_cache("performance_series", max_bytes=64 * 1024 * 1024)
+    key = make_key(current_dataset_version, selected_symbols, (start_date, end_date), ("normalized_close", f"budget={DEFAULT_POINT_BUDGET}"))
+    return series_cache.get_or_compute(
+        key,
+        lambda: normalized_performance_series(load_filtered_history(), selected_symbols, DEFAULT_POINT_BUDGET)
     )
-    
-    fig.update_layout(
-        title_font_size=16,
-        height=500,
-        showlegend=True
-    )
-    
-    return fig
 
-def create_performance_chart(filtered_df, selected_symbols):
-    """Create normalized performance comparison chart"""
-    if len(selected_symbols) == 0:
-        return None
-    
-    # Calculate normalized performance
-    perf_data = []
-    for symbol in selected_symbols:
-        symbol_data = filtered_df[filtered_df['symbol'] == symbol].sort_values('Date')
-        if not symbol_data.empty:
-            symbol_data = symbol_data.copy()
-            symbol_data['normalized'] = symbol_data['Close'] / symbol_data['Close'].iloc[0] * 100
-            perf_data.append(symbol_data[['Date', 'normalized', 'symbol']])
-    
-    if not perf_data:
-        return None
-    
-    combined_data = pd.concat(perf_data)
-    
-    fig = px.line(
-        combined_data,
-        x='Date',
-        y='normalized',
-        color='symbol',
-        title="Normalized Performance Comparison (Base 100)",
-        color_discrete_sequence=px.colors.qualitative.Set1
-    )
-    
-    fig.update_layout(
-        title={
-            'text': "Normalized Performance Comparison (Base 100)",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 20, 'family': 'Inter'}
-        },
-        xaxis_title="Date",
-        yaxis_title="Normalized Price",
-        font=dict(family="Inter", size=12),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        height=400,
-        hovermode='x unified'
-    )
-    
-    fig.update_xaxes(gridcolor='lightgray', gridwidth=0.5)
-    fig.update_yaxes(gridcolor='lightgray', gridwidth=0.5)
-    
-    return fig
+def roll_forward(cache, current_dataset_version, apply_fn, name):
+    """Newest resident entry of a per-version cache brought up to this version through the
+    ETL's published deltas, or None when no resident version has a short enough delta chain"""
+    for key in reversed(cache.keys()):
+        chain = delta_chain(key[0], current_dataset_version)
+        if chain is None:
+            continue
+        value = cache.get(key)
+        if value is None:
+            continue
+        try:
+            with timed(f"{name}.delta_apply_ms"):
+                for version in chain:
+                    value = apply_fn(value, read_delta(version))
+        except Exception as e:
+            print(f"⚠️ Could not apply deltas {chain} to {name}, reloading: {e}")
+            return None
+        print(f"✅ {name}: applied {len(chain)} delta(s) {key[0]} -> {current_dataset_version}")
+        return value
+    return None
 
-def create_portfolio_metrics_chart(summary):
-    """Create portfolio metrics comparison chart"""
-    metrics = ['volatility_21', 'avg_rolling_yield_21', 'avg_sharpe_21']
-    metric_names = ['Volatility', 'Expected Return', 'Sharpe Ratio']
-    
-    fig = make_subplots(
-        rows=1, cols=3,
-        subplot_titles=metric_names,
-        specs=[[{"secondary_y": False}, {"secondary_y": False}, {"secondary_y": False}]]
-    )
-    
-    colors = ['#e74c3c', '#2ecc71', '#3498db']
-    
-    for i, (metric, name, color) in enumerate(zip(metrics, metric_names, colors)):
-        top_5 = summary.nlargest(5, metric)
-        
-        fig.add_trace(
-            go.Bar(
-                x=top_5['symbol'],
-                y=top_5[metric],
-                name=name,
-                marker_color=color,
-                showlegend=False
-            ),
-            row=1, col=i+1
-        )
-    
-    fig.update_layout(
-        title={
-            'text': "Top 5 Stocks by Key Metrics",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 20, 'family': 'Inter'}
-        },
-        font=dict(family="Inter", size=12),
-        plot_bgcolor='rgba(0,0,0,0)',
-        paper_bgcolor='rgba(0,0,0,0)',
-        height=400
-    )
-    
-    return fig
+def get_wide_returns(load_history, current_dataset_version):
+    """Dates x symbols daily-return matrix, built once per dataset version (or rolled forward from the previous one)"""
+    wide_cache = get_cache("wide_returns", max_bytes=256 * 1024 * 1024)
+    key = (current_dataset_version,)
+    wide = wide_cache.get(key)
+    if wide is None:
+        wide = roll_forward(wide_cache, current_dataset_version, lambda wide, delta: wide.apply_delta(delta), "wide_returns")
+        if wide is None:
+            wide = build_wide_returns(load_history())
+        wide_cache.put(key, wide)
+    return wide
 
-def create_correlation_heatmap(filtered_df, selected_symbols):
-    """Create correlation heatmap for selected stocks"""
-    if len(selected_symbols) < 2:
-        return None
-    
-    # Pivot data to get returns for each stock
-    pivot_data = filtered_df.pivot(index='Date', columns='symbol', values='daily_return')
-    pivot_data = pivot_data[selected_symbols].dropna()
-    
-    if pivot_data.empty:
+def get_correlation_matrix(load_history, current_dataset_version, selected_symbols, start_date=None, end_date=None):
+    """Pairwise-complete correlations from this session's incremental correlation engine"""
+    wide = get_wide_returns(load_history, current_dataset_version)
+    # One engine per session, so concurrent sessions with different baskets don't reset each
+    # other's pair statistics; each is bounded (IncrementalCorrelation tracks at most
+    # MAX_TRACKED_SYMBOLS) and all share the version's cached wide returns
+    version, engine = st.session_state.get('correlation_engine', (None, None))
+    if engine is None or version != current_dataset_version:
+        engine = IncrementalCorrelation(wide)
+        st.session_state.correlation_engine = (current_dataset_version, engine)
+
+    # Only symbols that were added or removed since this session's last rerun are recomputed
+    engine.set_basket(selected_symbols)
+    return engine.correlation(selected_symbols, start_date, end_date)
+
+def get_snapshot(current_dataset_version, load_history):
+    """(snapshot, meta) for this dataset version: the ETL's snapshot files, else derived from the full history"""
+    snapshot_cache = get_cache("snapshots", max_bytes=16 * 1024 * 1024, persist=False)
+    key = (current_dataset_version,)
+    cached = snapshot_cache.get(key)
+    if cached is not None:
+        return cached
+    snapshot, meta = read_snapshot(current_dataset_version)
+    if snapshot is None:
+        # Written by an older ETL (or not written yet): build it from the history instead
+        snapshot, meta = build_snapshot(load_history())
+    return snapshot_cache.put(key, (snapshot, meta))
+
+def get_provisional_rows(intraday_meta):
+    """Provisional intraday rows extending the published version, read once per intraday publish"""
+    provisional_cache = get_cache("provisional_rows", max_bytes=16 * 1024 * 1024, persist=False)
+    key = (intraday_meta['base_version'], intraday_meta['stamp'])
+    rows = provisional_cache.get(key)
+    if rows is None:
+        rows = read_provisional(intraday_meta)
+        if rows is None:
+            return None
+        # Only the latest intraday publish is ever read again
+        provisional_cache.clear()
+        provisional_cache.put(key, rows)
+    return rows
+
+def get_history_store(current_dataset_version):
+    """The embedded query backend, when configured and in sync with the published dataset"""
+    try:
+        return configured_store(current_dataset_version)
+    except Exception as e:
+        print(f"⚠️ History database unavailable, using the CSV: {e}")
         return None
-    
-    correlation_matrix = pivot_data.corr()
-    
-    fig = px.imshow(
-        correlation_matrix,
-        title="Stock Correlation Matrix",
-        color_continuous_scale='RdBu',
-        aspect='auto'
-    )
-    
-    fig.update_layout(
-        title={
-            'text': "Stock Correlation Matrix",
-            'x': 0.5,
-            'xanchor': 'center',
-            'font': {'size': 20, 'family': 'Inter'}
-        },
-        font=dict(family="Inter", size=12),
-        height=500
-    )
-    
-    return fig
 
 def get_sector_mapping():
-    """Map stocks to sectors for better organization"""
-    return {
-        'Technology': ['AAPL', 'MSFT', 'GOOGL', 'GOOG', 'AMZN', 'NVDA', 'META', 'NFLX', 'ADBE', 'CRM', 'ORCL', 'CSCO', 'INTC', 'AMD', 'QCOM', 'TXN', 'AVGO', 'PYPL', 'UBER', 'SNOW'],
-        'Financial Services': ['JPM', 'BAC', 'WFC', 'GS', 'MS', 'C', 'USB', 'TFC', 'PNC', 'COF', 'AXP', 'BLK', 'SCHW', 'CB', 'ICE', 'CME', 'SPGI', 'MCO', 'V', 'MA'],
-        'Healthcare': ['UNH', 'JNJ', 'PFE', 'ABBV', 'TMO', 'ABT', 'LLY', 'MRK', 'BMY', 'AMGN', 'GILD', 'CVS', 'CI', 'ANTM', 'HUM', 'CNC', 'BIIB', 'REGN', 'VRTX', 'ISRG'],
-        'Consumer Discretionary': ['HD', 'NKE', 'MCD', 'LOW', 'SBUX', 'TJX', 'BKNG', 'MAR', 'GM', 'F', 'CCL', 'RCL', 'MGM', 'DIS', 'CMCSA'],
-        'Consumer Staples': ['WMT', 'PG', 'KO', 'PEP', 'COST', 'WBA', 'EL', 'CL', 'KMB', 'GIS', 'K', 'HSY', 'MDLZ'],
-        'Energy': ['XOM', 'CVX', 'COP', 'EOG', 'SLB', 'PSX', 'VLO', 'MPC', 'OXY', 'BKR'],
-        'Industrials': ['BA', 'CAT', 'HON', 'UPS', 'RTX', 'LMT', 'GE', 'MMM', 'FDX', 'NOC', 'UNP', 'CSX', 'NSC'],
-        'Materials': ['LIN', 'APD', 'ECL', 'FCX', 'NEM', 'DOW', 'DD', 'PPG', 'SHW', 'NUE'],
-        'Utilities': ['NEE', 'DUK', 'SO', 'D', 'EXC', 'XEL', 'SRE', 'AEP', 'ES', 'AWK'],
-        'Real Estate': ['AMT', 'CCI', 'PLD', 'EQIX', 'PSA', 'EXR', 'AVB', 'EQR', 'WELL', 'SPG']
-    }
+    """Map stocks to sectors for better organization (read-only, built once)"""
+    return SECTOR_MAPPING
 
 def create_enhanced_stock_selection(unique_symbols):
     """Create enhanced stock selection with sector filtering"""
-    sector_mapping = get_sector_mapping()
+    sector_mapping = dict(get_sector_mapping())
     
     # Create reverse mapping for symbols not in defined sectors
     symbol_to_sector = {}
@@ -940,674 +348,154 @@ def create_enhanced_stock_selection(unique_symbols):
     return selected_symbols
 
 def get_complete_symbol_name_mapping():
-    """Complete mapping of S&P 500 ticker symbols to company names"""
-    return {
-        # A
-        'A': 'Agilent Technologies Inc.',
-        'AAL': 'American Airlines Group Inc.',
-        'AAP': 'Advance Auto Parts Inc.',
-        'AAPL': 'Apple Inc.',
-        'ABBV': 'AbbVie Inc.',
-        'ABC': 'AmerisourceBergen Corp.',
-        'ABMD': 'Abiomed Inc.',
-        'ABT': 'Abbott Laboratories',
-        'ACN': 'Accenture PLC',
-        'ADBE': 'Adobe Inc.',
-        'ADI': 'Analog Devices Inc.',
-        'ADM': 'Archer-Daniels-Midland Co.',
-        'ADP': 'Automatic Data Processing Inc.',
-        'ADSK': 'Autodesk Inc.',
-        'AEE': 'Ameren Corp.',
-        'AEP': 'American Electric Power Co. Inc.',
-        'AES': 'AES Corp.',
-        'AFL': 'Aflac Inc.',
-        'AIG': 'American International Group Inc.',
-        'AIZ': 'Assurant Inc.',
-        'AJG': 'Arthur J. Gallagher & Co.',
-        'AKAM': 'Akamai Technologies Inc.',
-        'ALB': 'Albemarle Corp.',
-        'ALGN': 'Align Technology Inc.',
-        'ALK': 'Alaska Air Group Inc.',
-        'ALL': 'Allstate Corp.',
-        'ALLE': 'Allegion PLC',
-        'AMAT': 'Applied Materials Inc.',
-        'AMCR': 'Amcor PLC',
-        'AMD': 'Advanced Micro Devices Inc.',
-        'AME': 'AMETEK Inc.',
-        'AMGN': 'Amgen Inc.',
-        'AMP': 'Ameriprise Financial Inc.',
-        'AMT': 'American Tower Corp.',
-        'AMZN': 'Amazon.com Inc.',
-        'ANET': 'Arista Networks Inc.',
-        'ANSS': 'ANSYS Inc.',
-        'AON': 'Aon PLC',
-        'AOS': 'A.O. Smith Corp.',
-        'APA': 'APA Corp.',
-        'APD': 'Air Products and Chemicals Inc.',
-        'APH': 'Amphenol Corp.',
-        'APTV': 'Aptiv PLC',
-        'ARE': 'Alexandria Real Estate Equities Inc.',
-        'ATO': 'Atmos Energy Corp.',
-        'ATVI': 'Activision Blizzard Inc.',
-        'AVB': 'AvalonBay Communities Inc.',
-        'AVGO': 'Broadcom Inc.',
-        'AVY': 'Avery Dennison Corp.',
-        'AWK': 'American Water Works Co. Inc.',
-        'AXP': 'American Express Co.',
-        'AZO': 'AutoZone Inc.',
-        
-        # B
-        'BA': 'Boeing Co.',
-        'BAC': 'Bank of America Corp.',
-        'BALL': 'Ball Corp.',
-        'BAX': 'Baxter International Inc.',
-        'BBWI': 'Bath & Body Works Inc.',
-        'BBY': 'Best Buy Co. Inc.',
-        'BDX': 'Becton Dickinson and Co.',
-        'BEN': 'Franklin Resources Inc.',
-        'BF-B': 'Brown-Forman Corp.',
-        'BIIB': 'Biogen Inc.',
-        'BIO': 'Bio-Rad Laboratories Inc.',
-        'BK': 'Bank of New York Mellon Corp.',
-        'BKNG': 'Booking Holdings Inc.',
-        'BKR': 'Baker Hughes Co.',
-        'BLK': 'BlackRock Inc.',
-        'BMY': 'Bristol-Myers Squibb Co.',
-        'BR': 'Broadridge Financial Solutions Inc.',
-        'BRK-B': 'Berkshire Hathaway Inc.',
-        'BRO': 'Brown & Brown Inc.',
-        'BSX': 'Boston Scientific Corp.',
-        'BWA': 'BorgWarner Inc.',
-        
-        # C
-        'C': 'Citigroup Inc.',
-        'CAG': 'Conagra Brands Inc.',
-        'CAH': 'Cardinal Health Inc.',
-        'CARR': 'Carrier Global Corp.',
-        'CAT': 'Caterpillar Inc.',
-        'CB': 'Chubb Ltd.',
-        'CBOE': 'Cboe Global Markets Inc.',
-        'CBRE': 'CBRE Group Inc.',
-        'CCI': 'Crown Castle Inc.',
-        'CCL': 'Carnival Corp.',
-        'CDAY': 'Ceridian HCM Holding Inc.',
-        'CDNS': 'Cadence Design Systems Inc.',
-        'CDW': 'CDW Corp.',
-        'CE': 'Celanese Corp.',
-        'CEG': 'Constellation Energy Corp.',
-        'CHTR': 'Charter Communications Inc.',
-        'CI': 'Cigna Corp.',
-        'CINF': 'Cincinnati Financial Corp.',
-        'CL': 'Colgate-Palmolive Co.',
-        'CLX': 'Clorox Co.',
-        'CMA': 'Comerica Inc.',
-        'CMCSA': 'Comcast Corp.',
-        'CME': 'CME Group Inc.',
-        'CMG': 'Chipotle Mexican Grill Inc.',
-        'CMI': 'Cummins Inc.',
-        'CMS': 'CMS Energy Corp.',
-        'CNC': 'Centene Corp.',
-        'CNP': 'CenterPoint Energy Inc.',
-        'COF': 'Capital One Financial Corp.',
-        'COO': 'Cooper Cos. Inc.',
-        'COP': 'ConocoPhillips',
-        'COST': 'Costco Wholesale Corp.',
-        'CPB': 'Campbell Soup Co.',
-        'CPRT': 'Copart Inc.',
-        'CRM': 'Salesforce Inc.',
-        'CSCO': 'Cisco Systems Inc.',
-        'CSX': 'CSX Corp.',
-        'CTAS': 'Cintas Corp.',
-        'CTLT': 'Catalent Inc.',
-        'CTRA': 'Coterra Energy Inc.',
-        'CTSH': 'Cognizant Technology Solutions Corp.',
-        'CTVA': 'Corteva Inc.',
-        'CVS': 'CVS Health Corp.',
-        'CVX': 'Chevron Corp.',
-        'CZR': 'Caesars Entertainment Inc.',
-        
-        # D
-        'D': 'Dominion Energy Inc.',
-        'DAL': 'Delta Air Lines Inc.',
-        'DD': 'DuPont de Nemours Inc.',
-        'DE': 'Deere & Co.',
-        'DFS': 'Discover Financial Services',
-        'DG': 'Dollar General Corp.',
-        'DGX': 'Quest Diagnostics Inc.',
-        'DHI': 'D.R. Horton Inc.',
-        'DHR': 'Danaher Corp.',
-        'DIS': 'Walt Disney Co.',
-        'DISH': 'DISH Network Corp.',
-        'DLR': 'Digital Realty Trust Inc.',
-        'DLTR': 'Dollar Tree Inc.',
-        'DOV': 'Dover Corp.',
-        'DOW': 'Dow Inc.',
-        'DPZ': 'Domino\'s Pizza Inc.',
-        'DRE': 'Duke Realty Corp.',
-        'DRI': 'Darden Restaurants Inc.',
-        'DTE': 'DTE Energy Co.',
-        'DUK': 'Duke Energy Corp.',
-        'DVA': 'DaVita Inc.',
-        'DVN': 'Devon Energy Corp.',
-        
-        # E
-        'EA': 'Electronic Arts Inc.',
-        'EBAY': 'eBay Inc.',
-        'ECL': 'Ecolab Inc.',
-        'ED': 'Consolidated Edison Inc.',
-        'EFX': 'Equifax Inc.',
-        'EIX': 'Edison International',
-        'EL': 'Estee Lauder Cos. Inc.',
-        'EMN': 'Eastman Chemical Co.',
-        'EMR': 'Emerson Electric Co.',
-        'ENPH': 'Enphase Energy Inc.',
-        'EOG': 'EOG Resources Inc.',
-        'EPAM': 'EPAM Systems Inc.',
-        'EQIX': 'Equinix Inc.',
-        'EQR': 'Equity Residential',
-        'ES': 'Eversource Energy',
-        'ESS': 'Essex Property Trust Inc.',
-        'ETN': 'Eaton Corp. PLC',
-        'ETR': 'Entergy Corp.',
-        'ETSY': 'Etsy Inc.',
-        'EVRG': 'Evergy Inc.',
-        'EW': 'Edwards Lifesciences Corp.',
-        'EXC': 'Exelon Corp.',
-        'EXPD': 'Expeditors International of Washington Inc.',
-        'EXPE': 'Expedia Group Inc.',
-        'EXR': 'Extended Stay America Inc.',
-        
-        # F
-        'F': 'Ford Motor Co.',
-        'FANG': 'Diamondback Energy Inc.',
-        'FAST': 'Fastenal Co.',
-        'FBHS': 'Fortune Brands Home & Security Inc.',
-        'FCX': 'Freeport-McMoRan Inc.',
-        'FDS': 'FactSet Research Systems Inc.',
-        'FDX': 'FedEx Corp.',
-        'FE': 'FirstEnergy Corp.',
-        'FFIV': 'F5 Inc.',
-        'FIS': 'Fidelity National Information Services Inc.',
-        'FISV': 'Fiserv Inc.',
-        'FITB': 'Fifth Third Bancorp',
-        'FLT': 'FleetCor Technologies Inc.',
-        'FMC': 'FMC Corp.',
-        'FOX': 'Fox Corp.',
-        'FOXA': 'Fox Corp.',
-        'FRC': 'First Republic Bank',
-        'FRT': 'Federal Realty Investment Trust',
-        'FTNT': 'Fortinet Inc.',
-        'FTV': 'Fortive Corp.',
-        
-        # G
-        'GD': 'General Dynamics Corp.',
-        'GE': 'General Electric Co.',
-        'GILD': 'Gilead Sciences Inc.',
-        'GIS': 'General Mills Inc.',
-        'GL': 'Globe Life Inc.',
-        'GLW': 'Corning Inc.',
-        'GM': 'General Motors Co.',
-        'GNRC': 'Generac Holdings Inc.',
-        'GOOG': 'Alphabet Inc.',
-        'GOOGL': 'Alphabet Inc.',
-        'GPC': 'Genuine Parts Co.',
-        'GPN': 'Global Payments Inc.',
-        'GRMN': 'Garmin Ltd.',
-        'GS': 'Goldman Sachs Group Inc.',
-        'GWW': 'W.W. Grainger Inc.',
-        
-        # H
-        'HAL': 'Halliburton Co.',
-        'HAS': 'Hasbro Inc.',
-        'HBAN': 'Huntington Bancshares Inc.',
-        'HBI': 'Hanesbrands Inc.',
-        'HCA': 'HCA Healthcare Inc.',
-        'HD': 'Home Depot Inc.',
-        'HES': 'Hess Corp.',
-        'HIG': 'Hartford Financial Services Group Inc.',
-        'HII': 'Huntington Ingalls Industries Inc.',
-        'HLT': 'Hilton Worldwide Holdings Inc.',
-        'HOLX': 'Hologic Inc.',
-        'HON': 'Honeywell International Inc.',
-        'HPE': 'Hewlett Packard Enterprise Co.',
-        'HPQ': 'HP Inc.',
-        'HRL': 'Hormel Foods Corp.',
-        'HSIC': 'Henry Schein Inc.',
-        'HST': 'Host Hotels & Resorts Inc.',
-        'HSY': 'Hershey Co.',
-        'HUM': 'Humana Inc.',
-        'HWM': 'Howmet Aerospace Inc.',
-        
-        # I
-        'IBM': 'International Business Machines Corp.',
-        'ICE': 'Intercontinental Exchange Inc.',
-        'IDXX': 'IDEXX Laboratories Inc.',
-        'IEX': 'IDEX Corp.',
-        'IFF': 'International Flavors & Fragrances Inc.',
-        'ILMN': 'Illumina Inc.',
-        'INCY': 'Incyte Corp.',
-        'INFO': 'IHS Markit Ltd.',
-        'INTC': 'Intel Corp.',
-        'INTU': 'Intuit Inc.',
-        'IP': 'International Paper Co.',
-        'IPG': 'Interpublic Group of Cos. Inc.',
-        'IPGP': 'IPG Photonics Corp.',
-        'IQV': 'IQVIA Holdings Inc.',
-        'IR': 'Ingersoll Rand Inc.',
-        'IRM': 'Iron Mountain Inc.',
-        'ISRG': 'Intuitive Surgical Inc.',
-        'IT': 'Gartner Inc.',
-        'ITW': 'Illinois Tool Works Inc.',
-        'IVZ': 'Invesco Ltd.',
-        
-        # J
-        'JBHT': 'J.B. Hunt Transport Services Inc.',
-        'JCI': 'Johnson Controls International PLC',
-        'JKHY': 'Jack Henry & Associates Inc.',
-        'JNJ': 'Johnson & Johnson',
-        'JNPR': 'Juniper Networks Inc.',
-        'JPM': 'JPMorgan Chase & Co.',
-        'JWN': 'Nordstrom Inc.',
-        
-        # K
-        'K': 'Kellogg Co.',
-        'KEY': 'KeyCorp',
-        'KEYS': 'Keysight Technologies Inc.',
-        'KHC': 'Kraft Heinz Co.',
-        'KIM': 'Kimco Realty Corp.',
-        'KLAC': 'KLA Corp.',
-        'KMB': 'Kimberly-Clark Corp.',
-        'KMI': 'Kinder Morgan Inc.',
-        'KMX': 'CarMax Inc.',
-        'KO': 'Coca-Cola Co.',
-        'KR': 'Kroger Co.',
-        'KSS': 'Kohl\'s Corp.',
-        
-        # L
-        'L': 'Loews Corp.',
-        'LDOS': 'Leidos Holdings Inc.',
-        'LEG': 'Leggett & Platt Inc.',
-        'LEN': 'Lennar Corp.',
-        'LH': 'Laboratory Corp. of America Holdings',
-        'LHX': 'L3Harris Technologies Inc.',
-        'LIN': 'Linde PLC',
-        'LKQ': 'LKQ Corp.',
-        'LLY': 'Eli Lilly and Co.',
-        'LMT': 'Lockheed Martin Corp.',
-        'LNC': 'Lincoln National Corp.',
-        'LNT': 'Alliant Energy Corp.',
-        'LOW': 'Lowe\'s Cos. Inc.',
-        'LRCX': 'Lam Research Corp.',
-        'LUMN': 'Lumen Technologies Inc.',
-        'LUV': 'Southwest Airlines Co.',
-        'LVS': 'Las Vegas Sands Corp.',
-        'LW': 'Lamb Weston Holdings Inc.',
-        'LYB': 'LyondellBasell Industries NV',
-        'LYV': 'Live Nation Entertainment Inc.',
-        
-        # M
-        'MA': 'Mastercard Inc.',
-        'MAA': 'Mid-America Apartment Communities Inc.',
-        'MAR': 'Marriott International Inc.',
-        'MAS': 'Masco Corp.',
-        'MCD': 'McDonald\'s Corp.',
-        'MCHP': 'Microchip Technology Inc.',
-        'MCK': 'McKesson Corp.',
-        'MCO': 'Moody\'s Corp.',
-        'MDLZ': 'Mondelez International Inc.',
-        'MDT': 'Medtronic PLC',
-        'MET': 'MetLife Inc.',
-        'META': 'Meta Platforms Inc.',
-        'MGM': 'MGM Resorts International',
-        'MHK': 'Mohawk Industries Inc.',
-        'MKC': 'McCormick & Co. Inc.',
-        'MKTX': 'MarketAxess Holdings Inc.',
-        'MLM': 'Martin Marietta Materials Inc.',
-        'MMC': 'Marsh & McLennan Cos. Inc.',
-        'MMM': '3M Co.',
-        'MNST': 'Monster Beverage Corp.',
-        'MO': 'Altria Group Inc.',
-        'MOH': 'Molina Healthcare Inc.',
-        'MOS': 'Mosaic Co.',
-        'MPC': 'Marathon Petroleum Corp.',
-        'MPWR': 'Monolithic Power Systems Inc.',
-        'MRK': 'Merck & Co. Inc.',
-        'MRNA': 'Moderna Inc.',
-        'MRO': 'Marathon Oil Corp.',
-        'MS': 'Morgan Stanley',
-        'MSCI': 'MSCI Inc.',
-        'MSFT': 'Microsoft Corp.',
-        'MSI': 'Motorola Solutions Inc.',
-        'MTB': 'M&T Bank Corp.',
-        'MTCH': 'Match Group Inc.',
-        'MTD': 'Mettler-Toledo International Inc.',
-        'MU': 'Micron Technology Inc.',
-        'NCLH': 'Norwegian Cruise Line Holdings Ltd.',
-        'NDAQ': 'Nasdaq Inc.',
-        'NDSN': 'Nordson Corp.',
-        'NEE': 'NextEra Energy Inc.',
-        'NEM': 'Newmont Corp.',
-        'NFLX': 'Netflix Inc.',
-        'NI': 'NiSource Inc.',
-        'NKE': 'Nike Inc.',
-        'NLOK': 'NortonLifeLock Inc.',
-        'NLSN': 'Nielsen Holdings PLC',
-        'NOC': 'Northrop Grumman Corp.',
-        'NOW': 'ServiceNow Inc.',
-        'NRG': 'NRG Energy Inc.',
-        'NSC': 'Norfolk Southern Corp.',
-        'NTAP': 'NetApp Inc.',
-        'NTRS': 'Northern Trust Corp.',
-        'NUE': 'Nucor Corp.',
-        'NVDA': 'NVIDIA Corp.',
-        'NVR': 'NVR Inc.',
-        'NWL': 'Newell Brands Inc.',
-        'NWS': 'News Corp.',
-        'NWSA': 'News Corp.',
-        
-        # O
-        'ODFL': 'Old Dominion Freight Line Inc.',
-        'OGN': 'Organon & Co.',
-        'OKE': 'ONEOK Inc.',
-        'OMC': 'Omnicom Group Inc.',
-        'ORCL': 'Oracle Corp.',
-        'ORLY': 'O\'Reilly Automotive Inc.',
-        'OTIS': 'Otis Worldwide Corp.',
-        'OXY': 'Occidental Petroleum Corp.',
-        
-        # P
-        'PARA': 'Paramount Global',
-        'PAYC': 'Paycom Software Inc.',
-        'PAYX': 'Paychex Inc.',
-        'PCAR': 'PACCAR Inc.',
-        'PCG': 'PG&E Corp.',
-        'PEAK': 'Healthpeak Properties Inc.',
-        'PEG': 'Public Service Enterprise Group Inc.',
-        'PEP': 'PepsiCo Inc.',
-        'PFE': 'Pfizer Inc.',
-        'PFG': 'Principal Financial Group Inc.',
-        'PG': 'Procter & Gamble Co.',
-        'PGR': 'Progressive Corp.',
-        'PH': 'Parker-Hannifin Corp.',
-        'PHM': 'PulteGroup Inc.',
-        'PKG': 'Packaging Corp. of America',
-        'PKI': 'PerkinElmer Inc.',
-        'PLD': 'Prologis Inc.',
-        'PM': 'Philip Morris International Inc.',
-        'PNC': 'PNC Financial Services Group Inc.',
-        'PNR': 'Pentair PLC',
-        'PNW': 'Pinnacle West Capital Corp.',
-        'POOL': 'Pool Corp.',
-        'PPG': 'PPG Industries Inc.',
-        'PPL': 'PPL Corp.',
-        'PRU': 'Prudential Financial Inc.',
-        'PSA': 'Public Storage',
-        'PSX': 'Phillips 66',
-        'PTC': 'PTC Inc.',
-        'PVH': 'PVH Corp.',
-        'PWR': 'Quanta Services Inc.',
-        'PXD': 'Pioneer Natural Resources Co.',
-        'PYPL': 'PayPal Holdings Inc.',
-        
-        # Q-R
-        'QCOM': 'Qualcomm Inc.',
-        'QRVO': 'Qorvo Inc.',
-        'RCL': 'Royal Caribbean Cruises Ltd.',
-        'RE': 'Everest Re Group Ltd.',
-        'REG': 'Regency Centers Corp.',
-        'REGN': 'Regeneron Pharmaceuticals Inc.',
-        'RF': 'Regions Financial Corp.',
-        'RHI': 'Robert Half Inc.',
-        'RJF': 'Raymond James Financial Inc.',
-        'RL': 'Ralph Lauren Corp.',
-        'RMD': 'ResMed Inc.',
-        'ROK': 'Rockwell Automation Inc.',
-        'ROL': 'Rollins Inc.',
-        'ROP': 'Roper Technologies Inc.',
-        'ROST': 'Ross Stores Inc.',
-        'RSG': 'Republic Services Inc.',
-        'RTX': 'Raytheon Technologies Corp.',
-        
-        # S
-        'SBAC': 'SBA Communications Corp.',
-        'SBNY': 'Signature Bank',
-        'SBUX': 'Starbucks Corp.',
-        'SCHW': 'Charles Schwab Corp.',
-        'SEDG': 'SolarEdge Technologies Inc.',
-        'SEE': 'Sealed Air Corp.',
-        'SHW': 'Sherwin-Williams Co.',
-        'SIVB': 'SVB Financial Group',
-        'SJM': 'J.M. Smucker Co.',
-        'SLB': 'Schlumberger NV',
-        'SNA': 'Snap-on Inc.',
-        'SNPS': 'Synopsys Inc.',
-        'SO': 'Southern Co.',
-        'SPG': 'Simon Property Group Inc.',
-        'SPGI': 'S&P Global Inc.',
-        'SRE': 'Sempra Energy',
-        'STE': 'STERIS PLC',
-        'STT': 'State Street Corp.',
-        'STX': 'Seagate Technology Holdings PLC',
-        'STZ': 'Constellation Brands Inc.',
-        'SWK': 'Stanley Black & Decker Inc.',
-        'SWKS': 'Skyworks Solutions Inc.',
-        'SYF': 'Synchrony Financial',
-        'SYK': 'Stryker Corp.',
-        'SYY': 'Sysco Corp.',
-        
-        # T
-        'T': 'AT&T Inc.',
-        'TAP': 'Molson Coors Beverage Co.',
-        'TDG': 'TransDigm Group Inc.',
-        'TDY': 'Teledyne Technologies Inc.',
-        'TECH': 'Bio-Techne Corp.',
-        'TEL': 'TE Connectivity Ltd.',
-        'TER': 'Teradyne Inc.',
-        'TFC': 'Truist Financial Corp.',
-        'TFX': 'Teleflex Inc.',
-        'TGT': 'Target Corp.',
-        'TJX': 'TJX Cos. Inc.',
-        'TMO': 'Thermo Fisher Scientific Inc.',
-        'TMUS': 'T-Mobile US Inc.',
-        'TPG': 'TPG Inc.',
-        'TPR': 'Tapestry Inc.',
-        'TRMB': 'Trimble Inc.',
-        'TROW': 'T. Rowe Price Group Inc.',
-        'TRV': 'Travelers Cos. Inc.',
-        'TSCO': 'Tractor Supply Co.',
-        'TSLA': 'Tesla Inc.',
-        'TSN': 'Tyson Foods Inc.',
-        'TT': 'Trane Technologies PLC',
-        'TTWO': 'Take-Two Interactive Software Inc.',
-        'TXN': 'Texas Instruments Inc.',
-        'TXT': 'Textron Inc.',
-        'TYL': 'Tyler Technologies Inc.',
-        
-        # U-V
-        'UAL': 'United Airlines Holdings Inc.',
-        'UDR': 'UDR Inc.',
-        'UHS': 'Universal Health Services Inc.',
-        'ULTA': 'Ulta Beauty Inc.',
-        'UNH': 'UnitedHealth Group Inc.',
-        'UNP': 'Union Pacific Corp.',
-        'UPS': 'United Parcel Service Inc.',
-        'URI': 'United Rentals Inc.',
-        'USB': 'U.S. Bancorp',
-        'V': 'Visa Inc.',
-        'VFC': 'V.F. Corp.',
-        'VLO': 'Valero Energy Corp.',
-        'VMC': 'Vulcan Materials Co.',
-        'VNO': 'Vornado Realty Trust',
-        'VRSK': 'Verisk Analytics Inc.',
-        'VRSN': 'VeriSign Inc.',
-        'VRTX': 'Vertex Pharmaceuticals Inc.',
-        'VTR': 'Ventas Inc.',
-        'VTRS': 'Viatris Inc.',
-        'VZ': 'Verizon Communications Inc.',
-        
-        # W-Z
-        'WAB': 'Westinghouse Air Brake Technologies Corp.',
-        'WAT': 'Waters Corp.',
-        'WBA': 'Walgreens Boots Alliance Inc.',
-        'WBD': 'Warner Bros. Discovery Inc.',
-        'WDC': 'Western Digital Corp.',
-        'WEC': 'WEC Energy Group Inc.',
-        'WELL': 'Welltower Inc.',
-        'WFC': 'Wells Fargo & Co.',
-        'WHR': 'Whirlpool Corp.',
-        'WM': 'Waste Management Inc.',
-        'WMB': 'Williams Cos. Inc.',
-        'WMT': 'Walmart Inc.',
-        'WRB': 'W.R. Berkley Corp.',
-        'WRK': 'WestRock Co.',
-        'WST': 'West Pharmaceutical Services Inc.',
-        'WTW': 'Willis Towers Watson PLC',
-        'WY': 'Weyerhaeuser Co.',
-        'XRAY': 'DENTSPLY SIRONA Inc.',
-        'XYL': 'Xylem Inc.',
-        'YUM': 'Yum! Brands Inc.',
-        'ZBH': 'Zimmer Biomet Holdings Inc.',
-        'ZBRA': 'Zebra Technologies Corp.',
-        'ZION': 'Zions Bancorp NA',
-        'ZTS': 'Zoetis Inc.'
-    }
+    """Complete mapping of S&P 500 ticker symbols to company names (read-only, built once)"""
+    return SYMBOL_NAMES
 
-def create_user_friendly_stock_selection(unique_symbols):
-    """Modern 2-column stock selection interface"""
+def get_search_index(unique_symbols):
+    """Ticker/company-name search index, built once per process for a symbol universe"""
+    index_cache = get_cache("search_index", max_bytes=64 * 1024 * 1024, persist=False)
+    
+    def build():
+        symbol_to_name = get_complete_symbol_name_mapping()
+        return SymbolSearchIndex([(symbol, symbol_to_name.get(symbol, symbol)) for symbol in unique_symbols])
     
-    # Initialize session state for selection basket
+    return index_cache.get_or_compute(tuple(unique_symbols), build)
+
+def get_neighbor_index(lookback):
+    """Load the ETL's precomputed top-k neighbour index for a lookback"""
+    meta_path = os.path.join(UNIVERSE_CORRELATION_DIR, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    index_cache = get_cache("neighbor_index", max_bytes=64 * 1024 * 1024, persist=False)
+    key = (os.stat(meta_path).st_mtime_ns, lookback)
+    return index_cache.get_or_compute(key, lambda: load_neighbor_index(lookback))
+
+def render_diversifier_lookup(unique_symbols, symbol_to_name):
+    """Most and least correlated names across the whole universe for one stock"""
+    st.write("**Find what moves with (or against) a stock across the whole universe:**")
+    
+    lookbacks = available_lookbacks()
+    if not lookbacks:
+        st.info("Correlation index not built yet. Run 🔄 Refresh Data to generate it.")
+        return
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        anchor = st.selectbox(
+            "Stock:",
+            unique_symbols,
+            index=unique_symbols.index(st.session_state.stock_basket[0]) if st.session_state.stock_basket and st.session_state.stock_basket[0] in unique_symbols else 0,
+            key="diversify_anchor"
+        )
+    with col2:
+        lookback = st.selectbox("Lookback (days):", lookbacks, key="diversify_lookback")
+    
+    neighbor_index = get_neighbor_index(lookback)
+    if neighbor_index is None or anchor not in neighbor_index.symbol_index:
+        st.warning(f"No correlation data for {anchor}.")
+        return
+    
+    for title, neighbors, key_prefix in [
+        ("🔗 Most correlated", neighbor_index.most_correlated(anchor, 5), "div_pos"),
+        ("🛡️ Best diversifiers (least correlated)", neighbor_index.least_correlated(anchor, 5), "div_neg"),
+    ]:
+        st.markdown(f"**{title}**")
+        for symbol, corr in neighbors:
+            col1, col2 = st.columns([3, 1])
+            with col1:
+                st.markdown(f"""
+                <div style="
+                    background: rgba(255, 255, 255, 0.95);
+                    padding: 8px 12px;
+                    border-radius: 8px;
+                    color: #2d3436;
+                    margin: 3px 0;
+                    border-left: 3px solid #4facfe;
+                ">
+                <strong>{symbol}</strong> - {symbol_to_name.get(symbol, symbol)} · ρ = {corr:+.2f}
+                </div>
+                """, unsafe_allow_html=True)
+            with col2:
+                if st.button("➕", key=f"{key_prefix}_{symbol}", help="Add"):
+                    if symbol not in st.session_state.stock_basket:
+                        st.session_state.stock_basket.append(symbol)
+                        st.success(f"Added {symbol}!")
+                        rerun_fragment()
+
+def init_basket_state():
+    """The editable basket and the committed basket that analytics run against"""
     if 'stock_basket' not in st.session_state:
         st.session_state.stock_basket = []
+    if 'committed_basket' not in st.session_state:
+        st.session_state.committed_basket = list(st.session_state.stock_basket)
+
+def has_pending_basket_changes():
+    return st.session_state.stock_basket != st.session_state.committed_basket
+
+def get_committed_basket(unique_symbols):
+    """Symbols to analyze: the last basket committed with Analyze, or a default trio"""
+    committed = [symbol for symbol in st.session_state.committed_basket if symbol in unique_symbols]
+    if committed:
+        return committed
+    default_stocks = ['AAPL', 'MSFT', 'GOOGL']
+    available_defaults = [stock for stock in default_stocks if stock in unique_symbols]
+    return available_defaults[:3] if available_defaults else unique_symbols[:3]
+
+def render_analyze_control():
+    """Commit the edited basket and rerun the analytics once for all pending edits"""
+    pending = has_pending_basket_changes()
+    if pending:
+        st.caption("Basket changed since the last analysis.")
+    if st.button("🚀 Analyze", key="analyze_basket", type="primary", disabled=not pending, use_container_width=True):
+        st.session_state.committed_basket = list(st.session_state.stock_basket)
+        st.rerun()
+
+def render_basket_refresh_control():
+    """Fetch fresh bars for just the basket's symbols instead of the whole universe.
+
+    Requests go through etl's process-wide refresh queue, so sessions asking for
+    overlapping symbols at the same time share one fetch per symbol.
+    """
+    message = st.session_state.pop('basket_refresh_message', None)
+    if message:
+        st.success(message)
+    basket = list(st.session_state.stock_basket)
+    if not st.button("🔄 Refresh my basket", key="refresh_basket", disabled=not basket, use_container_width=True,
+                     help="Fetch the latest market data for these stocks only"):
+        return
+    
+    import etl
+    reports, errors = [], []
+    with st.spinner(f"🔄 Fetching latest data for {len(basket)} stocks..."):
+        for future in etl.request_symbol_refresh(basket):
+            try:
+                reports.append(future.result())
+            except Exception as e:
+                errors.append(str(e))
+    if errors:
+        st.error(f"❌ Basket refresh failed: {errors[0]}")
+        return
+    refreshed = sorted({symbol for report in reports for symbol in report['refreshed']} & set(basket))
+    failed = sorted({symbol for report in reports for symbol in report['failed_symbols']} & set(basket))
+    if failed:
+        st.warning(f"⚠️ No fresh data for: {', '.join(failed)}")
+    if refreshed:
+        # The new version is picked up (as a delta) by the full rerun
+        st.session_state.basket_refresh_message = f"✅ Refreshed {len(refreshed)} stocks: {', '.join(refreshed)}"
+        st.rerun()
+
+@fragment
+def create_user_friendly_stock_selection(unique_symbols):
+    """Modern 2-column stock selection interface.
+
+    Runs as a fragment: basket edits only rerun this panel, and the analytics below
+    pick up the basket when the user commits it with Analyze.
+    """
+    init_basket_state()
     
     symbol_to_name = get_complete_symbol_name_mapping()
     
     st.markdown("---")
-    # Ultra-Sleek Financial Theme with Animated Starfield
-    st.markdown("""
-    <style>
-    .stApp {
-        background: 
-            radial-gradient(2px 2px at 20px 30px, rgba(255,255,255,0.15), transparent),
-            radial-gradient(2px 2px at 40px 70px, rgba(255,255,255,0.1), transparent),
-            radial-gradient(1px 1px at 90px 40px, rgba(255,255,255,0.1), transparent),
-            radial-gradient(1px 1px at 130px 80px, rgba(255,255,255,0.1), transparent),
-            radial-gradient(2px 2px at 160px 30px, rgba(255,255,255,0.1), transparent),
-            linear-gradient(135deg, #0c0c0c 0%, #1a1a2e 15%, #16213e 35%, #0f3460 55%, #533483 75%, #7b2d26 95%, #2c1810 100%) !important;
-        background-size: 
-            200px 100px,
-            300px 120px,
-            150px 200px,
-            250px 150px,
-            180px 90px,
-            100% 100% !important;
-        background-attachment: fixed !important;
-        animation: starfieldMove 25s linear infinite, gradientPulse 15s ease-in-out infinite !important;
-    }
-    
-    @keyframes starfieldMove {
-        0% {
-            background-position: 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0% 50%;
-        }
-        100% {
-            background-position: 200px 100px, -300px 120px, 150px -200px, -250px 150px, 180px -90px, 100% 50%;
-        }
-    }
-    
-    @keyframes gradientPulse {
-        0%, 100% {
-            background-position: 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0% 50%;
-        }
-        50% {
-            background-position: 100px 50px, 150px 60px, 75px 100px, 125px 75px, 90px 45px, 100% 50%;
-        }
-    }
-    
-    /* Enhanced text with subtle glow */
-    .stMarkdown, .stText, p, span {
-        color: #f8f9fa !important;
-        text-shadow: 0 0 10px rgba(248, 249, 250, 0.1) !important;
-    }
-    
-    h1, h2, h3, h4, h5, h6 {
-        color: #ffffff !important;
-        text-shadow: 0 0 15px rgba(255, 255, 255, 0.2) !important;
-    }
-    
-    /* Premium button styling with enhanced gradient */
-    .stButton > button {
-        background: linear-gradient(45deg, 
-            rgba(123, 45, 38, 0.9) 0%, 
-            rgba(83, 52, 131, 0.9) 25%, 
-            rgba(15, 52, 96, 0.9) 50%, 
-            rgba(83, 52, 131, 0.9) 75%, 
-            rgba(123, 45, 38, 0.9) 100%) !important;
-        background-size: 200% 200% !important;
-        color: white !important;
-        border: 1px solid rgba(255, 255, 255, 0.3) !important;
-        border-radius: 10px !important;
-        font-weight: bold !important;
-        box-shadow: 
-            0 4px 15px rgba(0, 0, 0, 0.3),
-            inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
-        transition: all 0.4s ease !important;
-        animation: buttonShimmer 3s ease-in-out infinite !important;
-    }
-    
-    @keyframes buttonShimmer {
-        0%, 100% {
-            background-position: 0% 50%;
-        }
-        50% {
-            background-position: 100% 50%;
-        }
-    }
-    
-    .stButton > button:hover {
-        background-position: 100% 50% !important;
-        transform: translateY(-2px) scale(1.02) !important;
-        box-shadow: 
-            0 8px 25px rgba(123, 45, 38, 0.4),
-            0 4px 15px rgba(83, 52, 131, 0.3),
-            inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
-        border-color: rgba(255, 255, 255, 0.5) !important;
-    }
-    
-    /* Sleek input styling with glow effects */
-    .stSelectbox > div > div,
-    .stTextInput > div > div > input {
-        background: rgba(255, 255, 255, 0.08) !important;
-        border: 1px solid rgba(255, 255, 255, 0.15) !important;
-        border-radius: 10px !important;
-        color: #f8f9fa !important;
-        backdrop-filter: blur(10px) !important;
-        box-shadow: 
-            inset 0 1px 3px rgba(0, 0, 0, 0.2),
-            0 1px 3px rgba(255, 255, 255, 0.1) !important;
-        transition: all 0.3s ease !important;
-    }
-    
-    .stSelectbox > div > div:focus,
-    .stTextInput > div > div > input:focus {
-        border-color: rgba(123, 45, 38, 0.7) !important;
-        box-shadow: 
-            0 0 0 3px rgba(123, 45, 38, 0.15),
-            inset 0 1px 3px rgba(0, 0, 0, 0.2),
-            0 1px 8px rgba(123, 45, 38, 0.3) !important;
-        background: rgba(255, 255, 255, 0.12) !important;
-    }
-    
-    /* Enhanced metric containers */
-    div[data-testid="metric-container"] {
-        background: rgba(255, 255, 255, 0.05) !important;
-        border: 1px solid rgba(255, 255, 255, 0.1) !important;
-        border-radius: 12px !important;
-        backdrop-filter: blur(15px) !important;
-        box-shadow: 
-            0 8px 32px rgba(0, 0, 0, 0.3),
-            inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
-    }
-    </style>
-    """, unsafe_allow_html=True)
 
     # Create a container specifically for the portfolio section
     st.markdown('<div class="portfolio-section">', unsafe_allow_html=True)
@@ -1644,7 +532,7 @@ def create_user_friendly_stock_selection(unique_symbols):
                 with col2:
                     if st.button("❌", key=f"remove_{symbol}", help="Remove"):
                         st.session_state.stock_basket.remove(symbol)
-                        st.rerun()
+                        rerun_fragment()
             
             # Portfolio status
             portfolio_size = len(st.session_state.stock_basket)
@@ -1682,22 +570,26 @@ def create_user_friendly_stock_selection(unique_symbols):
             with col1:
                 if st.button("🗑️ Clear All", key="clear_basket"):
                     st.session_state.stock_basket = []
-                    st.rerun()
+                    rerun_fragment()
             with col2:
+                ready_color = "#ff9500" if has_pending_basket_changes() else "#28a745"
+                ready_text = "📝 Ready to Analyze!" if has_pending_basket_changes() else "✅ Analysis up to date"
                 st.markdown(f"""
                 <div style="
                     background: rgba(255, 255, 255, 0.95);
                     padding: 10px 15px;
                     border-radius: 10px;
                     text-align: center;
-                    color: #28a745;
+                    color: {ready_color};
                     font-weight: bold;
                     box-shadow: 0 3px 12px rgba(0,0,0,0.1);
-                    border: 2px solid #28a745;
+                    border: 2px solid {ready_color};
                 ">
-                ✅ Ready to Analyze!
+                {ready_text}
                 </div>
                 """, unsafe_allow_html=True)
+            
+            render_basket_refresh_control()
         
         else:
             st.info("👈 Select stocks from the categories or search")
@@ -1707,7 +599,9 @@ def create_user_friendly_stock_selection(unique_symbols):
                 if symbol in unique_symbols:
                     if st.button(f"+ Add {symbol}", key=f"quick_{symbol}"):
                         st.session_state.stock_basket.append(symbol)
-                        st.rerun()
+                        rerun_fragment()
+        
+        render_analyze_control()
     
     # === RIGHT COLUMN: Stock Discovery ===
     with right_col:
@@ -1716,23 +610,14 @@ def create_user_friendly_stock_selection(unique_symbols):
         # Discovery method selector
         discovery_method = st.selectbox(
             "Choose method:",
-            ["⚡ Quick Categories", "🔍 Search Stocks", "📊 Browse All"],
+            ["⚡ Quick Categories", "🔍 Search Stocks", "📊 Browse All", "🧭 Find Diversifiers"],
             key="discovery_method"
         )
         
         if discovery_method == "⚡ Quick Categories":
             st.write("**One-click portfolio themes:**")
             
-            categories = {
-                "🍎 Big Tech": ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'META', 'NVDA'],
-                "🏦 Major Banks": ['JPM', 'BAC', 'WFC', 'C', 'GS', 'MS'],
-                "⚡ AI & Chips": ['NVDA', 'AMD', 'INTC', 'QCOM', 'AVGO'],
-                "💊 Healthcare": ['UNH', 'JNJ', 'PFE', 'ABBV', 'MRK', 'LLY'],
-                "🛒 Consumer": ['WMT', 'COST', 'HD', 'TGT', 'NKE', 'SBUX'],
-                "⚡ Energy": ['XOM', 'CVX', 'COP', 'NEE', 'DUK'],
-                "🏭 Industrial": ['BA', 'CAT', 'GE', 'HON', 'MMM', 'UPS'],
-                "💰 Dividends": ['JNJ', 'PG', 'KO', 'PEP', 'MCD', 'WMT']
-            }
+            categories = QUICK_CATEGORIES
             
             # Category buttons in 2 columns
             col1, col2 = st.columns(2, gap="medium")
@@ -1749,7 +634,7 @@ def create_user_friendly_stock_selection(unique_symbols):
                                 added_count += 1
                         if added_count > 0:
                             st.success(f"Added {added_count} stocks!")
-                            st.rerun()
+                            rerun_fragment()
             
             with col2:
                 for i in range(1, len(category_items), 2):
@@ -1762,7 +647,7 @@ def create_user_friendly_stock_selection(unique_symbols):
                                 added_count += 1
                         if added_count > 0:
                             st.success(f"Added {added_count} stocks!")
-                            st.rerun()
+                            rerun_fragment()
             
             # Tip section
             st.markdown("""
@@ -1791,13 +676,8 @@ def create_user_friendly_stock_selection(unique_symbols):
             )
             
             if search_term:
-                matches = []
-                search_lower = search_term.lower()
-                for symbol in unique_symbols:
-                    company_name = symbol_to_name.get(symbol, symbol)
-                    if (search_lower in symbol.lower() or 
-                        search_lower in company_name.lower()):
-                        matches.append((symbol, company_name))
+                search_index = get_search_index(unique_symbols)
+                matches = [(symbol, company_name) for symbol, company_name, _ in search_index.search(search_term, limit=50)]
                 
                 if matches:
                     st.write(f"**Found {len(matches)} matches:**")
@@ -1822,7 +702,7 @@ def create_user_friendly_stock_selection(unique_symbols):
                                 if symbol not in st.session_state.stock_basket:
                                     st.session_state.stock_basket.append(symbol)
                                     st.success(f"Added {symbol}!")
-                                    st.rerun()
+                                    rerun_fragment()
                 else:
                     st.warning("No matches found. Try a different search term.")
         
@@ -1867,18 +747,148 @@ def create_user_friendly_stock_selection(unique_symbols):
                         if symbol not in st.session_state.stock_basket:
                             st.session_state.stock_basket.append(symbol)
                             st.success(f"Added {symbol}!")
-                            st.rerun()
+                            rerun_fragment()
+
+        elif discovery_method == "🧭 Find Diversifiers":
+            render_diversifier_lookup(unique_symbols, symbol_to_name)
 
     # Close the portfolio section container
     st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Return selection
-    if st.session_state.stock_basket:
-        return st.session_state.stock_basket
-    else:
-        default_stocks = ['AAPL', 'MSFT', 'GOOGL']
-        available_defaults = [stock for stock in default_stocks if stock in unique_symbols]
-        return available_defaults[:3] if available_defaults else unique_symbols[:3]
+
+ANALYSIS_PAGE_SIZE = 10
+ANALYSIS_SORT_OPTIONS = {
+    "Total Return": ('total_return', False),
+    "Sharpe Ratio": ('avg_sharpe_21', False),
+    "Volatility": ('volatility_21', False),
+    "Quality Score": ('quality_overall', False),
+    "Symbol": ('symbol', True),
+}
+
+@fragment
+def render_stock_analysis_list(insight_table):
+    """Paged per-stock analysis; detail text is only built for rows the user opens.
+
+    Sorting, filtering, paging and opening rows only rerun this fragment.
+    """
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        sort_label = st.selectbox("Sort by", list(ANALYSIS_SORT_OPTIONS), key="analysis_sort")
+    with col2:
+        performance_filter = st.multiselect(
+            "Filter by performance",
+            list(PERFORMANCE_INDICATORS),
+            key="analysis_filter",
+            placeholder="All performance levels"
+        )
+    with col3:
+        symbol_filter = st.text_input("Symbol", key="analysis_symbol_filter", placeholder="e.g. AAPL")
+    
+    # Sorting and filtering happen on the compact insight table, before anything is rendered
+    visible = insight_table
+    if performance_filter:
+        wanted_codes = [PERFORMANCE_INDICATORS.index(label) for label in performance_filter]
+        visible = visible[visible['indicator_code'].isin(wanted_codes)]
+    if symbol_filter:
+        visible = visible[visible['symbol'].str.contains(symbol_filter.strip().upper(), regex=False)]
+    sort_column, ascending = ANALYSIS_SORT_OPTIONS[sort_label]
+    visible = visible.sort_values(sort_column, ascending=ascending, na_position='last')
+    
+    total = len(visible)
+    if total == 0:
+        st.info("No stocks match the current filters.")
+        return
+    
+    total_pages = (total - 1) // ANALYSIS_PAGE_SIZE + 1
+    page = 1
+    if total_pages > 1:
+        page = st.selectbox(
+            f"Page ({ANALYSIS_PAGE_SIZE} stocks per page):",
+            range(1, total_pages + 1),
+            key="analysis_page"
+        )
+    start_idx = (page - 1) * ANALYSIS_PAGE_SIZE
+    page_rows = visible.iloc[start_idx:start_idx + ANALYSIS_PAGE_SIZE]
+    st.caption(f"Showing {start_idx + 1}-{start_idx + len(page_rows)} of {total} stocks")
+    
+    for row in page_rows.to_dict('records'):
+        is_open = st.toggle(
+            f"📊 {row['symbol']} - {performance_indicator(row)} ({row['total_return']:.1%})",
+            key=f"analysis_open_{row['symbol']}"
+        )
+        if is_open:
+            with st.container(border=True):
+                for insight in render_insights(row):
+                    st.markdown(insight)
+
+# Figures come from the process-wide spec cache: a basket/range that any session has
+# already viewed skips both the pandas work and Plotly figure construction.
+def render_risk_return_chart(summary, summary_key):
+    spec = cached_figure_spec(summary_key[0], "risk_return", summary_key[1:], lambda: create_risk_return_scatter(summary))
+    if spec is None:
+        st.warning("No valid data available for risk-return analysis.")
+        return
+    st.plotly_chart(figure_from_spec(spec), use_container_width=True)
+
+def render_performance_chart(load_filtered_history, selected_symbols, current_dataset_version, start_date, end_date):
+    def build():
+        perf_data = get_performance_series(load_filtered_history, selected_symbols, current_dataset_version, start_date, end_date)
+        record("performance_chart.points", len(perf_data), "points")
+        return create_performance_chart(perf_data)
+    
+    # Trace colours follow the basket order, so the order is part of the key
+    inputs = basket_figure_inputs(selected_symbols, start_date, end_date, DEFAULT_POINT_BUDGET)
+    with timed("performance_chart.build_ms"):
+        spec = cached_figure_spec(current_dataset_version, "performance", inputs, build)
+    if spec:
+        record("performance_chart.payload_kb", len(spec) / 1024, "KB")
+        st.plotly_chart(figure_from_spec(spec), use_container_width=True)
+
+def render_portfolio_metrics_chart(summary, summary_key):
+    spec = cached_figure_spec(summary_key[0], "portfolio_metrics", summary_key[1:], lambda: create_portfolio_metrics_chart(summary))
+    st.plotly_chart(figure_from_spec(spec), use_container_width=True)
+
+def render_correlation_heatmap(load_history, current_dataset_version, selected_symbols, start_date, end_date):
+    def build():
+        correlation_matrix = get_correlation_matrix(load_history, current_dataset_version, selected_symbols, start_date, end_date)
+        return create_correlation_heatmap(correlation_matrix)
+    
+    inputs = basket_figure_inputs(selected_symbols, start_date, end_date)
+    spec = cached_figure_spec(current_dataset_version, "correlation_heatmap", inputs, build)
+    if spec:
+        st.plotly_chart(figure_from_spec(spec), use_container_width=True)
+
+def is_admin_mode():
+    """Admin panel is opt-in via ?admin=1 or the BULLBOARD_ADMIN environment variable"""
+    if os.environ.get("BULLBOARD_ADMIN") == "1":
+        return True
+    try:
+        return st.query_params.get("admin") == "1"
+    except Exception:
+        return False
+
+def render_admin_panel(current_dataset_version):
+    """Sidebar panel with computation cache counters and rendering instrumentation"""
+    if not is_admin_mode():
+        return
+    
+    with st.sidebar.expander("🛠️ Admin: Cache & Performance", expanded=True):
+        st.caption(f"Dataset version: `{current_dataset_version}`")
+        stats = all_cache_stats()
+        if stats:
+            st.dataframe(pd.DataFrame(stats).set_index("cache"), use_container_width=True)
+        else:
+            st.write("No caches in use yet.")
+        
+        st.markdown("**Instrumentation**")
+        metrics = instrumentation_snapshot()
+        if metrics:
+            st.dataframe(pd.DataFrame(metrics).set_index("metric"), use_container_width=True)
+        else:
+            st.write("No measurements recorded yet.")
+        if st.button("🧹 Clear computation caches", key="admin_clear_caches"):
+            for name in [entry["cache"] for entry in stats]:
+                get_cache(name).clear()
+            st.rerun()
 
 def main():
     create_header()
@@ -1920,16 +930,16 @@ def main():
             import os
             
             # Check if file exists (log only, don't show to user)
-            if not os.path.exists("latest_results.csv"):
-                print("❌ File 'latest_results.csv' not found!")  # Console log only
+            if not os.path.exists(data_path):
+                print(f"❌ File '{data_path}' not found!")  # Console log only
                 return None
             
             # Log file info to console
-            file_size = os.path.getsize("latest_results.csv")
+            file_size = os.path.getsize(data_path)
             print(f"📁 Loading CSV file: {file_size:,} bytes")  # Console log only
             
             # Load data WITHOUT automatic date parsing
-            df = pd.read_csv("latest_results.csv")
+            df = pd.read_csv(data_path)
             
             print(f"📊 Raw data loaded: {df.shape}")  # Debug
             print(f"📊 Columns: {list(df.columns)}")  # Debug
@@ -1969,7 +979,7 @@ def main():
             return df
             
         except FileNotFoundError:
-            print("❌ File not found: latest_results.csv")
+            print(f"❌ File not found: {data_path}")
             return None
         except pd.errors.EmptyDataError:
             print("❌ CSV file is empty")
@@ -1983,7 +993,7 @@ def main():
             return df
             
         except FileNotFoundError:
-            print("❌ File not found: latest_results.csv")
+            print(f"❌ File not found: {data_path}")
             return None
         except pd.errors.EmptyDataError:
             print("❌ CSV file is empty")
@@ -1994,51 +1004,82 @@ def main():
             traceback.print_exc()
             return None
     
-    # Load and validate data with caching
-    df = load_and_validate_data()
-    # === ADD THIS DEBUG SECTION HERE ===
-    print("=== DEBUG: DATA LOADING RESULT ===")
-    try:
-        import os
-        print(f"Current directory: {os.getcwd()}")
-        print(f"Files in directory: {os.listdir('.')}")
+    # The landing page renders from the ETL's snapshot table; the full history is only
+    # read once something below actually needs it (cached summaries and figures do not)
+    # Resolved once per run: CURRENT may flip mid-session, but a run only ever reads one version
+    current_dataset_version = current_version()
+    data_path = dataset_path(current_dataset_version)
+    history = {}
+    
+    def load_full_history():
+        """Full price history, read at most once per run and shared across sessions per dataset version"""
+        if 'df' in history:
+            return history['df']
+        history_cache = get_cache("full_history", max_bytes=1024 * 1024 * 1024, persist=False)
+        df = history_cache.get((current_dataset_version,))
+        if df is None:
+            # After an incremental publish only the changed rows are applied; otherwise reload
+            df = roll_forward(history_cache, current_dataset_version, apply_delta, "full_history")
+            if df is None:
+                df = load_and_validate_data()
+            if df is not None:
+                # Keep a single version resident; sessions on an older one reload from its directory
+                history_cache.clear()
+                history_cache.put((current_dataset_version,), df)
+        # === ADD THIS DEBUG SECTION HERE ===
+        print("=== DEBUG: DATA LOADING RESULT ===")
+        try:
+            import os
+            print(f"Current directory: {os.getcwd()}")
+            print(f"Files in directory: {os.listdir('.')}")
         
-        if os.path.exists('latest_results.csv'):
-            print("✅ latest_results.csv EXISTS")
-            file_size = os.path.getsize('latest_results.csv')
-            print(f"File size: {file_size:,} bytes")
+            if os.path.exists(data_path):
+                print(f"✅ {data_path} EXISTS")
+                file_size = os.path.getsize(data_path)
+                print(f"File size: {file_size:,} bytes")
             
-            # Check what load_and_validate_data() actually returned
-            print(f"df is None: {df is None}")
-            if df is not None:
-                print(f"DataFrame shape: {df.shape}")
-                print(f"Columns: {list(df.columns)}")
-                print(f"Sample data:")
-                print(df.head())
-                print(f"Unique symbols: {df['symbol'].nunique() if 'symbol' in df.columns else 'NO SYMBOL COLUMN'}")
-            else:
-                print("❌ load_and_validate_data() returned None")
+                # Check what load_and_validate_data() actually returned
+                print(f"df is None: {df is None}")
+                if df is not None:
+                    print(f"DataFrame shape: {df.shape}")
+                    print(f"Columns: {list(df.columns)}")
+                    print(f"Sample data:")
+                    print(df.head())
+                    print(f"Unique symbols: {df['symbol'].nunique() if 'symbol' in df.columns else 'NO SYMBOL COLUMN'}")
+                else:
+                    print("❌ load_and_validate_data() returned None")
                 
-                # Try loading manually to see what fails
-                try:
-                    df_test = pd.read_csv('latest_results.csv', parse_dates=["Date"])
-                    print(f"Manual load successful: {df_test.shape}")
-                    print(f"Manual load columns: {list(df_test.columns)}")
-                except Exception as manual_error:
-                    print(f"Manual load also failed: {manual_error}")
+                    # Try loading manually to see what fails
+                    try:
+                        df_test = pd.read_csv(data_path, parse_dates=["Date"])
+                        print(f"Manual load successful: {df_test.shape}")
+                        print(f"Manual load columns: {list(df_test.columns)}")
+                    except Exception as manual_error:
+                        print(f"Manual load also failed: {manual_error}")
             
-        else:
-            print("❌ latest_results.csv NOT FOUND")
+            else:
+                print(f"❌ {data_path} NOT FOUND")
             
-    except Exception as e:
-        print(f"❌ Debug error: {e}")
-        import traceback
-        traceback.print_exc()
-    print("=== END DEBUG ===")
-    # === END DEBUG SECTION ===
-    if df is None:
-        st.error("Failed to load data. Please refresh the data first.")
-        st.stop()
+        except Exception as e:
+            print(f"❌ Debug error: {e}")
+            import traceback
+            traceback.print_exc()
+        print("=== END DEBUG ===")
+        # === END DEBUG SECTION ===
+        if df is None:
+            st.error("Failed to load data. Please refresh the data first.")
+            st.stop()
+        history['df'] = df
+        return df
+    
+    snapshot, snapshot_meta = get_snapshot(current_dataset_version, load_full_history)
+    
+    # Provisional intraday rows (intraday.py) extend the published version between ETL runs.
+    # Basket analytics key on version+stamp so each intraday publish is picked up on the next
+    # rerun; the full history, snapshot and correlation index stay on the published version.
+    intraday_meta = provisional_meta(current_dataset_version)
+    provisional = get_provisional_rows(intraday_meta) if intraday_meta else None
+    analysis_version = current_dataset_version if provisional is None else f"{current_dataset_version}+{intraday_meta['stamp']}"
     
    # Data info section with improved metric cards
     st.markdown('<div class="section-header"><span class="section-icon">📊</span><h2>Market Overview</h2></div>', unsafe_allow_html=True)
@@ -2046,15 +1087,15 @@ def main():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        create_metric_card("Stocks Analyzed", str(df['symbol'].nunique()), "Active Symbols", "🏢")
+        create_metric_card("Stocks Analyzed", str(snapshot_meta['symbols']), "Active Symbols", "🏢")
     
     with col2:
-        create_metric_card("Data Points", f"{len(df):,}", "Total Records", "📊")
+        create_metric_card("Data Points", f"{snapshot_meta['rows']:,}", "Total Records", "📊")
     
     with col3:
-        if 'download_time' in df.columns and not df['download_time'].isna().all():
+        if snapshot_meta.get('download_time'):
             try:
-                last_update = pd.to_datetime(df['download_time'].iloc[0])
+                last_update = pd.to_datetime(snapshot_meta['download_time'])
                 formatted_time = last_update.strftime("%H:%M")
                 create_metric_card("Last Update", formatted_time, "Today", "🕐")
             except:
@@ -2063,28 +1104,29 @@ def main():
             create_metric_card("Last Update", "Recent", "Data Fresh", "🕐")
     
     with col4:
-        date_range = df['Date'].max() - df['Date'].min()
+        date_range = pd.Timestamp(snapshot_meta['last_date']) - pd.Timestamp(snapshot_meta['first_date'])
         create_metric_card("Date Range", f"{date_range.days}", "Days Coverage", "📅")
     
     # Add some spacing after metrics
     st.markdown("<br>", unsafe_allow_html=True)
     
-
-    @st.cache_data
-    def get_processed_symbols(_df):
-        """Cache symbol processing"""
-        return sorted(_df['symbol'].unique())
-    
-    unique_symbols = get_processed_symbols(df)
-    selected_symbols = create_user_friendly_stock_selection(unique_symbols)
-    
-    # Filter data based on selection
-    filtered_df = df[df['symbol'].isin(selected_symbols)] if selected_symbols else df
-    
-    # Date Range Selection
-    if not filtered_df.empty:
-        min_date = filtered_df['Date'].min().date()
-        max_date = filtered_df['Date'].max().date()
+    unique_symbols = sorted(snapshot['symbol'])
+    init_basket_state()
+    create_user_friendly_stock_selection(unique_symbols)
+    # Analytics only follow the committed basket, so basket edits never trigger a recompute
+    selected_symbols = get_committed_basket(unique_symbols)
+    
+    # Date Range Selection (bounds come from the snapshot's per-symbol first/last dates)
+    basket_rows = snapshot[snapshot['symbol'].isin(selected_symbols)] if selected_symbols else snapshot
+    analysis_start, analysis_end = None, None
+    if not basket_rows.empty:
+        min_date = basket_rows['first_date'].min().date()
+        max_date = basket_rows['last_date'].max().date()
+        if provisional is not None:
+            provisional_dates = provisional.loc[provisional['symbol'].isin(basket_rows['symbol']), 'Date']
+            if not provisional_dates.empty:
+                max_date = max(max_date, provisional_dates.max().date())
+        analysis_start, analysis_end = min_date, max_date
         
         date_range = st.date_input(
             "Select analysis period",
@@ -2094,42 +1136,61 @@ def main():
         )
         
         if isinstance(date_range, tuple) and len(date_range) == 2:
-            start_date, end_date = date_range
-            filtered_df = filtered_df[
-                (filtered_df['Date'] >= pd.to_datetime(start_date)) &
-                (filtered_df['Date'] <= pd.to_datetime(end_date))
-            ]
+            analysis_start, analysis_end = date_range
+        if provisional is not None:
+            st.caption(f"⚡ Includes provisional intraday values as of {intraday_meta.get('as_of') or intraday_meta['written_at']}")
     
-    if filtered_df.empty:
+    if basket_rows.empty:
         st.warning("No data available for selected stocks and date range.")
         st.stop()
     
-    @st.cache_data
-    def calculate_summary_statistics(_filtered_df, selected_symbols_hash, date_hash):
-        """Cache expensive summary calculations"""
-        return (
-            _filtered_df
-            .groupby("symbol")
-            .agg(
-                period_start=("Date", "min"),
-                period_end=("Date", "max"),
-                period_days=("Date", "count"),
-                avg_close=("Close", "mean"),
-                avg_daily_return=("daily_return", "mean"),
-                total_return=("Close", lambda x: (x.iloc[-1] / x.iloc[0]) - 1 if len(x) > 1 and x.iloc[0] != 0 else np.nan),
-                volatility_21=("volatility_21", "mean"),
-                avg_rolling_yield_21=("rolling_yield_21", "mean"),
-                avg_sharpe_21=("sharpe_21", "mean"),
-                avg_max_drawdown_63=("max_drawdown_63", "mean"),
-                avg_custom_risk_score=("custom_risk_score", "mean"),
-            )
-            .reset_index()
-        )
+    # Optional SQLite backend (BULLBOARD_HISTORY_DB) pushes slicing and aggregation into the engine
+    history_store = get_history_store(current_dataset_version)
     
-    # Generate summary statistics with caching
-    symbols_hash = hash(str(sorted(selected_symbols))) if selected_symbols else 0
-    date_hash = hash(str(date_range)) if 'date_range' in locals() else 0
-    summary = calculate_summary_statistics(filtered_df, symbols_hash, date_hash)
+    def load_returns_history():
+        if history_store is not None:
+            return history_store.column_history('daily_return')
+        return load_full_history()
+    
+    def load_filtered_history():
+        """Selected stocks over the analysis period, sliced from the (lazily loaded) full history"""
+        if 'filtered' not in history:
+            if history_store is not None:
+                # Only the basket's rows for the period ever leave the database
+                filtered_df = history_store.basket_history(selected_symbols or unique_symbols, analysis_start, analysis_end)
+            else:
+                df = load_full_history()
+                filtered_df = df[df['symbol'].isin(selected_symbols)] if selected_symbols else df
+                if analysis_start is not None:
+                    filtered_df = filtered_df[
+                        (filtered_df['Date'] >= pd.to_datetime(analysis_start)) &
+                        (filtered_df['Date'] <= pd.to_datetime(analysis_end))
+                    ]
+            if provisional is not None:
+                rows = provisional[provisional['symbol'].isin(selected_symbols or unique_symbols)]
+                if analysis_start is not None:
+                    rows = rows[(rows['Date'] >= pd.to_datetime(analysis_start)) & (rows['Date'] <= pd.to_datetime(analysis_end))]
+                if not rows.empty:
+                    filtered_df = append_merge(filtered_df.reset_index(drop=True), rows.reindex(columns=filtered_df.columns))
+            if filtered_df.empty:
+                st.warning("No data available for selected stocks and date range.")
+                st.stop()
+            history['filtered'] = filtered_df
+        return history['filtered']
+    
+    # Generate summary statistics through the bounded computation cache.
+    # The key includes the dataset version so a new ETL publish never serves stale results.
+    summary_cache = get_cache("summary_statistics", max_bytes=64 * 1024 * 1024)
+    summary_key = make_key(analysis_version, selected_symbols, (analysis_start, analysis_end), SUMMARY_METRICS)
+    def compute_summary():
+        if history_store is not None and provisional is None:
+            return history_store.summary_statistics(selected_symbols or unique_symbols, analysis_start, analysis_end)
+        return calculate_summary_statistics(load_filtered_history(), SUMMARY_METRICS)
+    
+    summary = summary_cache.get_or_compute(summary_key, compute_summary)
+    if summary.empty:
+        st.warning("No data available for selected stocks and date range.")
+        st.stop()
 
     # Portfolio Overview
     if len(selected_symbols) > 1:
@@ -2210,42 +1271,20 @@ def main():
                 "⚠️"
             )
    # Create portfolio context for individual stock analysis
-    portfolio_context = {
-        'avg_return': summary['total_return'].mean(),
-        'avg_volatility': summary['volatility_21'].mean() if 'volatility_21' in summary.columns else 0,
-        'portfolio_size': len(selected_symbols),
-        'best_performer': summary.loc[summary['total_return'].idxmax(), 'symbol'] if not summary.empty else None,
-        'worst_performer': summary.loc[summary['total_return'].idxmin(), 'symbol'] if not summary.empty else None
-    }
+    portfolio_context = build_portfolio_context(summary, selected_symbols)
             
     # Individual Stock Analysis Section
     st.subheader("🔍 Individual Stock Analysis")
     st.markdown("*Comprehensive analysis for all your selected stocks*")  
     
-    # Analyze ALL selected stocks, sorted by return (best first, but show all)
-    all_stocks = summary.sort_values('total_return', ascending=False)
+    # Every tier and score for the whole selection comes from one vectorized pass
+    insights_cache = get_cache("insight_tables", max_bytes=32 * 1024 * 1024)
+    insight_table = insights_cache.get_or_compute(
+        summary_key,
+        lambda: build_insight_table(summary, portfolio_context)
+    )
     
-    for _, row in all_stocks.iterrows():
-        # Get comprehensive insights for EVERY stock
-        comprehensive_insights = generate_comprehensive_analysis(row['symbol'], row, portfolio_context)
-        
-        if comprehensive_insights:
-            # Add a visual indicator for performance level
-            return_pct = row['total_return']
-            if return_pct > 0.15:
-                performance_indicator = "🚀 Strong Performer"
-            elif return_pct > 0.05:
-                performance_indicator = "📈 Positive"
-            elif return_pct > 0:
-                performance_indicator = "📊 Modest Gains"
-            elif return_pct > -0.10:
-                performance_indicator = "📉 Declining"
-            else:
-                performance_indicator = "⚠️ Significant Decline"
-            
-            with st.expander(f"📊 {row['symbol']} - {performance_indicator} ({return_pct:.1%})"):
-                for insight in comprehensive_insights:
-                    st.markdown(insight)
+    render_stock_analysis_list(insight_table)
                     
 # Advanced Analytics Section
     st.markdown('<div class="section-header"><span class="section-icon">🧠</span><h2>Advanced Market Intelligence</h2></div>', unsafe_allow_html=True)
@@ -2273,25 +1312,19 @@ def main():
     
     # Risk vs Return Scatter Plot
     if not summary.empty:
-        fig = create_risk_return_scatter(summary)
-        st.plotly_chart(fig, use_container_width=True)
+        render_risk_return_chart(summary, summary_key)
     
     # Performance Comparison Chart
     if selected_symbols:
-        perf_fig = create_performance_chart(filtered_df, selected_symbols)
-        if perf_fig:
-            st.plotly_chart(perf_fig, use_container_width=True)
+        render_performance_chart(load_filtered_history, selected_symbols, analysis_version, analysis_start, analysis_end)
     
     # Metrics Comparison Chart
     if not summary.empty:
-        metrics_fig = create_portfolio_metrics_chart(summary)
-        st.plotly_chart(metrics_fig, use_container_width=True)
+        render_portfolio_metrics_chart(summary, summary_key)
     
     # Correlation Heatmap
     if len(selected_symbols) > 1:
-        corr_fig = create_correlation_heatmap(filtered_df, selected_symbols)
-        if corr_fig:
-            st.plotly_chart(corr_fig, use_container_width=True)
+        render_correlation_heatmap(load_returns_history, current_dataset_version, selected_symbols, analysis_start, analysis_end)
     
     # Data Table Section
     st.markdown('<div class="section-header"><span class="section-icon">📋</span><h2>Detailed Analysis</h2></div>', unsafe_allow_html=True)
@@ -2340,5 +1373,8 @@ def main():
             for _, row in top_sharpe.iterrows():
                 st.markdown(f"• **{row['symbol']}**: {row['avg_sharpe_21']:.2f}")
 
+    render_admin_panel(current_dataset_version)
+
 if __name__ == "__main__":
-    main()
+    with timed("app.script_run_ms"):
+        main()
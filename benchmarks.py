@@ -0,0 +1,322 @@
+"""
+BullBoard performance benchmarks.
+
+Run from a directory that contains a published dataset, e.g.:
+
+    python benchmarks.py app-startup --runs 5
+    python benchmarks.py append-merge --runs 5
+    python benchmarks.py sharded-analytics --runs 3
+    python benchmarks.py out-of-core-etl --runs 1
+    python benchmarks.py rolling-state --runs 5
+    python benchmarks.py rolling-kernels --runs 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(REPO_DIR, "app.py")
+
+_COLD_START_SNIPPET = """
+import json, sys, time
+sys.path.insert(0, {repo_dir!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app_path!r}, default_timeout=300)
+start = time.perf_counter()
+at.run()
+cold = time.perf_counter() - start
+warm = []
+for _ in range({warm_runs}):
+    start = time.perf_counter()
+    at.run()
+    warm.append(time.perf_counter() - start)
+print(json.dumps({{"cold": cold, "warm": warm, "errors": [str(e.value) for e in at.exception]}}))
+"""
+
+_ETL_MEMORY_SNIPPET = """
+import json, os, sys, tempfile, time
+sys.path.insert(0, {repo_dir!r})
+os.environ["BULLBOARD_DATA_DIR"] = tempfile.mkdtemp()
+import numpy as np
+import pandas as pd
+from datastore import publish_dataset, read_dataset, read_partition
+from etl import validate_data_quality
+from etl_streaming import stream_to_version, peak_rss_bytes
+from rolling_analytics import compute_rolling_analytics
+
+dates = pd.bdate_range(end="2025-06-30", periods={days})
+
+def fetch_symbol(ticker):
+    rng = np.random.default_rng(int(ticker[1:]))
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.01, len(dates)))
+    return pd.DataFrame({{
+        "Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+        "Volume": rng.integers(1000, 100000, len(dates)), "symbol": ticker, "Date": dates,
+        "download_time": "2025-06-30 18:00",
+    }})
+
+def transform(df):
+    return validate_data_quality(compute_rolling_analytics(df))
+
+tickers = [f"S{{i:05d}}" for i in range({n_symbols})]
+if {out_of_core}:
+    version, failed, stats = stream_to_version(tickers, fetch_symbol, transform, len(dates), memory_limit={memory_limit})
+    rows = stats["rows"]
+else:
+    df = transform(pd.concat([fetch_symbol(t) for t in tickers], ignore_index=True))
+    rows = len(df)
+    version = publish_dataset(df)
+    del df
+peak_rss = peak_rss_bytes()
+
+# Reading one symbol back: its partition by byte range, else (no partition index) the whole file
+probe = tickers[len(tickers) // 2]
+start = time.perf_counter()
+symbol_rows = read_partition(version, probe)
+if symbol_rows is None:
+    symbol_rows = read_dataset(version)
+symbol_rows = symbol_rows[symbol_rows["symbol"] == probe]
+read_s = time.perf_counter() - start
+print(json.dumps({{"rows": rows, "peak_rss": peak_rss, "read_symbol_s": read_s, "symbol_rows": len(symbol_rows)}}))
+"""
+
+
+def _summarize(label, samples):
+    samples = sorted(samples)
+    median = samples[len(samples) // 2]
+    print(f"  {label:<28} median {median * 1000:8.1f} ms   min {samples[0] * 1000:8.1f} ms   max {samples[-1] * 1000:8.1f} ms")
+    return median
+
+
+def bench_app_startup(runs=5, warm_runs=5):
+    """Cold start (fresh process, first script run) and warm rerun timings of app.py"""
+    print(f"=== APP STARTUP BENCHMARK ({runs} cold starts, {warm_runs} warm reruns each) ===")
+    snippet = _COLD_START_SNIPPET.format(repo_dir=REPO_DIR, app_path=APP_PATH, warm_runs=warm_runs)
+    cold, warm = [], []
+    for i in range(runs):
+        result = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True, cwd=os.getcwd())
+        lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+        if result.returncode != 0 or not lines:
+            print(result.stderr[-2000:])
+            raise RuntimeError("App benchmark subprocess failed")
+        data = json.loads(lines[-1])
+        if data["errors"]:
+            print(f"  ⚠️ App raised during run {i + 1}: {data['errors']}")
+        cold.append(data["cold"])
+        warm.extend(data["warm"])
+    return {
+        "cold_start_ms": _summarize("Cold start (first run)", cold) * 1000,
+        "warm_rerun_ms": _summarize("Warm rerun", warm) * 1000,
+    }
+
+
+def _synthetic_history(symbols, dates, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.MultiIndex.from_product([symbols, dates], names=["symbol", "Date"]).to_frame(index=False)
+    for column in ["Open", "High", "Low", "Close", "Volume", "daily_return"]:
+        df[column] = rng.random(len(df))
+    df["download_time"] = "2025-01-01 10:00"
+    return df
+
+
+def bench_append_merge(runs=5, n_symbols=500, years=(1, 5, 20), overlap_days=5):
+    """Incremental merge of one new day (plus an overlap window) for n_symbols, old vs new path"""
+    from datastore import append_merge
+
+    print(f"=== APPEND-MERGE BENCHMARK ({n_symbols} symbols, 1 new day + {overlap_days} overlap, {runs} runs) ===")
+    symbols = [f"S{i:04d}" for i in range(n_symbols)]
+    results = {}
+    for n_years in years:
+        dates = pd.bdate_range(end="2025-06-30", periods=252 * n_years + 1)
+        existing = _synthetic_history(symbols, dates[:-1])
+        new = _synthetic_history(symbols, dates[-(overlap_days + 1):], seed=1).drop(columns=["daily_return"])
+
+        def concat_dedupe_sort():
+            df = pd.concat([existing, new], ignore_index=True)
+            df = df.drop_duplicates(subset=["symbol", "Date"], keep="last")
+            return df.sort_values(["symbol", "Date"]).reset_index(drop=True)
+
+        pd.testing.assert_frame_equal(append_merge(existing, new), concat_dedupe_sort())
+        timings = {}
+        for label, fn in (("concat + dedupe + sort", concat_dedupe_sort), ("append_merge", lambda: append_merge(existing, new))):
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                fn()
+                samples.append(time.perf_counter() - start)
+            timings[label] = _summarize(f"{n_years}y {label}", samples) * 1000
+        results[f"{n_years}y"] = {"rows": len(existing), **{f"{k}_ms": v for k, v in timings.items()}}
+    return results
+
+
+def bench_sharded_analytics(runs=3, n_symbols=2000, days=1260, max_workers=None):
+    """Rolling analytics + quality flags in-process vs sharded over 2, 4, ... up to the core count"""
+    from rolling_analytics import compute_rolling_analytics, compute_analytics_sharded, quality_flags
+
+    max_workers = max_workers or os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+    print(f"=== SHARDED ANALYTICS BENCHMARK ({n_symbols} symbols x {days} days, workers {counts}, {runs} runs) ===")
+
+    df = _synthetic_history([f"S{i:04d}" for i in range(n_symbols)], pd.bdate_range(end="2025-06-30", periods=days))
+    df = df.drop(columns=["daily_return"])
+    df["Close"] = 100 + df["Close"]
+
+    def in_process():
+        result = compute_rolling_analytics(df.copy())
+        return result, quality_flags(result)
+
+    results = {}
+    baseline = None
+    for workers in counts:
+        fn = in_process if workers == 1 else (lambda w=workers: compute_analytics_sharded(df.copy(), w))
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        median = _summarize(f"{workers} worker(s)", samples)
+        baseline = baseline or median
+        results[f"{workers}_workers"] = {"ms": median * 1000, "speedup": round(baseline / median, 2)}
+        print(f"    speedup x{baseline / median:.2f}")
+    return results
+
+
+def bench_out_of_core_etl(runs=1, universes=(500, 2000, 10000), days=500, memory_limit_mb=256):
+    """Peak RSS of a synthetic full refresh, whole-frame vs out-of-core, as the universe grows, and the
+    time to read one symbol back (out-of-core versions have a partition index)"""
+    print(f"=== OUT-OF-CORE ETL BENCHMARK ({days} days per symbol, limit {memory_limit_mb} MB, {runs} run(s)) ===")
+    results = {}
+    for n_symbols in universes:
+        for label, out_of_core in (("whole-frame", False), ("out-of-core", True)):
+            snippet = _ETL_MEMORY_SNIPPET.format(
+                repo_dir=REPO_DIR, days=days, n_symbols=n_symbols, out_of_core=out_of_core,
+                memory_limit=memory_limit_mb * 1024 * 1024,
+            )
+            samples, peaks, reads = [], [], []
+            for _ in range(runs):
+                start = time.perf_counter()
+                result = subprocess.run([sys.executable, "-c", snippet], capture_output=True, text=True)
+                elapsed = time.perf_counter() - start
+                lines = [line for line in result.stdout.splitlines() if line.startswith("{")]
+                if result.returncode != 0 or not lines:
+                    print(result.stderr[-2000:])
+                    raise RuntimeError("ETL memory benchmark subprocess failed")
+                samples.append(elapsed)
+                data = json.loads(lines[-1])
+                peaks.append(data["peak_rss"] / 2**20)
+                reads.append(data["read_symbol_s"])
+            median = _summarize(f"{n_symbols} symbols {label}", samples)
+            read_ms = sorted(reads)[len(reads) // 2] * 1000
+            print(f"    peak RSS {max(peaks):8.1f} MB   one-symbol read {read_ms:8.1f} ms")
+            results[f"{n_symbols}_{label}"] = {"s": round(median, 2), "peak_rss_mb": round(max(peaks), 1), "read_symbol_ms": round(read_ms, 1)}
+    return results
+
+
+def bench_rolling_state(runs=5, n_symbols=500, years=(1, 5, 20)):
+    """Analytics for one new day: full recompute over the history vs advancing the saved rolling state
+    (equivalence: tests/test_rolling_state.py)"""
+    import tempfile
+    from rolling_analytics import compute_rolling_analytics
+    from rolling_state import RollingState
+
+    print(f"=== ROLLING STATE BENCHMARK ({n_symbols} symbols, 1 new day, {runs} runs) ===")
+    symbols = [f"S{i:04d}" for i in range(n_symbols)]
+    results = {}
+    for n_years in years:
+        dates = pd.bdate_range(end="2025-06-30", periods=252 * n_years + 1)
+        df = _synthetic_history(symbols, dates).drop(columns=["daily_return"])
+        df["Close"] = 100 + df["Close"]
+        path = os.path.join(tempfile.mkdtemp(), "rolling_state.npz")
+        RollingState.from_history(df[df["Date"] < dates[-1]]).save(path)
+
+        def full_recompute():
+            return compute_rolling_analytics(df.copy())
+
+        def from_state():
+            return RollingState.load(path).extend(df)
+
+        timings = {}
+        for label, fn in (("full recompute", full_recompute), ("rolling state", from_state)):
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                fn()
+                samples.append(time.perf_counter() - start)
+            timings[label] = _summarize(f"{n_years}y {label}", samples) * 1000
+        print(f"    state file {os.path.getsize(path) / 1024:.0f} KB")
+        results[f"{n_years}y"] = {"rows": len(df), "state_kb": round(os.path.getsize(path) / 1024), **{f"{k}_ms": v for k, v in timings.items()}}
+    return results
+
+
+def bench_rolling_kernels(runs=3, n_symbols=500, years=(1, 5, 20)):
+    """Full-history rolling analytics with each rolling backend (equivalence: tests/test_rolling_kernels.py)"""
+    from rolling_analytics import compute_rolling_analytics
+    from rolling_kernels import BACKENDS, available_backends
+
+    backends = available_backends()
+    print(f"=== ROLLING KERNELS BENCHMARK ({n_symbols} symbols, {runs} runs) ===")
+    for backend in BACKENDS:
+        if backend not in backends:
+            print(f"  {backend}: not installed, skipped")
+    symbols = [f"S{i:04d}" for i in range(n_symbols)]
+    results = {}
+    for n_years in years:
+        dates = pd.bdate_range(end="2025-06-30", periods=252 * n_years)
+        df = _synthetic_history(symbols, dates).drop(columns=["daily_return"])
+        df["Close"] = 100 + df["Close"]
+        # Flat stretches and gaps exercise the exact-constant and NaN-window paths
+        df.loc[df.index % 997 < 30, "Close"] = 150.0
+        df.loc[df.index % 4999 == 0, "Close"] = np.nan
+        timings = {}
+        for backend in backends:
+            # Untimed first call: it compiles the numba kernel (or loads it from numba's cache)
+            compute_rolling_analytics(df.copy(), backend=backend)
+            samples = []
+            for _ in range(runs):
+                frame = df.copy()
+                start = time.perf_counter()
+                compute_rolling_analytics(frame, backend=backend)
+                samples.append(time.perf_counter() - start)
+            timings[backend] = _summarize(f"{n_years}y {backend}", samples) * 1000
+        results[f"{n_years}y"] = {"rows": len(df), **{f"{k}_ms": v for k, v in timings.items()}}
+    return results
+
+
+BENCHMARKS = {
+    "app-startup": bench_app_startup,
+    "append-merge": bench_append_merge,
+    "sharded-analytics": bench_sharded_analytics,
+    "out-of-core-etl": bench_out_of_core_etl,
+    "rolling-state": bench_rolling_state,
+    "rolling-kernels": bench_rolling_kernels,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BullBoard performance benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS) + ["all"])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    names = sorted(BENCHMARKS) if args.benchmark == "all" else [args.benchmark]
+    results = {}
+    for name in names:
+        start = time.perf_counter()
+        results[name] = BENCHMARKS[name](runs=args.runs)
+        print(f"  ({name} finished in {time.perf_counter() - start:.1f}s)\n")
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == "__main__":
+    main()
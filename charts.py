@@ -0,0 +1,248 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from compute_cache import get_cache, canonical_date_range
+
+# Roughly one point per horizontal pixel of a full-width chart
+DEFAULT_POINT_BUDGET = 1000
+# Above this many plotted points the performance chart switches to WebGL traces
+WEBGL_POINT_THRESHOLD = 5000
+# Serialized Plotly specs shared by every session in the process
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+def lttb_downsample(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of at most threshold points that preserve shape"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    # Interior points split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 2 < len(edges):
+            next_start, next_end = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+        else:
+            next_start, next_end = n - 1, n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Point in this bucket forming the largest triangle with the last pick and next average
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        selected[i + 1] = a
+    return selected
+
+
+def normalized_performance_series(filtered_df, selected_symbols, point_budget=DEFAULT_POINT_BUDGET):
+    """Base-100 close series per symbol, each reduced to at most point_budget points"""
+    data = filtered_df.loc[filtered_df['symbol'].isin(selected_symbols), ['Date', 'Close', 'symbol']]
+    if data.empty:
+        return pd.DataFrame(columns=['Date', 'normalized', 'symbol'])
+    data = data.sort_values(['symbol', 'Date'])
+    first_close = data.groupby('symbol')['Close'].transform('first')
+    data = data.assign(normalized=data['Close'] / first_close * 100)
+
+    parts = []
+    for symbol, group in data.groupby('symbol', sort=False):
+        if len(group) > point_budget:
+            x = group['Date'].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+            keep = lttb_downsample(x, group['normalized'].to_numpy(), point_budget)
+            group = group.iloc[keep]
+        parts.append(group[['Date', 'normalized', 'symbol']])
+
+    # Preserve the caller's symbol order for stable trace colours
+    order = {symbol: i for i, symbol in enumerate(selected_symbols)}
+    parts.sort(key=lambda part: order.get(part['symbol'].iloc[0], len(order)))
+    return pd.concat(parts, ignore_index=True)
+
+
+def create_risk_return_scatter(summary):
+    """Create interactive risk vs return scatter plot"""
+    import plotly.express as px  # Deferred: plotly is only loaded once a chart renders
+
+    # Remove rows with NaN values that cause plotting issues
+    clean_summary = summary.dropna(subset=['avg_custom_risk_score', 'avg_rolling_yield_21', 'total_return'])
+
+    if clean_summary.empty:
+        return None
+
+    fig = px.scatter(
+        clean_summary,
+        x='avg_custom_risk_score',
+        y='avg_rolling_yield_21',
+        size=abs(clean_summary['total_return']) + 0.01,  # Ensure no zero/negative sizes
+        color='total_return',
+        hover_name='symbol',
+        title="Risk vs Return Analysis",
+        labels={
+            'avg_custom_risk_score': 'Risk Score',
+            'avg_rolling_yield_21': 'Average Return',
+            'total_return': 'Total Return'
+        },
+        color_continuous_scale='RdYlGn'
+    )
+
+    fig.update_layout(
+        title_font_size=16,
+        height=500,
+        showlegend=True
+    )
+
+    return fig
+
+
+def create_performance_chart(combined_data):
+    """Create normalized performance comparison chart"""
+    import plotly.express as px
+
+    if combined_data is None or combined_data.empty:
+        return None
+
+    # SVG is fine for small charts; WebGL keeps large baskets responsive in the browser
+    render_mode = 'webgl' if len(combined_data) > WEBGL_POINT_THRESHOLD else 'svg'
+
+    fig = px.line(
+        combined_data,
+        x='Date',
+        y='normalized',
+        color='symbol',
+        title="Normalized Performance Comparison (Base 100)",
+        color_discrete_sequence=px.colors.qualitative.Set1,
+        render_mode=render_mode
+    )
+
+    fig.update_layout(
+        title={
+            'text': "Normalized Performance Comparison (Base 100)",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 20, 'family': 'Inter'}
+        },
+        xaxis_title="Date",
+        yaxis_title="Normalized Price",
+        font=dict(family="Inter", size=12),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=400,
+        hovermode='x unified'
+    )
+
+    fig.update_xaxes(gridcolor='lightgray', gridwidth=0.5)
+    fig.update_yaxes(gridcolor='lightgray', gridwidth=0.5)
+
+    return fig
+
+
+def create_portfolio_metrics_chart(summary):
+    """Create portfolio metrics comparison chart"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    metrics = ['volatility_21', 'avg_rolling_yield_21', 'avg_sharpe_21']
+    metric_names = ['Volatility', 'Expected Return', 'Sharpe Ratio']
+
+    fig = make_subplots(
+        rows=1, cols=3,
+        subplot_titles=metric_names,
+        specs=[[{"secondary_y": False}, {"secondary_y": False}, {"secondary_y": False}]]
+    )
+
+    colors = ['#e74c3c', '#2ecc71', '#3498db']
+
+    for i, (metric, name, color) in enumerate(zip(metrics, metric_names, colors)):
+        top_5 = summary.nlargest(5, metric)
+
+        fig.add_trace(
+            go.Bar(
+                x=top_5['symbol'],
+                y=top_5[metric],
+                name=name,
+                marker_color=color,
+                showlegend=False
+            ),
+            row=1, col=i+1
+        )
+
+    fig.update_layout(
+        title={
+            'text': "Top 5 Stocks by Key Metrics",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 20, 'family': 'Inter'}
+        },
+        font=dict(family="Inter", size=12),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=400
+    )
+
+    return fig
+
+
+def create_correlation_heatmap(correlation_matrix):
+    """Create correlation heatmap for selected stocks"""
+    import plotly.express as px
+
+    if correlation_matrix is None or len(correlation_matrix) < 2:
+        return None
+
+    if correlation_matrix.isna().all().all():
+        return None
+
+    fig = px.imshow(
+        correlation_matrix,
+        title="Stock Correlation Matrix",
+        color_continuous_scale='RdBu',
+        aspect='auto'
+    )
+
+    fig.update_layout(
+        title={
+            'text': "Stock Correlation Matrix",
+            'x': 0.5,
+            'xanchor': 'center',
+            'font': {'size': 20, 'family': 'Inter'}
+        },
+        font=dict(family="Inter", size=12),
+        height=500
+    )
+
+    return fig
+
+
+def cached_figure_spec(dataset_version, chart_type, inputs, build_fn):
+    """Plotly JSON spec for a chart, built with build_fn only on a cache miss.
+
+    inputs must be a hashable, canonical description of everything the figure
+    depends on. A chart with nothing to show is cached as None.
+    """
+    figure_cache = get_cache("figures", max_bytes=FIGURE_CACHE_MAX_BYTES)
+
+    def build():
+        fig = build_fn()
+        return fig.to_json() if fig is not None else None
+
+    return figure_cache.get_or_compute((str(dataset_version), chart_type) + tuple(inputs), build)
+
+
+def basket_figure_inputs(symbols, start_date, end_date, *extra):
+    """Figure-cache inputs for charts whose traces follow the basket order"""
+    return (tuple(symbols), canonical_date_range(start_date, end_date)) + tuple(extra)
+
+
+def figure_from_spec(spec):
+    """Rehydrate a cached spec; it was validated when first built, so skip plotly's validators"""
+    import plotly.graph_objects as go
+    return go.Figure(json.loads(spec), _validate=False)
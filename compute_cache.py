@@ -0,0 +1,245 @@
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Optional on-disk persistence; leave unset to keep caches in memory only
+CACHE_DIR_ENV = "BULLBOARD_CACHE_DIR"
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 512 * 1024 * 1024
+
+
+def canonical_symbols(symbols):
+    """Order- and duplicate-insensitive representation of a symbol basket"""
+    return tuple(sorted(set(symbols or [])))
+
+
+def canonical_date_range(start, end):
+    """Normalize a (start, end) pair to ISO date strings"""
+    def _norm(value):
+        if value is None:
+            return None
+        return pd.Timestamp(value).strftime("%Y-%m-%d")
+    return (_norm(start), _norm(end))
+
+
+def make_key(dataset_version, symbols, date_range, metrics):
+    """Build a cache key from (dataset version, symbol set, date range, metric set)"""
+    start, end = date_range if date_range else (None, None)
+    return (
+        str(dataset_version),
+        canonical_symbols(symbols),
+        canonical_date_range(start, end),
+        tuple(sorted(metrics)),
+    )
+
+
+def estimate_size(value):
+    """Approximate the in-memory footprint of a cached value in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray) or isinstance(getattr(value, "nbytes", None), int):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 1024
+
+
+class ComputeCache:
+    """Thread-safe LRU cache bounded by total bytes, optionally mirrored to disk"""
+
+    def __init__(self, name, max_bytes=DEFAULT_MAX_BYTES, persist_dir=None,
+                 max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.persist_dir = os.path.join(persist_dir, name) if persist_dir else None
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        if self.persist_dir:
+            os.makedirs(self.persist_dir, exist_ok=True)
+
+    # --- public API ---
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+
+        value = self._load_from_disk(key)
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self._insert(key, value, persist=False)
+                return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._insert(key, value, persist=True)
+        return value
+
+    def get_or_compute(self, key, compute_fn):
+        """Return the cached value for key, computing and storing it on a miss"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is not sentinel:
+            return value
+        return self.put(key, compute_fn())
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._entries:
+                return True
+        return bool(self.persist_dir) and os.path.exists(self._disk_path(key))
+
+    def keys(self):
+        """In-memory keys, least recently used first"""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self, disk=False):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if disk and self.persist_dir:
+                for fname in os.listdir(self.persist_dir):
+                    if fname.endswith(".pkl"):
+                        try:
+                            os.remove(os.path.join(self.persist_dir, fname))
+                        except OSError:
+                            pass
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "cache": self.name,
+                "entries": len(self._entries),
+                "size_mb": round(self._bytes / (1024 * 1024), 2),
+                "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "persistent": bool(self.persist_dir),
+            }
+
+    # --- internals ---
+    def _insert(self, key, value, persist):
+        size = estimate_size(value)
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            # Too large to hold in memory; still persist so restarts can reuse it
+            if persist:
+                self._save_to_disk(key, value)
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+        if persist:
+            self._save_to_disk(key, value)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.persist_dir, f"{digest}.pkl")
+
+    def _load_from_disk(self, key):
+        if not self.persist_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                stored_key, value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        except Exception as e:
+            print(f"⚠️ Cache '{self.name}': unreadable entry {path}: {e}")
+            return None
+        if stored_key != key:
+            return None
+        os.utime(path)  # Refresh recency for disk eviction
+        return value
+
+    def _save_to_disk(self, key, value):
+        if not self.persist_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ Cache '{self.name}': failed to persist entry: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._enforce_disk_budget()
+
+    def _enforce_disk_budget(self):
+        files = []
+        for fname in os.listdir(self.persist_dir):
+            if not fname.endswith(".pkl"):
+                continue
+            path = os.path.join(self.persist_dir, fname)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def get_cache(name, max_bytes=DEFAULT_MAX_BYTES, persist=True):
+    """Return the process-wide cache called name, creating it on first use"""
+    with _registry_lock:
+        cache = _registry.get(name)
+        if cache is None:
+            persist_dir = os.environ.get(CACHE_DIR_ENV) if persist else None
+            cache = ComputeCache(name, max_bytes=max_bytes, persist_dir=persist_dir)
+            _registry[name] = cache
+        return cache
+
+
+def all_cache_stats():
+    """Hit/miss/eviction counters for every registered cache"""
+    with _registry_lock:
+        caches = list(_registry.values())
+    return [cache.stats() for cache in caches]
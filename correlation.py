@@ -0,0 +1,381 @@
+import os
+import json
+import time
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+class WideReturns:
+    """Dates x symbols matrix of daily returns (NaN where a symbol has no bar)"""
+
+    def __init__(self, dates, symbols, values):
+        self.dates = pd.DatetimeIndex(dates)
+        self.symbols = list(symbols)
+        self.values = values
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @property
+    def nbytes(self):
+        return int(self.values.nbytes)
+
+    def column(self, symbol):
+        return self.values[:, self.symbol_index[symbol]]
+
+    def date_slice(self, start=None, end=None):
+        """Half-open row bounds [lo, hi) covering start..end inclusive"""
+        lo = 0 if start is None else int(self.dates.searchsorted(pd.Timestamp(start), side="left"))
+        hi = len(self.dates) if end is None else int(self.dates.searchsorted(pd.Timestamp(end), side="right"))
+        return lo, max(lo, hi)
+
+    def apply_delta(self, delta, value_column="daily_return"):
+        """New matrix with a dataset delta (datastore.compute_delta rows) applied"""
+        rows = delta[delta['change'] != 'remove']
+        dates = self.dates.union(pd.DatetimeIndex(rows['Date'].unique()))
+        symbols = sorted(set(self.symbols) | set(rows['symbol']))
+        symbol_index = {symbol: i for i, symbol in enumerate(symbols)}
+
+        values = np.full((len(dates), len(symbols)), np.nan)
+        old_columns = [symbol_index[symbol] for symbol in self.symbols]
+        values[np.ix_(dates.get_indexer(self.dates), old_columns)] = self.values
+        # Removed cells are cleared (they may not be in the matrix at all), then new values written
+        removed = delta[delta['change'] == 'remove']
+        row_idx = dates.get_indexer(removed['Date'])
+        col_idx = np.array([symbol_index.get(symbol, -1) for symbol in removed['symbol']], dtype=np.intp)
+        present = (row_idx >= 0) & (col_idx >= 0)
+        values[row_idx[present], col_idx[present]] = np.nan
+        values[dates.get_indexer(rows['Date']), [symbol_index[s] for s in rows['symbol']]] = \
+            rows[value_column].to_numpy(dtype=np.float64)
+
+        # Drop dates and symbols left without any value, as the pivot in build_wide_returns does
+        keep_rows = ~np.isnan(values).all(axis=1)
+        keep_columns = ~np.isnan(values).all(axis=0)
+        return WideReturns(
+            dates[keep_rows], [symbol for symbol, keep in zip(symbols, keep_columns) if keep],
+            values[keep_rows][:, keep_columns]
+        )
+
+
+def build_wide_returns(df, value_column="daily_return"):
+    """Pivot the long (symbol, Date) frame into a float64 dates x symbols matrix"""
+    pivot = df.pivot_table(index="Date", columns="symbol", values=value_column, aggfunc="last")
+    pivot = pivot.sort_index()
+    return WideReturns(pivot.index, pivot.columns.tolist(), pivot.to_numpy(dtype=np.float64))
+
+
+# Pair statistics take (dates x capacity^2) floats; larger baskets are computed directly
+MAX_TRACKED_SYMBOLS = 16
+
+
+def _correlation_from_stats(n, sx, sxx, sxy):
+    """Pairwise-complete correlation matrix from per-pair sums (sx[i, j]: sum of i where both present)"""
+    sy, syy = sx.T, sxx.T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[n < 2] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+    diagonal = np.flatnonzero(np.diag(var_x) > 0)
+    corr[diagonal, diagonal] = 1.0
+    return corr
+
+
+def pairwise_correlation(wide, symbols, start=None, end=None):
+    """Pairwise-complete correlation of symbols over start..end, straight from the return matrix"""
+    symbols = [s for s in dict.fromkeys(symbols) if s in wide.symbol_index]
+    if not symbols:
+        return pd.DataFrame()
+    lo, hi = wide.date_slice(start, end)
+    values = wide.values[lo:hi, [wide.symbol_index[s] for s in symbols]]
+    mask = ~np.isnan(values)
+    X0 = np.where(mask, values, 0.0)
+    M = mask.astype(np.float64)
+    corr = _correlation_from_stats(M.T @ M, X0.T @ M, (X0 * X0).T @ M, X0.T @ X0)
+    return pd.DataFrame(corr, index=symbols, columns=symbols)
+
+
+class IncrementalCorrelation:
+    """Pairwise-complete correlation for a basket, maintained from sufficient statistics.
+
+    For every ordered pair (i, j) of basket members the engine keeps prefix sums over
+    dates of: the number of dates where both are present, the sum and sum of squares
+    of i on those dates, and the cross-product. Adding or removing a symbol touches a
+    single row/column of those arrays and any date range is answered with one
+    difference of prefix sums. Those arrays grow with the square of the basket, so at
+    most max_tracked symbols are tracked; a larger basket is answered by
+    pairwise_correlation instead. Safe to share between threads.
+    """
+
+    def __init__(self, wide, initial_capacity=8, max_tracked=MAX_TRACKED_SYMBOLS):
+        self.wide = wide
+        self.max_tracked = max_tracked
+        self._slots = {}            # symbol -> slot in the stats arrays
+        self._free_slots = []
+        self._capacity = 0
+        self._n = self._sx = self._sxx = self._sxy = None
+        self._lock = threading.RLock()
+        self._reserve(min(initial_capacity, max_tracked))
+
+    @property
+    def basket(self):
+        return list(self._slots)
+
+    @property
+    def nbytes(self):
+        return int(sum(arr.nbytes for arr in (self._n, self._sx, self._sxx, self._sxy) if arr is not None))
+
+    def set_basket(self, symbols):
+        """Bring the tracked basket in line with symbols using per-symbol updates"""
+        wanted = [s for s in dict.fromkeys(symbols) if s in self.wide.symbol_index]
+        with self._lock:
+            if len(wanted) > self.max_tracked:
+                # Too large to track: release the pair statistics, correlation() computes directly
+                self._slots, self._free_slots, self._capacity = {}, [], 0
+                self._n = self._sx = self._sxx = self._sxy = None
+                return
+            for symbol in [s for s in self._slots if s not in wanted]:
+                self.remove_symbol(symbol)
+            for symbol in wanted:
+                if symbol not in self._slots:
+                    self.add_symbol(symbol)
+
+    def add_symbol(self, symbol):
+        """Track symbol; returns False when the engine already holds max_tracked symbols"""
+        with self._lock:
+            return self._add_symbol(symbol)
+
+    def _add_symbol(self, symbol):
+        if symbol in self._slots:
+            return True
+        if len(self._slots) >= self.max_tracked:
+            return False
+        if not self._free_slots:
+            self._reserve(self._capacity * 2)
+        slot = self._free_slots.pop()
+
+        x = self.wide.column(symbol)
+        mask = ~np.isnan(x)
+        x0 = np.where(mask, x, 0.0)
+
+        members = list(self._slots.values()) + [slot]
+        others = self._member_columns(list(self._slots)) + [(x0, mask)]
+        X0 = np.column_stack([col for col, _ in others])
+        M = np.column_stack([m for _, m in others]).astype(np.float64)
+        m = mask.astype(np.float64)
+
+        # New symbol's row/column against every member (itself included)
+        both = M * m[:, None]
+        self._n[1:, members, slot] = np.cumsum(both, axis=0)
+        self._n[1:, slot, members] = self._n[1:, members, slot]
+        self._sx[1:, members, slot] = np.cumsum(X0 * m[:, None], axis=0)
+        self._sx[1:, slot, members] = np.cumsum(x0[:, None] * M, axis=0)
+        self._sxx[1:, members, slot] = np.cumsum(X0 * X0 * m[:, None], axis=0)
+        self._sxx[1:, slot, members] = np.cumsum((x0 * x0)[:, None] * M, axis=0)
+        self._sxy[1:, members, slot] = np.cumsum(X0 * x0[:, None], axis=0)
+        self._sxy[1:, slot, members] = self._sxy[1:, members, slot]
+        self._slots[symbol] = slot
+        return True
+
+    def remove_symbol(self, symbol):
+        with self._lock:
+            slot = self._slots.pop(symbol, None)
+            if slot is not None:
+                self._free_slots.append(slot)
+
+    def correlation(self, symbols=None, start=None, end=None):
+        """Correlation matrix for symbols (default: whole basket) over start..end"""
+        with self._lock:
+            symbols = [s for s in dict.fromkeys(symbols if symbols is not None else self.basket) if s in self.wide.symbol_index]
+            if not symbols:
+                return pd.DataFrame()
+            if any(s not in self._slots for s in symbols):
+                return pairwise_correlation(self.wide, symbols, start, end)
+            idx = [self._slots[s] for s in symbols]
+            lo, hi = self.wide.date_slice(start, end)
+            grid = np.ix_(idx, idx)
+
+            n = self._n[hi][grid] - self._n[lo][grid]
+            sx = self._sx[hi][grid] - self._sx[lo][grid]
+            sxx = self._sxx[hi][grid] - self._sxx[lo][grid]
+            sxy = self._sxy[hi][grid] - self._sxy[lo][grid]
+        return pd.DataFrame(_correlation_from_stats(n, sx, sxx, sxy), index=symbols, columns=symbols)
+
+    def _member_columns(self, symbols):
+        columns = []
+        for symbol in symbols:
+            x = self.wide.column(symbol)
+            mask = ~np.isnan(x)
+            columns.append((np.where(mask, x, 0.0), mask))
+        return columns
+
+    def _reserve(self, capacity):
+        capacity = min(max(capacity, 1), self.max_tracked)
+        if capacity <= self._capacity:
+            return
+        shape = (len(self.wide.dates) + 1, capacity, capacity)
+        grown = [np.zeros(shape) for _ in range(4)]
+        if self._capacity:
+            old = self._capacity
+            for new_arr, old_arr in zip(grown, (self._n, self._sx, self._sxx, self._sxy)):
+                new_arr[:, :old, :old] = old_arr
+        self._n, self._sx, self._sxx, self._sxy = grown
+        self._free_slots.extend(range(capacity - 1, self._capacity - 1, -1))
+        self._capacity = capacity
+
+
+# === FULL-UNIVERSE CORRELATION (ETL) ===
+STANDARD_LOOKBACKS = (63, 126, 252)
+UNIVERSE_CORRELATION_DIR = "universe_correlation"
+
+
+def _pick_block_size(n_symbols, memory_budget_bytes):
+    # Six float64 (block x universe) statistics arrays are live per block
+    per_row = max(1, n_symbols) * 8 * 6
+    return int(max(1, min(n_symbols, memory_budget_bytes // per_row)))
+
+
+def compute_universe_correlation(wide, lookback, output_dir=UNIVERSE_CORRELATION_DIR, top_k=20,
+                                 min_periods=20, dtype=np.float16, memory_budget_bytes=64 * 1024 * 1024):
+    """Blocked pairwise-complete correlation of every symbol against the whole universe.
+
+    Rows are processed in blocks sized to memory_budget_bytes and streamed into an
+    on-disk .npy matrix, so peak memory stays bounded as the universe grows. A
+    per-symbol top-k index of the most and least correlated names is built from
+    each block as it is produced.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    values = wide.values[-lookback:]
+    n_symbols = values.shape[1]
+    mask = ~np.isnan(values)
+    X0 = np.where(mask, values, 0.0)
+    M = mask.astype(np.float64)
+    X0_sq = X0 * X0
+    k = max(0, min(top_k, n_symbols - 1))
+
+    matrix_path = os.path.join(output_dir, f"corr_{lookback}.npy")
+    tmp_matrix_path = matrix_path + ".tmp.npy"
+    matrix = np.lib.format.open_memmap(tmp_matrix_path, mode="w+", dtype=dtype, shape=(n_symbols, n_symbols))
+    pos_idx = np.zeros((n_symbols, k), dtype=np.int32)
+    pos_val = np.full((n_symbols, k), np.nan, dtype=np.float32)
+    neg_idx = np.zeros((n_symbols, k), dtype=np.int32)
+    neg_val = np.full((n_symbols, k), np.nan, dtype=np.float32)
+
+    block_size = _pick_block_size(n_symbols, memory_budget_bytes)
+    for lo in range(0, n_symbols, block_size):
+        hi = min(lo + block_size, n_symbols)
+        Mb, Xb = M[:, lo:hi], X0[:, lo:hi]
+        n = Mb.T @ M
+        sx = Xb.T @ M
+        sy = Mb.T @ X0
+        sxx = (Xb * Xb).T @ M
+        syy = Mb.T @ X0_sq
+        sxy = Xb.T @ X0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = sxy - sx * sy / n
+            var_x = sxx - sx * sx / n
+            var_y = syy - sy * sy / n
+            corr = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+        corr[n < min_periods] = np.nan
+        del n, sx, sy, sxx, syy, sxy, cov, var_x, var_y
+
+        matrix[lo:hi] = corr.astype(dtype)
+
+        if k:
+            rows = np.arange(hi - lo)
+            ranked = corr.copy()
+            ranked[rows, rows + lo] = np.nan  # Exclude self-correlation
+            high = np.where(np.isnan(ranked), -np.inf, ranked)
+            low = np.where(np.isnan(ranked), np.inf, ranked)
+            top = np.argpartition(-high, k - 1, axis=1)[:, :k]
+            bottom = np.argpartition(low, k - 1, axis=1)[:, :k]
+            top = np.take_along_axis(top, np.argsort(-np.take_along_axis(high, top, axis=1), axis=1), axis=1)
+            bottom = np.take_along_axis(bottom, np.argsort(np.take_along_axis(low, bottom, axis=1), axis=1), axis=1)
+            pos_idx[lo:hi], neg_idx[lo:hi] = top, bottom
+            pos_val[lo:hi] = np.take_along_axis(ranked, top, axis=1)
+            neg_val[lo:hi] = np.take_along_axis(ranked, bottom, axis=1)
+
+    matrix.flush()
+    del matrix
+    os.replace(tmp_matrix_path, matrix_path)
+
+    index_path = os.path.join(output_dir, f"topk_{lookback}.npz")
+    tmp_index_path = index_path + ".tmp.npz"
+    np.savez(tmp_index_path, symbols=np.array(wide.symbols), pos_idx=pos_idx, pos_val=pos_val,
+             neg_idx=neg_idx, neg_val=neg_val)
+    os.replace(tmp_index_path, index_path)
+    return matrix_path, index_path
+
+
+def build_universe_correlation(df, output_dir=UNIVERSE_CORRELATION_DIR, lookbacks=STANDARD_LOOKBACKS, top_k=20):
+    """ETL entry point: full-universe matrices and neighbour indexes for each lookback"""
+    wide = build_wide_returns(df)
+    written = []
+    for lookback in lookbacks:
+        if len(wide.dates) < lookback:
+            print(f"  ⚠️ Skipping {lookback}-day correlation: only {len(wide.dates)} dates available")
+            continue
+        start = time.perf_counter()
+        compute_universe_correlation(wide, lookback, output_dir=output_dir, top_k=top_k)
+        print(f"  ✅ {lookback}-day universe correlation: {len(wide.symbols)} symbols in {time.perf_counter() - start:.1f}s")
+        written.append(lookback)
+
+    meta = {
+        "symbols": len(wide.symbols),
+        "lookbacks": written,
+        "top_k": top_k,
+        "last_date": wide.dates.max().strftime("%Y-%m-%d") if len(wide.dates) else None,
+    }
+    with open(os.path.join(output_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+class NeighborIndex:
+    """Per-symbol most/least correlated neighbours for one lookback"""
+
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.symbols = data["symbols"].tolist()
+            self.pos_idx = data["pos_idx"]
+            self.pos_val = data["pos_val"]
+            self.neg_idx = data["neg_idx"]
+            self.neg_val = data["neg_val"]
+        self.symbol_index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @property
+    def nbytes(self):
+        return int(self.pos_idx.nbytes + self.pos_val.nbytes + self.neg_idx.nbytes + self.neg_val.nbytes)
+
+    def _lookup(self, symbol, idx, val, k):
+        row = self.symbol_index.get(symbol)
+        if row is None:
+            return []
+        return [
+            (self.symbols[j], float(v))
+            for j, v in zip(idx[row][:k], val[row][:k])
+            if not np.isnan(v)
+        ]
+
+    def most_correlated(self, symbol, k=10):
+        return self._lookup(symbol, self.pos_idx, self.pos_val, k)
+
+    def least_correlated(self, symbol, k=10):
+        return self._lookup(symbol, self.neg_idx, self.neg_val, k)
+
+
+def available_lookbacks(output_dir=UNIVERSE_CORRELATION_DIR):
+    try:
+        with open(os.path.join(output_dir, "meta.json")) as f:
+            return json.load(f).get("lookbacks", [])
+    except (FileNotFoundError, ValueError):
+        return []
+
+
+def load_neighbor_index(lookback, output_dir=UNIVERSE_CORRELATION_DIR):
+    path = os.path.join(output_dir, f"topk_{lookback}.npz")
+    if not os.path.exists(path):
+        return None
+    return NeighborIndex(path)
@@ -0,0 +1,655 @@
+import io
+import os
+import json
+import time
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+DATA_FILE = "latest_results.csv"
+# Small per-symbol table + dataset metadata the app can render before loading the full history
+SNAPSHOT_FILE = "latest_snapshot.csv"
+SNAPSHOT_META_FILE = "latest_snapshot.json"
+SNAPSHOT_METRICS = ['Close', 'custom_risk_score', 'rolling_yield_21', 'sharpe_21', 'volatility_21', 'max_drawdown_63']
+
+# Versioned publishing: every ETL run writes an immutable data/versions/<version>/ directory
+# and then atomically flips data/CURRENT to point at it. Readers resolve CURRENT once and
+# read only from that directory, so they never see a partially written dataset.
+DATA_DIR_ENV = "BULLBOARD_DATA_DIR"
+DEFAULT_DATA_DIR = "data"
+CURRENT_FILE = "CURRENT"
+KEEP_VERSIONS = 3
+# Several processes publish (scheduled runs, shard merges, the app's basket refreshes): each
+# stages into its own staging/<version>.<pid>/ directory, and version ids are allocated and
+# CURRENT flipped under an exclusive lock on data/publish.lock. Staging directories are only
+# cleared once their process is gone (or, unowned, after STALE_STAGING_SECONDS).
+PUBLISH_LOCK_FILE = "publish.lock"
+STALE_STAGING_SECONDS = 24 * 3600
+
+# Delta publishing: an incremental version also records the rows that changed relative to
+# the version it was built from, so live app processes can roll their in-memory dataset
+# forward instead of re-reading the whole history. Full refreshes publish no delta.
+DELTA_FILE = "delta.csv"
+DELTA_META_FILE = "delta.json"
+MAX_DELTA_CHAIN = 5
+KEY_COLUMNS = ['symbol', 'Date']
+DELTA_RTOL = 1e-12
+# What the ETL run that produced a version did (mode, adjustment events, ...)
+RUN_REPORT_FILE = "run_report.json"
+# Symbol-range index of a version written chunk by chunk (see VersionWriter)
+PARTITIONS_FILE = "partitions.json"
+
+
+def data_dir():
+    return os.environ.get(DATA_DIR_ENV, DEFAULT_DATA_DIR)
+
+
+def version_dir(version):
+    return os.path.join(data_dir(), "versions", version)
+
+
+def dataset_version(path=DATA_FILE):
+    """Identifier for an unversioned (legacy, flat) dataset file, from its mtime and size"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return "missing"
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def current_version():
+    """Version the CURRENT pointer names; cheap enough to poll on every rerun.
+
+    Falls back to the flat latest_results.csv written by ETL runs that predate
+    versioned publishing.
+    """
+    try:
+        with open(os.path.join(data_dir(), CURRENT_FILE)) as f:
+            version = f.read().strip()
+    except FileNotFoundError:
+        version = ""
+    if version and os.path.isdir(version_dir(version)):
+        return version
+    return dataset_version(DATA_FILE)
+
+
+def _is_published(version):
+    return bool(version) and os.path.isdir(version_dir(version))
+
+
+def dataset_path(version=None):
+    """Path of the results CSV for a version (default: the current one)"""
+    version = current_version() if version is None else version
+    if _is_published(version):
+        return os.path.join(version_dir(version), DATA_FILE)
+    return DATA_FILE
+
+
+def read_dataset(version=None):
+    """Published dataset with parsed dates; rows whose Date cannot be parsed are dropped"""
+    df = pd.read_csv(dataset_path(version))
+    if 'Date' in df.columns:
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+        df = df.dropna(subset=['Date'])
+    return df
+
+
+def build_snapshot(df):
+    """Latest metrics, first/last date and row count per symbol, plus dataset-level metadata"""
+    ordered = df.sort_values('Date')
+    grouped = ordered.groupby('symbol')
+    latest = grouped.tail(1).set_index('symbol')
+    metrics = [column for column in SNAPSHOT_METRICS if column in latest.columns]
+
+    snapshot = latest[metrics].copy()
+    snapshot.insert(0, 'first_date', grouped['Date'].min())
+    snapshot.insert(1, 'last_date', grouped['Date'].max())
+    snapshot.insert(2, 'rows', grouped.size())
+    if 'custom_risk_score' in snapshot.columns:
+        snapshot = snapshot.sort_values('custom_risk_score', ascending=False)
+    snapshot = snapshot.reset_index()
+
+    download_time = None
+    if 'download_time' in df.columns and not df['download_time'].isna().all():
+        download_time = str(df['download_time'].iloc[0])
+    meta = {
+        'rows': int(len(df)),
+        'symbols': int(df['symbol'].nunique()),
+        'first_date': pd.Timestamp(df['Date'].min()).strftime("%Y-%m-%d") if len(df) else None,
+        'last_date': pd.Timestamp(df['Date'].max()).strftime("%Y-%m-%d") if len(df) else None,
+        'download_time': download_time,
+    }
+    return snapshot, meta
+
+
+def fsync_file(path):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
+
+def fsync_dir(path):
+    # Makes renames inside the directory durable; not supported on every platform
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_snapshot(df, version, directory):
+    """Write the snapshot table and metadata for a version into directory"""
+    snapshot, meta = build_snapshot(df)
+    return _write_snapshot_files(snapshot, meta, version, directory)
+
+
+def _write_snapshot_files(snapshot, meta, version, directory):
+    meta['dataset_version'] = version
+    meta['generated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    snapshot.to_csv(os.path.join(directory, SNAPSHOT_FILE), index=False)
+    with open(os.path.join(directory, SNAPSHOT_META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+    return snapshot, meta
+
+
+def read_snapshot(version):
+    """(snapshot, meta) published with a version, else (None, None)"""
+    if not _is_published(version):
+        return None, None
+    directory = version_dir(version)
+    try:
+        with open(os.path.join(directory, SNAPSHOT_META_FILE)) as f:
+            meta = json.load(f)
+        snapshot = pd.read_csv(os.path.join(directory, SNAPSHOT_FILE), parse_dates=['first_date', 'last_date'])
+    except (FileNotFoundError, ValueError, KeyError):
+        return None, None
+    return snapshot, meta
+
+
+def compute_delta(base_df, df):
+    """Rows of df that are new ('append') or changed ('replace') relative to base_df, plus the
+    keys base_df has and df lacks ('remove'); None when the two cannot be diffed by key."""
+    if set(base_df.columns) != set(df.columns) or not set(KEY_COLUMNS) <= set(df.columns):
+        return None
+    value_columns = [column for column in df.columns if column not in KEY_COLUMNS]
+    base = base_df.set_index(KEY_COLUMNS)[value_columns]
+    new = df.set_index(KEY_COLUMNS)[value_columns]
+    if not base.index.is_unique or not new.index.is_unique:
+        return None
+
+    common = new.index.intersection(base.index)
+    old_values, new_values = base.loc[common], new.loc[common]
+    # Floats re-parsed from CSV can differ in the last digit; that is not a change worth shipping
+    numeric = [column for column in value_columns
+               if pd.api.types.is_numeric_dtype(new_values[column]) and pd.api.types.is_numeric_dtype(old_values[column])]
+    other = [column for column in value_columns if column not in numeric]
+    unchanged = np.isclose(
+        new_values[numeric].to_numpy(dtype=np.float64), old_values[numeric].to_numpy(dtype=np.float64),
+        rtol=DELTA_RTOL, atol=0.0, equal_nan=True
+    ).all(axis=1)
+    unchanged &= ((new_values[other] == old_values[other]) | (new_values[other].isna() & old_values[other].isna())).all(axis=1).to_numpy()
+    parts = [
+        ('append', new.loc[new.index.difference(base.index)]),
+        ('replace', new_values[~unchanged]),
+        ('remove', pd.DataFrame(index=base.index.difference(new.index), columns=value_columns)),
+    ]
+    parts = [rows.assign(change=change) for change, rows in parts if len(rows)]
+    if not parts:
+        return pd.DataFrame(columns=['change', *KEY_COLUMNS, *value_columns])
+    return pd.concat(parts).reset_index()[['change', *KEY_COLUMNS, *value_columns]]
+
+
+def _write_delta(delta, version, base_version, directory):
+    delta.to_csv(os.path.join(directory, DELTA_FILE), index=False)
+    counts = delta['change'].value_counts()
+    meta = {
+        'version': version,
+        'base_version': str(base_version),
+        'appended': int(counts.get('append', 0)),
+        'replaced': int(counts.get('replace', 0)),
+        'removed': int(counts.get('remove', 0)),
+    }
+    with open(os.path.join(directory, DELTA_META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+    return meta
+
+
+def _read_delta_meta(version):
+    if not _is_published(version):
+        return None
+    try:
+        with open(os.path.join(version_dir(version), DELTA_META_FILE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def read_delta(version):
+    """Delta rows published with a version (Date parsed)"""
+    delta = pd.read_csv(os.path.join(version_dir(version), DELTA_FILE))
+    delta['Date'] = pd.to_datetime(delta['Date'])
+    return delta
+
+
+def delta_chain(from_version, to_version, max_length=MAX_DELTA_CHAIN):
+    """Versions whose deltas, applied in order, take from_version to to_version.
+
+    None when the chain is broken (a full refresh, or a pruned version) or longer than
+    max_length; callers then reload the full dataset instead.
+    """
+    chain = []
+    version = str(to_version)
+    while version != str(from_version):
+        if len(chain) >= max_length:
+            return None
+        meta = _read_delta_meta(version)
+        if meta is None:
+            return None
+        chain.append(version)
+        version = meta['base_version']
+    return chain[::-1]
+
+
+def apply_delta(df, delta):
+    """New frame with a delta applied to df, in (symbol, Date) order like the published dataset"""
+    keys = pd.MultiIndex.from_frame(delta[KEY_COLUMNS])
+    kept = df[~pd.MultiIndex.from_frame(df[KEY_COLUMNS]).isin(keys)]
+    rows = delta.loc[delta['change'] != 'remove', list(df.columns)]
+    rows = rows.astype(df.dtypes.to_dict(), errors='ignore')
+    combined = pd.concat([kept, rows], ignore_index=True)
+    return combined.sort_values(KEY_COLUMNS, kind='stable').reset_index(drop=True)
+
+
+def append_merge(existing_df, new_df):
+    """existing_df with new_df's rows merged in by (symbol, Date), keeping (symbol, Date) order.
+
+    existing_df must be sorted by (symbol, Date) with unique keys, as published. Same
+    result as concat + drop_duplicates(keep='last') + sort, but new rows are only
+    compared with their symbol's tail: rows past the tail are appended at the end of
+    the symbol's block, and only the few that overlap it are located by binary search
+    (replaced on an equal key, inserted otherwise). Nothing is re-sorted or re-hashed.
+    """
+    new_df = new_df.drop_duplicates(subset=KEY_COLUMNS, keep='last').sort_values(KEY_COLUMNS, kind='stable')
+    columns = list(existing_df.columns) + [column for column in new_df.columns if column not in existing_df.columns]
+    n = len(existing_df)
+    if n == 0:
+        return new_df.reindex(columns=columns).reset_index(drop=True)
+
+    # Symbol blocks from run boundaries of the sorted symbol column: [block_start, block_end)
+    symbols = existing_df['symbol']
+    block_start = np.flatnonzero((symbols != symbols.shift()).to_numpy())
+    block_end = np.append(block_start[1:], n)
+    block_symbols = symbols.iloc[block_start].to_numpy(dtype=object)
+    dates = existing_df['Date'].to_numpy()
+    new_dates = pd.to_datetime(new_df['Date']).to_numpy().astype(dates.dtype)
+    ascending = np.diff(dates) > np.timedelta64(0)
+    ascending[block_start[1:] - 1] = True
+    if not (ascending.all() and (block_symbols[1:] > block_symbols[:-1]).all()):
+        # Not in published order (e.g. an old file): take the general path
+        merged = pd.concat([existing_df, new_df], ignore_index=True)
+        merged = merged.drop_duplicates(subset=KEY_COLUMNS, keep='last').sort_values(KEY_COLUMNS)
+        return merged.reindex(columns=columns).reset_index(drop=True)
+
+    # Rows for a known symbol past its tail go at the end of its block; an unknown symbol's rows
+    # go where its block would start
+    new_symbols = new_df['symbol'].to_numpy(dtype=object)
+    block = np.searchsorted(block_symbols, new_symbols, side='left')
+    known = block < len(block_symbols)
+    known[known] = block_symbols[block[known]] == new_symbols[known]
+    lo = np.append(block_start, n)[block]
+    hi = np.where(known, np.append(block_end, n)[block], lo)
+    positions = hi.copy()
+
+    # Only rows at or before their block's tail need a binary search
+    replaced = []
+    for row in np.flatnonzero(known & (new_dates <= dates[hi - 1])):
+        pos = lo[row] + int(np.searchsorted(dates[lo[row]:hi[row]], new_dates[row], side='left'))
+        if pos < hi[row] and dates[pos] == new_dates[row]:
+            replaced.append(pos)
+        positions[row] = pos
+
+    # A replacement is the existing row dropped and the new row inserted in its place
+    replaced = np.array(replaced, dtype=np.intp)
+    kept = np.delete(np.arange(n), replaced)
+    positions -= np.searchsorted(replaced, positions, side='left')
+    order = np.insert(kept, positions, n + np.arange(len(new_df)))
+    merged = pd.concat([existing_df, new_df], ignore_index=True)
+    return merged.take(order).reindex(columns=columns).reset_index(drop=True)
+
+
+_publish_thread_lock = threading.RLock()
+_publish_lock_state = {'depth': 0, 'file': None}
+
+
+@contextmanager
+def publish_lock():
+    """Exclusive lock across processes (and threads) for reading CURRENT and moving it; reentrant"""
+    with _publish_thread_lock:
+        if _publish_lock_state['depth'] == 0:
+            os.makedirs(data_dir(), exist_ok=True)
+            lock_file = open(os.path.join(data_dir(), PUBLISH_LOCK_FILE), "a")
+            try:
+                import fcntl
+            except ImportError:
+                fcntl = None  # No flock on this platform: threads of this process are still serialized
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            _publish_lock_state['file'] = lock_file
+        _publish_lock_state['depth'] += 1
+        try:
+            yield
+        finally:
+            _publish_lock_state['depth'] -= 1
+            if _publish_lock_state['depth'] == 0:
+                # Closing the file releases the flock
+                _publish_lock_state['file'].close()
+                _publish_lock_state['file'] = None
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # Exists but belongs to another user
+    return True
+
+
+def _is_stale_staging(path, name):
+    """Staging directory left by an interrupted run: its owner process is gone, or it has no owner and is old"""
+    _, _, owner = name.rpartition(".")
+    if os.name == "posix" and owner.isdigit():
+        return not _process_alive(int(owner))
+    try:
+        return time.time() - os.path.getmtime(path) > STALE_STAGING_SECONDS
+    except OSError:
+        return False
+
+
+def _new_version_id(staging_root):
+    base = datetime.now().strftime("%Y%m%dT%H%M%S")
+    staged = {name.split(".", 1)[0] for name in os.listdir(staging_root)}
+    version, suffix = base, 1
+    while os.path.exists(version_dir(version)) or version in staged:
+        suffix += 1
+        version = f"{base}-{suffix}"
+    return version
+
+
+def _stage_version():
+    """(version id, empty staging directory) for a new version"""
+    root = data_dir()
+    staging_root = os.path.join(root, "staging")
+    os.makedirs(os.path.join(root, "versions"), exist_ok=True)
+    os.makedirs(staging_root, exist_ok=True)
+    with publish_lock():
+        # Other publishers may be staging right now; only interrupted runs' leftovers go
+        for leftover in os.listdir(staging_root):
+            path = os.path.join(staging_root, leftover)
+            if _is_stale_staging(path, leftover):
+                shutil.rmtree(path, ignore_errors=True)
+
+        version = _new_version_id(staging_root)
+        staging = os.path.join(staging_root, f"{version}.{os.getpid()}")
+        os.makedirs(staging)
+    return version, staging
+
+
+def _write_run_report(run_report, version, directory):
+    with open(os.path.join(directory, RUN_REPORT_FILE), "w") as f:
+        json.dump({'version': version, **run_report}, f, indent=2, default=str)
+
+
+def read_run_report(version):
+    """Run report published with a version, else {}"""
+    if not _is_published(version):
+        return {}
+    try:
+        with open(os.path.join(version_dir(version), RUN_REPORT_FILE)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def update_run_report(version, **fields):
+    """Add fields to a published version's run report, for steps that run after the publish; False if it was pruned"""
+    if not _is_published(version):
+        return False
+    report = {key: value for key, value in read_run_report(version).items() if key != 'version'}
+    report_tmp = os.path.join(version_dir(version), f"{RUN_REPORT_FILE}.{os.getpid()}.tmp")
+    try:
+        with open(report_tmp, "w") as f:
+            json.dump({'version': version, **report, **fields}, f, indent=2, default=str)
+        os.replace(report_tmp, os.path.join(version_dir(version), RUN_REPORT_FILE))
+    except FileNotFoundError:
+        # Pruned while the report was being written
+        return False
+    return True
+
+
+class PublishConflict(RuntimeError):
+    """CURRENT no longer names the version a publish was built on"""
+
+
+def _commit_version(version, staging, keep, expected_version=None):
+    """fsync a fully written staging directory, move it into versions/ and point CURRENT at it
+
+    With expected_version the flip is a compare-and-swap: if another publisher moved
+    CURRENT away from it meanwhile, the staged version is dropped and PublishConflict raised.
+    """
+    root = data_dir()
+    versions_root = os.path.join(root, "versions")
+    try:
+        for fname in os.listdir(staging):
+            fsync_file(os.path.join(staging, fname))
+        fsync_dir(staging)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    with publish_lock():
+        if expected_version is not None and current_version() != expected_version:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise PublishConflict(f"CURRENT is {current_version()}, not the base version {expected_version}")
+        try:
+            os.rename(staging, version_dir(version))
+            fsync_dir(versions_root)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        pointer_tmp = os.path.join(root, f"{CURRENT_FILE}.{os.getpid()}.tmp")
+        with open(pointer_tmp, "w") as f:
+            f.write(version)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(pointer_tmp, os.path.join(root, CURRENT_FILE))
+        fsync_dir(root)
+
+        prune_versions(keep)
+    return version
+
+
+def publish_dataset(df, keep=KEEP_VERSIONS, base_df=None, base_version=None, run_report=None, snapshot=None,
+                    expected_version=None):
+    """Stage, fsync and atomically publish df as a new immutable version; returns the version id.
+
+    The CURRENT pointer only moves after the whole version directory is durable, and
+    the last `keep` versions are retained so sessions still reading an older one are
+    not pulled out from under. Pass the dataset df was built from (base_df and its
+    version) to also publish a delta against it, a run_report dict to keep with it,
+    and snapshot=build_snapshot(df) if it has already been computed. With expected_version,
+    only publish if CURRENT still names that version (see _commit_version).
+    """
+    version, staging = _stage_version()
+    try:
+        df.to_csv(os.path.join(staging, DATA_FILE), index=False)
+        if snapshot is None:
+            write_snapshot(df, version, staging)
+        else:
+            _write_snapshot_files(snapshot[0], dict(snapshot[1]), version, staging)
+        if base_df is not None and base_version is not None:
+            delta = compute_delta(base_df, df)
+            if delta is not None:
+                _write_delta(delta, version, base_version, staging)
+        if run_report is not None:
+            _write_run_report(run_report, version, staging)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return _commit_version(version, staging, keep, expected_version)
+
+
+def rebase_onto_current(df, base_version):
+    """(df, current version, current dataset) with df, built on base_version, moved onto the current version
+
+    Whole histories of the symbols that versions published since base_version changed are
+    taken from the current version; df keeps every other symbol. Raises PublishConflict
+    when what changed cannot be told (no delta chain and base_version pruned).
+    """
+    current = current_version()
+    current_df = read_dataset(current)
+    chain = delta_chain(base_version, current)
+    if chain is not None:
+        changed = set().union(*(set(read_delta(version)['symbol']) for version in chain))
+    else:
+        delta = compute_delta(read_dataset(base_version), current_df) if _is_published(base_version) else None
+        if delta is None:
+            raise PublishConflict(f"Cannot tell what changed between {base_version} and {current}")
+        changed = set(delta['symbol'])
+    taken = current_df[current_df['symbol'].isin(changed)]
+    if set(taken.columns) != set(df.columns):
+        raise PublishConflict(f"{current} has different columns than the dataset built on {base_version}")
+    rebased = pd.concat([df[~df['symbol'].isin(changed)], taken[list(df.columns)]], ignore_index=True)
+    return rebased.sort_values(KEY_COLUMNS, kind='stable').reset_index(drop=True), current, current_df
+
+
+class VersionWriter:
+    """Publish a dataset that never has to be in memory at once, one chunk of symbols at a time.
+
+    Chunks must hold whole symbols and arrive in symbol order, so the results file comes
+    out in the same (symbol, Date) order publish_dataset writes. Each chunk is appended
+    straight to the staged results file and recorded in a partition index (symbol range,
+    byte offset and length) so readers can load one range without parsing the rest
+    (read_partition); only the per-symbol snapshot rows are kept in memory. Nothing is
+    visible until publish().
+    """
+
+    def __init__(self, keep=KEEP_VERSIONS):
+        self.keep = keep
+        self.version, self.staging = _stage_version()
+        self.rows = 0
+        self.columns = None
+        self.partitions = []
+        # Binary, so offsets are byte positions (a text file's tell() is an opaque cookie)
+        self._data = open(os.path.join(self.staging, DATA_FILE), "wb")
+        self._snapshots = []
+        self._metas = []
+        self._last_symbol = None
+
+    def append(self, df):
+        """Append a chunk sorted by (symbol, Date) whose symbols all sort after the previous chunk's"""
+        if df.empty:
+            return
+        first_symbol, last_symbol = df['symbol'].iloc[0], df['symbol'].iloc[-1]
+        if self._last_symbol is not None and first_symbol <= self._last_symbol:
+            raise ValueError(f"Chunk starting at {first_symbol} overlaps or precedes {self._last_symbol}")
+        if self.columns is None:
+            self.columns = list(df.columns)
+            self._data.write(df.iloc[:0].to_csv(index=False).encode("utf-8"))
+        elif list(df.columns) != self.columns:
+            raise ValueError(f"Chunk columns {list(df.columns)} differ from {self.columns}")
+        body = df.to_csv(header=False, index=False).encode("utf-8")
+        offset = self._data.tell()
+        self._data.write(body)
+        self._data.flush()
+        snapshot, meta = build_snapshot(df)
+        self._snapshots.append(snapshot)
+        self._metas.append(meta)
+        self.partitions.append({
+            'first_symbol': first_symbol,
+            'last_symbol': last_symbol,
+            'symbols': meta['symbols'],
+            'rows': meta['rows'],
+            'offset': offset,
+            'length': len(body),
+        })
+        self.rows += len(df)
+        self._last_symbol = last_symbol
+
+    def publish(self, run_report=None):
+        """Write the snapshot and partition index and make the version current; returns its id"""
+        try:
+            self._data.close()
+            snapshot = pd.concat(self._snapshots, ignore_index=True) if self._snapshots else pd.DataFrame()
+            if 'custom_risk_score' in snapshot.columns:
+                snapshot = snapshot.sort_values('custom_risk_score', ascending=False).reset_index(drop=True)
+            first_dates = [meta['first_date'] for meta in self._metas if meta['first_date']]
+            last_dates = [meta['last_date'] for meta in self._metas if meta['last_date']]
+            download_times = [meta['download_time'] for meta in self._metas if meta['download_time']]
+            meta = {
+                'rows': int(self.rows),
+                'symbols': int(sum(meta['symbols'] for meta in self._metas)),
+                'first_date': min(first_dates) if first_dates else None,
+                'last_date': max(last_dates) if last_dates else None,
+                'download_time': download_times[0] if download_times else None,
+            }
+            _write_snapshot_files(snapshot, meta, self.version, self.staging)
+            with open(os.path.join(self.staging, PARTITIONS_FILE), "w") as f:
+                json.dump({'version': self.version, 'partitions': self.partitions}, f, indent=2)
+            if run_report is not None:
+                _write_run_report(run_report, self.version, self.staging)
+        except Exception:
+            self.abort()
+            raise
+        return _commit_version(self.version, self.staging, self.keep)
+
+    def abort(self):
+        self._data.close()
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+
+def read_partition(version, symbol):
+    """Rows of the partition holding symbol, read by byte range; None without a partition index"""
+    if not _is_published(version):
+        return None
+    directory = version_dir(version)
+    try:
+        with open(os.path.join(directory, PARTITIONS_FILE)) as f:
+            partitions = json.load(f)['partitions']
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+    for partition in partitions:
+        if partition['first_symbol'] <= symbol <= partition['last_symbol']:
+            with open(os.path.join(directory, DATA_FILE), "rb") as f:
+                header = f.readline()
+                f.seek(partition['offset'])
+                body = f.read(partition['length'])
+            return pd.read_csv(io.BytesIO(header + body), parse_dates=['Date'])
+    return pd.DataFrame()
+
+
+def published_versions():
+    """Published version ids, oldest first"""
+    try:
+        return sorted(os.listdir(os.path.join(data_dir(), "versions")))
+    except FileNotFoundError:
+        return []
+
+
+def prune_versions(keep=KEEP_VERSIONS):
+    """Delete all but the newest `keep` versions (never the current one)"""
+    current = current_version()
+    versions = published_versions()
+    for version in versions[:max(0, len(versions) - keep)]:
+        if version != current:
+            shutil.rmtree(version_dir(version), ignore_errors=True)
@@ -1,10 +1,32 @@
 import os
+import threading
 import traceback
 import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime, date
 import time  # Add this import
+from concurrent.futures import ThreadPoolExecutor
+from correlation import build_universe_correlation
+from warmup import warm_entry_point_caches
+from compute_cache import CACHE_DIR_ENV
+from datastore import (
+    publish_dataset, dataset_path, data_dir, current_version, append_merge, read_dataset, published_versions, build_snapshot,
+    read_run_report, update_run_report, publish_lock, rebase_onto_current, KEY_COLUMNS,
+)
+from history_store import HistoryStore, HISTORY_DB_ENV
+from etl_shards import (
+    shard_of, shard_symbols, parse_shard, write_shard_output, validate_shards, merge_shards, merged_run_report, remove_run,
+    remove_shard_output,
+)
+from etl_pipeline import Stage, run_pipeline, content_hash
+from etl_streaming import stream_to_version, MEMORY_LIMIT_ENV, DEFAULT_MEMORY_LIMIT_MB
+from intraday import run_intraday, replay_bars, poll_yfinance_bars
+from rolling_state import RollingState, load_state, update_state, check_state, same_values
+from rolling_analytics import (
+    compute_rolling_analytics, compute_analytics_sharded, configured_workers, quality_flags, ANALYTICS_COLUMNS,
+    QUALITY_EXTREME_MOVE, QUALITY_NO_RETURN, QUALITY_INVALID_PRICE, QUALITY_PRICE_LOGIC,
+)
 
 def get_market_aware_dates():
     """Get trading dates that account for market schedules"""
@@ -75,41 +97,41 @@ def fetch_with_retry(tickers_batch, start_date, end_date, max_retries=3, base_de
     
     return None, tickers_batch
 
-def validate_data_quality(df, min_days_needed=65):
-    """Basic data validation and anomaly detection"""
+def validate_data_quality(df, min_days_needed=65, flags=None):
+    """Basic data validation and anomaly detection (flags: precomputed rolling_analytics.quality_flags)"""
     print("=== PERFORMING DATA QUALITY CHECKS ===")
     
     original_count = len(df)
     issues = []
+    if flags is None:
+        flags = quality_flags(df)
+    keep = np.ones(len(df), dtype=bool)
     
     # Check 1: Remove extreme price movements (likely data errors >100% in one day)
     if 'daily_return' in df.columns:
-        df['temp_return'] = df.groupby('symbol')['Close'].pct_change(fill_method=None)
-        extreme_moves = df[abs(df['temp_return']) > 1.0]  # >100% moves
-        if not extreme_moves.empty:
-            print(f"  ⚠️  Found {len(extreme_moves)} extreme price movements (>100%)")
-            print(f"      Affected symbols: {extreme_moves['symbol'].unique()[:5]}")
+        extreme_moves = (flags & QUALITY_EXTREME_MOVE) != 0  # >100% moves
+        if extreme_moves.any():
+            print(f"  ⚠️  Found {int(extreme_moves.sum())} extreme price movements (>100%)")
+            print(f"      Affected symbols: {df['symbol'][extreme_moves].unique()[:5]}")
             # Remove extreme outliers (keep the data but flag for review)
-            df = df[abs(df['temp_return']) <= 1.0]
-            issues.append(f"Removed {len(extreme_moves)} extreme price movements")
-        df = df.drop('temp_return', axis=1, errors='ignore')
+            keep &= (flags & (QUALITY_EXTREME_MOVE | QUALITY_NO_RETURN)) == 0
+            issues.append(f"Removed {int(extreme_moves.sum())} extreme price movements")
     
     # Check 2: Remove invalid prices (zero or negative)
-    invalid_prices = df[(df['Close'] <= 0) | (df['Open'] <= 0) | (df['High'] <= 0) | (df['Low'] <= 0)]
-    if not invalid_prices.empty:
-        print(f"  ⚠️  Found {len(invalid_prices)} invalid price records (zero/negative)")
-        df = df[(df['Close'] > 0) & (df['Open'] > 0) & (df['High'] > 0) & (df['Low'] > 0)]
-        issues.append(f"Removed {len(invalid_prices)} invalid price records")
+    invalid_prices = keep & ((flags & QUALITY_INVALID_PRICE) != 0)
+    if invalid_prices.any():
+        print(f"  ⚠️  Found {int(invalid_prices.sum())} invalid price records (zero/negative)")
+        keep &= ~invalid_prices
+        issues.append(f"Removed {int(invalid_prices.sum())} invalid price records")
     
     # Check 3: Validate price relationships (High >= Low, etc.)
-    price_logic_errors = df[(df['High'] < df['Low']) | (df['High'] < df['Close']) | (df['High'] < df['Open']) | 
-                           (df['Low'] > df['Close']) | (df['Low'] > df['Open'])]
-    if not price_logic_errors.empty:
-        print(f"  ⚠️  Found {len(price_logic_errors)} price logic errors")
+    price_logic_errors = keep & ((flags & QUALITY_PRICE_LOGIC) != 0)
+    if price_logic_errors.any():
+        print(f"  ⚠️  Found {int(price_logic_errors.sum())} price logic errors")
         # Remove records where price relationships don't make sense
-        df = df[~((df['High'] < df['Low']) | (df['High'] < df['Close']) | (df['High'] < df['Open']) | 
-                 (df['Low'] > df['Close']) | (df['Low'] > df['Open']))]
-        issues.append(f"Removed {len(price_logic_errors)} price logic errors")
+        keep &= ~price_logic_errors
+        issues.append(f"Removed {int(price_logic_errors.sum())} price logic errors")
+    df = df[keep]
     
     # Check 4: Identify symbols with insufficient data
     symbol_counts = df['symbol'].value_counts()
@@ -154,10 +176,10 @@ def validate_data_quality(df, min_days_needed=65):
     
     return df
 
-def get_last_update_info():
+def get_last_update_info(version=None):
     """Check existing data and determine what needs updating"""
     try:
-        existing_df = pd.read_csv("latest_results.csv", parse_dates=["Date"])
+        existing_df = pd.read_csv(dataset_path(version), parse_dates=["Date"])
         if existing_df.empty:
             return None, None, []
         
@@ -192,13 +214,21 @@ def should_do_incremental_update(last_date, existing_symbols, current_tickers):
     
     return True, f"Will fetch {days_since_update} day(s) of new data"
 
-def fetch_incremental_data(tickers, last_date, end_date, min_days_needed, batch_size=1, delay_between_batches=2):
-    """Fetch only new data since last_date"""
+# Adjusted (auto_adjust=True) prices move for a symbol's whole history on every split or
+# dividend, so incremental fetches re-read a few days already stored and compare closes
+ADJUSTMENT_OVERLAP_DAYS = 7          # calendar days before last_date, ~5 trading days
+ADJUSTMENT_TOLERANCE = 1e-4          # relative close difference that counts as an adjustment
+MAX_RESCALE_FACTOR = 1.25            # larger factors (splits) are refetched, since volume changes too
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+def fetch_incremental_data(tickers, last_date, end_date, min_days_needed, batch_size=1, delay_between_batches=2,
+                           overlap_days=ADJUSTMENT_OVERLAP_DAYS):
+    """Fetch new data since last_date, plus an overlap window of already stored days"""
     from datetime import datetime, timedelta
     
-    # Calculate start date (day after last_date)
+    # Start overlap_days before last_date so adjustments show up as changed stored closes
     last_update = datetime.strptime(last_date, "%Y-%m-%d")
-    incremental_start = (last_update + timedelta(days=1)).strftime("%Y-%m-%d")
+    incremental_start = (last_update - timedelta(days=overlap_days)).strftime("%Y-%m-%d")
     
     print(f"Fetching incremental data from {incremental_start} to {end_date}")
     
@@ -236,6 +266,194 @@ def fetch_incremental_data(tickers, last_date, end_date, min_days_needed, batch_
     
     return good_dfs, bad_tickers
 
+def fetch_full_history(tickers, start_date, end_date, min_days_needed, batch_size=1):
+    """Full history for every ticker, one download per symbol; returns (raw frames, failed tickers)"""
+    good_dfs = []
+    bad_tickers = []
+
+    # Create batches (this was missing!)
+    batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+    total_batches = len(batches)
+    
+    for batch_num, batch in enumerate(batches, 1):
+        print(f"Processing batch {batch_num}/{total_batches} ({len(batch)} symbols)...")
+        
+        # Process each ticker individually (Stack Overflow single ticker approach)
+        for ticker in batch:
+            try:
+                print(f"  Downloading {ticker}...")
+                # Download single ticker without group_by - creates simple columns
+                data = yf.download(ticker, start=start_date, end=end_date, 
+                                  auto_adjust=True, prepost=True, threads=True)
+                
+                if data.empty or len(data) < min_days_needed:
+                    print(f"  ⚠️ Insufficient data for {ticker}: {len(data)} rows")
+                    bad_tickers.append(ticker)
+                    continue
+                    
+                # Add ticker column (Stack Overflow approach)
+                data['symbol'] = ticker
+                data['Date'] = data.index
+                good_dfs.append(data.reset_index(drop=True))
+                print(f"  ✅ {ticker}: {len(data)} rows added")
+                
+            except Exception as e:
+                print(f"  ❌ Error downloading {ticker}: {e}")
+                bad_tickers.append(ticker)
+                continue
+    
+    return good_dfs, bad_tickers
+
+def detect_adjustments(existing_df, new_df, tolerance=ADJUSTMENT_TOLERANCE):
+    """Compare fetched closes with stored ones on overlapping dates, per symbol.
+
+    Returns one event per adjusted symbol: factor is fresh / stored close, and action is
+    'rescale' when that ratio is the same across the overlap and dividend-sized, otherwise
+    'refetch' (a split, or an ex-date inside the overlap window).
+    """
+    overlap = existing_df[['symbol', 'Date', 'Close']].merge(
+        new_df[['symbol', 'Date', 'Close']], on=['symbol', 'Date'], suffixes=('_stored', '_fresh')
+    )
+    overlap = overlap[(overlap['Close_stored'] > 0) & (overlap['Close_fresh'] > 0)]
+    
+    events = []
+    for symbol, rows in overlap.groupby('symbol'):
+        ratios = rows['Close_fresh'] / rows['Close_stored']
+        if (ratios - 1).abs().max() <= tolerance:
+            continue
+        factor = float(ratios.median())
+        consistent = (ratios / factor - 1).abs().max() <= tolerance
+        dividend_sized = 1 / MAX_RESCALE_FACTOR <= factor <= MAX_RESCALE_FACTOR
+        events.append({
+            'symbol': symbol,
+            'factor': round(factor, 8),
+            'overlap_days': int(len(rows)),
+            'overlap_start': rows['Date'].min().strftime("%Y-%m-%d"),
+            'overlap_end': rows['Date'].max().strftime("%Y-%m-%d"),
+            'action': 'rescale' if consistent and dividend_sized else 'refetch',
+        })
+    return events
+
+def standardize_download(data, ticker):
+    """One symbol's yfinance download in the standardized column layout"""
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    data['symbol'] = ticker
+    data['Date'] = data.index
+    return data.reset_index(drop=True)[['Open', 'High', 'Low', 'Close', 'Volume', 'symbol', 'Date']]
+
+def refetch_symbol_history(ticker, start_date, end_date):
+    """Full adjusted history for one symbol, in the standardized incremental column layout"""
+    data = yf.download(ticker, start=start_date, end=end_date, auto_adjust=True, progress=False, threads=True)
+    if data.empty:
+        return None
+    return standardize_download(data, ticker)
+
+def apply_adjustments(existing_df, new_df, events, start_date, end_date):
+    """(existing_df, new_df) with only the adjusted symbols rescaled or refetched.
+
+    existing_df is not modified; refetched symbols come back entirely in new_df. Events
+    are annotated with what was done, including refetches that failed.
+    """
+    if not events:
+        return existing_df, new_df
+    adjusted = existing_df.copy()
+    refetched = []
+    for event in events:
+        symbol = event['symbol']
+        stored = adjusted['symbol'] == symbol
+        if event['action'] == 'rescale':
+            adjusted.loc[stored, PRICE_COLUMNS] = adjusted.loc[stored, PRICE_COLUMNS] * event['factor']
+            event['rows'] = int(stored.sum())
+            continue
+        try:
+            history = refetch_symbol_history(symbol, start_date, end_date)
+        except Exception as e:
+            print(f"⚠️ Refetch failed for {symbol}: {e}")
+            history = None
+        if history is None:
+            # Keep the stored history; the discontinuity stays until the next full refresh
+            event['action'] = 'refetch_failed'
+            continue
+        history['download_time'] = new_df['download_time'].iloc[0] if 'download_time' in new_df.columns else None
+        adjusted = adjusted[~stored]
+        new_df = new_df[new_df['symbol'] != symbol]
+        refetched.append(history)
+        event['rows'] = int(len(history))
+    if refetched:
+        new_df = pd.concat([new_df, *refetched], ignore_index=True)
+    return adjusted, new_df
+
+def keep_published_analytics(new_df, stored_df):
+    """new_df with the stored analytics of rows it re-fetches at the same close (the overlap days of
+    an incremental fetch), so that from a rolling state only the new and revised rows need computing"""
+    columns = [column for column in ANALYTICS_COLUMNS if column in stored_df.columns]
+    if not columns or new_df.empty:
+        return new_df
+    stored = new_df[KEY_COLUMNS + ['Close']].merge(
+        stored_df[KEY_COLUMNS + ['Close'] + columns], on=KEY_COLUMNS, how='left', suffixes=('', '_stored'),
+    )
+    unchanged = same_values(stored['Close'].to_numpy(dtype=np.float64), stored['Close_stored'].to_numpy(dtype=np.float64))
+    return new_df.assign(**{
+        column: np.where(unchanged, stored[column].to_numpy(dtype=np.float64), np.nan) for column in columns
+    })
+
+def same_rows(df, other):
+    """Whether two (symbol, Date)-sorted datasets hold the same rows, with floats compared to
+    the precision the published CSV reads back at"""
+    if len(df) != len(other) or list(df.columns) != list(other.columns):
+        return False
+    for column in df.columns:
+        if pd.api.types.is_numeric_dtype(df[column]) and pd.api.types.is_numeric_dtype(other[column]):
+            same = same_values(df[column].to_numpy(dtype=np.float64), other[column].to_numpy(dtype=np.float64))
+        else:
+            left, right = df[column].to_numpy(), other[column].to_numpy()
+            same = (left == right) | (pd.isna(left) & pd.isna(right))
+        if not same.all():
+            return False
+    return True
+
+def analytics_from_state(df, state, rolling_vol_days, rolling_drawdown_days):
+    """df (0..n-1 index) with analytics for rows past the rolling state, and for symbols it cannot continue"""
+    positions, values, reseeded = state.extend(df)
+    print(f"🔧 Rolling state: {len(positions):,} new row(s) advanced, {len(reseeded)} symbol(s) recomputed from history")
+    for i, column in enumerate(ANALYTICS_COLUMNS):
+        column_values = df[column].to_numpy(dtype=np.float64, copy=True) if column in df.columns else np.full(len(df), np.nan)
+        column_values[positions] = values[:, i]
+        df[column] = column_values
+    if reseeded:
+        recompute = df['symbol'].isin(reseeded).to_numpy()
+        recomputed = compute_rolling_analytics(df[recompute].reset_index(drop=True), rolling_vol_days, rolling_drawdown_days)
+        for column in ANALYTICS_COLUMNS:
+            column_values = df[column].to_numpy(copy=True)
+            column_values[recompute] = recomputed[column].to_numpy(dtype=np.float64)
+            df[column] = column_values
+    return df
+
+def run_analytics(df, rolling_vol_days, rolling_drawdown_days, state=None):
+    """(df with rolling analytics, quality flags or None, state or None); df must be sorted by (symbol, Date)
+
+    With a rolling_state.RollingState (incremental runs), stored rows keep their published
+    analytics and only the new ones are computed, from the state instead of the history.
+    The state comes back extended to the end of df, for update_state to save.
+    """
+    if state is not None:
+        try:
+            return analytics_from_state(df, state, rolling_vol_days, rolling_drawdown_days), None, state
+        except Exception as e:
+            print(f"⚠️ Rolling state unusable, recomputing from history: {e}")
+            print(traceback.format_exc())
+    # Calculate analytics with proper error handling; large universes can shard across processes
+    analytics_workers = configured_workers()
+    if analytics_workers > 1:
+        try:
+            df, quality = compute_analytics_sharded(df, analytics_workers, rolling_vol_days, rolling_drawdown_days)
+            return df, quality, None
+        except Exception as e:
+            print(f"⚠️ Sharded analytics failed, computing in-process: {e}")
+            print(traceback.format_exc())
+    return compute_rolling_analytics(df, rolling_vol_days, rolling_drawdown_days), None, None
+
 def get_sp500_symbols():
     """Get complete S&P 500 symbols list"""
     print("DEBUG: get_sp500_symbols() function called!")  # Add this line
@@ -265,9 +483,101 @@ def get_sp500_symbols():
     print(f"Loaded {len(sp500_symbols)} S&P 500 symbols")
     return sp500_symbols
 
-def main():
+def publish_and_refresh(df, run_report, base_df=None, base_version=None, snapshot=None, universe_wide=True,
+                        rolling_vol_days=21, rolling_drawdown_days=63, expected_version=None, state=None):
+    """Publish df as the new version, then refresh everything derived from it; returns the version
+
+    The rolling windows are those df's analytics were computed with, for the saved
+    rolling state. universe_wide=False skips the universe correlation index and cache warm-up, for
+    publishes that only touch a few symbols. expected_version is the version df was built
+    on: if another run published since, df is first moved onto the new current version
+    (datastore.rebase_onto_current) instead of rolling that version back. state is the
+    rolling state run_analytics extended over df, saved instead of extending the stored one again.
+    """
+    # Publish as a new immutable version (results CSV + latest-snapshot table), then flip CURRENT.
+    # Readers keep using the previous version until the flip, so they never see a partial file.
+    print("Publishing new dataset version to:", data_dir())
+    try:
+        with publish_lock():
+            if expected_version is not None and current_version() != expected_version:
+                df, current, current_df = rebase_onto_current(df, expected_version)
+                print(f"🔁 {current} was published during this run; keeping its changed symbols and publishing on top of it")
+                base_df, base_version, snapshot, expected_version = current_df, current, None, current
+                state = None
+                run_report = {**run_report, 'base_version': current, 'rebased_from': run_report.get('base_version')}
+                if 'dataset_hash' in run_report:
+                    run_report['dataset_hash'] = content_hash(df)
+            version = publish_dataset(df, base_df=base_df, base_version=base_version, run_report=run_report, snapshot=snapshot,
+                                      expected_version=expected_version)
+        output_path = dataset_path(version)
+        print(f"✅ Published version {version}. File size:", os.path.getsize(output_path), "bytes")
+    except Exception as e:
+        print(f"❌ Failed to publish dataset: {e}")
+        print(traceback.format_exc())
+        return None
+    
+    # Optional embedded query backend, updated in a single transaction
+    history_db = os.environ.get(HISTORY_DB_ENV)
+    if history_db:
+        print("\n=== PUBLISHING TO HISTORY DATABASE ===")
+        try:
+            rows = HistoryStore(history_db).publish(df, version)
+            print(f"✅ {rows:,} rows published to {history_db}")
+        except Exception as e:
+            print(f"⚠️ History database publish failed (CSV remains the source of truth): {e}")
+            print(traceback.format_exc())
+    
+    # Rolling state for the next incremental run: advanced by this version's new bars
+    print("\n=== UPDATING ROLLING STATE ===")
+    try:
+        report = update_state(df, version, rolling_vol_days, rolling_drawdown_days, state=state)
+        advanced = "" if report['advanced_rows'] is None else f"{report['advanced_rows']:,} new rows advanced, "
+        print(f"✅ Rolling state for {report['symbols']} symbols ({advanced}{report['reseeded']} reseeded, {report['bytes'] / 1024:.0f} KB)")
+    except Exception as e:
+        print(f"⚠️ Rolling state update failed (the next run recomputes from history): {e}")
+        print(traceback.format_exc())
+    
+    if not universe_wide:
+        return version
+    
+    # Full-universe correlation matrices and neighbour index for diversification lookups
+    print("\n=== BUILDING UNIVERSE CORRELATION INDEX ===")
+    try:
+        build_universe_correlation(df)
+    except Exception as e:
+        print(f"⚠️ Universe correlation build failed: {e}")
+        print(traceback.format_exc())
+    
+    # Precompute quick-category and sector bundles so first clicks after a publish hit the cache.
+    # This process exits afterwards, so only the disk tier reaches the app: without it, skip.
+    print("\n=== WARMING ENTRY-POINT CACHES ===")
+    if not os.environ.get(CACHE_DIR_ENV):
+        print(f"ℹ️ Skipped cache warm-up: {CACHE_DIR_ENV} is not set, so the app could not reuse the warmed caches")
+        update_run_report(version, warmup={'skipped': f"{CACHE_DIR_ENV} not set"})
+        return version
+    try:
+        report = warm_entry_point_caches(version=version)
+        print(f"✅ Warmed {report['warmed']}/{report['baskets']} baskets for dataset {report['dataset_version']} in {report['elapsed_s']}s")
+        for failure in report['failed']:
+            print(f"⚠️ Warm-up failed for {failure}")
+        warmup = {key: report[key] for key in ('elapsed_s', 'baskets', 'warmed', 'failed')}
+    except Exception as e:
+        print(f"⚠️ Cache warm-up failed: {e}")
+        print(traceback.format_exc())
+        warmup = {'error': str(e)}
+    update_run_report(version, warmup=warmup)
+    return version
+
+def main(shard=None, run_id=None):
+    """Full ETL run; with shard=(i, N) only that shard's symbols are processed and written for --merge
+
+    A shard that fails exits with status 1, so whatever runs the shards can tell.
+    """
     print("\n=== ETL MAIN FUNCTION STARTED ===")
     print("ETL running from directory:", os.getcwd())
+    if shard is not None:
+        # An earlier attempt's output for this shard must not be merged if this one fails
+        remove_shard_output(run_id, *shard)
     
     # === CONFIGURATION ===
     DEBUG_ONLY_A_FEW = False
@@ -321,16 +631,32 @@ def main():
         
         # Test existing data check
         print("\nStep 4: Checking existing data...")
-        existing_df, last_date, existing_symbols = get_last_update_info()
+        base_version = current_version()
+        existing_df, last_date, existing_symbols = get_last_update_info(base_version)
         print(f"✅ Existing data check complete")
         print(f"Last date: {last_date}")
         print(f"Existing symbols: {len(existing_symbols) if existing_symbols else 0}")
         
+        # Shard mode: this process owns only the symbols that hash to its shard, old and new
+        if shard is not None:
+            shard_index, shard_count = shard
+            universe = list(tickers)
+            tickers = shard_symbols(universe, shard_index, shard_count)
+            print(f"✅ Shard {shard_index}/{shard_count} of run {run_id}: {len(tickers)} of {len(universe)} symbols")
+            if existing_df is not None:
+                owned = [symbol for symbol in existing_symbols if shard_of(symbol, shard_count) == shard_index]
+                existing_df = existing_df[existing_df['symbol'].isin(owned)].reset_index(drop=True)
+                existing_symbols = owned
+                if existing_df.empty:
+                    existing_df, last_date = None, None
+        
         print("\n🎉 All basic tests passed! Issue is likely in the actual data fetching...")
         
     except Exception as e:
         print(f"❌ ERROR: {e}")
         traceback.print_exc()
+        if shard is not None:
+            raise SystemExit(1)
         return
 
 
@@ -344,6 +670,9 @@ def main():
     can_do_incremental, reason = should_do_incremental_update(last_date, existing_symbols, tickers)
     print(f"Update decision: {reason}")
     
+    # Recorded with the published version (datastore.RUN_REPORT_FILE)
+    run_report = {'mode': 'incremental' if can_do_incremental else 'full', 'base_version': base_version, 'adjustments': []}
+    
     # Continue with your existing if/else logic...
     if can_do_incremental:
         print("=== PERFORMING INCREMENTAL UPDATE ===")
@@ -381,58 +710,30 @@ def main():
             download_time = datetime.now()
             new_df['download_time'] = download_time.strftime('%Y-%m-%d %H:%M')
             
-            # Combine with existing data
-            df = pd.concat([existing_df, new_df], ignore_index=True)
+            # Splits/dividends since the last run re-base a symbol's adjusted history; fix only those symbols
+            adjustments = detect_adjustments(existing_df, new_df)
+            stored_df, new_df = apply_adjustments(existing_df, new_df, adjustments, start_date, end_date)
+            run_report['adjustments'] = adjustments
+            for event in adjustments:
+                print(f"🔧 {event['symbol']}: adjustment factor {event['factor']} over {event['overlap_days']} overlapping day(s) -> {event['action']}")
             
-            # Remove duplicates (in case of overlap)
-            df = df.drop_duplicates(subset=['symbol', 'Date'], keep='last')
-            df = df.sort_values(['symbol', 'Date']).reset_index(drop=True)
+            # Merge into the (symbol, Date)-sorted history; overlapping days replace stored rows
+            df = append_merge(stored_df, keep_published_analytics(new_df, stored_df))
             
             print(f"Combined dataset: {len(df)} total records")
         else:
             print("No new data fetched - using existing data")
+            if shard is not None:
+                # Every download failed (the overlap window always has rows); don't pass that off as a shard
+                raise SystemExit(1)
             df = existing_df
 
     else:
         print("=== PERFORMING FULL REFRESH ===")
         print(f"Fetching data for {len(tickers)} symbols...")
         
-        good_dfs = []
-        bad_tickers = []
-
-        # Create batches (this was missing!)
-        batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
-        total_batches = len(batches)
-        start_time = datetime.now()
+        good_dfs, bad_tickers = fetch_full_history(tickers, start_date, end_date, min_days_needed, batch_size)
         
-        for batch_num, batch in enumerate(batches, 1):
-            print(f"Processing batch {batch_num}/{total_batches} ({len(batch)} symbols)...")
-            
-    
-            # Process each ticker individually (Stack Overflow single ticker approach)
-            for ticker in batch:
-                try:
-                    print(f"  Downloading {ticker}...")
-                    # Download single ticker without group_by - creates simple columns
-                    data = yf.download(ticker, start=start_date, end=end_date, 
-                                      auto_adjust=True, prepost=True, threads=True)
-                    
-                    if data.empty or len(data) < min_days_needed:
-                        print(f"  ⚠️ Insufficient data for {ticker}: {len(data)} rows")
-                        bad_tickers.append(ticker)
-                        continue
-                        
-                    # Add ticker column (Stack Overflow approach)
-                    data['symbol'] = ticker
-                    data['Date'] = data.index
-                    good_dfs.append(data.reset_index(drop=True))
-                    print(f"  ✅ {ticker}: {len(data)} rows added")
-                    
-                except Exception as e:
-                    print(f"  ❌ Error downloading {ticker}: {e}")
-                    bad_tickers.append(ticker)
-                    continue
-            
         if good_dfs:
             print("🔧 Standardizing DataFrame columns before concatenation...")
             standardized_dfs = []
@@ -458,6 +759,8 @@ def main():
             print(f"✅ Column type: {type(df.columns)}")
         else:
             print("No data fetched — check your internet connection and ticker list.")
+            if shard is not None:
+                raise SystemExit(1)
             return
             
         # TIMESTAMP DATA DOWNLOAD
@@ -473,41 +776,16 @@ def main():
 
     # ROLLING ANALYTICS
     print("🔧 Calculating rolling analytics...")
-    df = df.sort_values(['symbol', 'Date']).reset_index(drop=True)
+    if not can_do_incremental:
+        # Incremental runs are already in (symbol, Date) order (append_merge)
+        df = df.sort_values(['symbol', 'Date'])
+    df = df.reset_index(drop=True)
     
-    # Calculate analytics with proper error handling
-    try:
-        df['daily_return'] = df.groupby('symbol')['Close'].pct_change(fill_method=None)
-        df['volatility_21'] = df.groupby('symbol')['daily_return'].rolling(rolling_vol_days).std().reset_index(0, drop=True)
-        df['rolling_yield_21'] = df.groupby('symbol')['daily_return'].rolling(rolling_vol_days).mean().reset_index(0, drop=True)
-        df['sharpe_21'] = (df['rolling_yield_21'] / df['volatility_21']) * np.sqrt(252)
-        
-        # Simplified max drawdown calculation to avoid length mismatch
-        df['max_drawdown_63'] = df.groupby('symbol')['Close'].rolling(rolling_drawdown_days).max().reset_index(0, drop=True) - \
-                               df.groupby('symbol')['Close'].rolling(rolling_drawdown_days).min().reset_index(0, drop=True)
-        df['max_drawdown_63'] = df['max_drawdown_63'] / df.groupby('symbol')['Close'].rolling(rolling_drawdown_days).max().reset_index(0, drop=True)
-        
-        df['custom_risk_score'] = df['volatility_21'] * 0.7 + df['max_drawdown_63'] * 0.3
-        print("✅ Rolling analytics calculated successfully")
-        
-    except Exception as e:
-        print(f"⚠️ Error in rolling analytics: {e}")
-        # Add default values if calculations fail
-        df['daily_return'] = 0
-        df['volatility_21'] = 0
-        df['rolling_yield_21'] = 0
-        df['sharpe_21'] = 0
-        df['max_drawdown_63'] = 0
-        df['custom_risk_score'] = 0
-
-    # Get each stock's latest analytics
-    latest = df.sort_values('Date').groupby('symbol').tail(1)
-    latest = latest[['symbol', 'Date', 'custom_risk_score', 'rolling_yield_21', 'sharpe_21', 'volatility_21', 'max_drawdown_63']].copy()
-    latest = latest.sort_values('custom_risk_score', ascending=False)
-    latest.reset_index(drop=True, inplace=True)
+    state = load_state(rolling_vol_days, rolling_drawdown_days) if can_do_incremental else None
+    df, quality, state = run_analytics(df, rolling_vol_days, rolling_drawdown_days, state)
 
     # Data quality validation before saving
-    df = validate_data_quality(df)
+    df = validate_data_quality(df, flags=quality)
     
     # Save summary table for Streamlit app
     print("\n=== ETL SUMMARY BEFORE FINAL SAVE ===")
@@ -520,18 +798,461 @@ def main():
         print("❗ Trouble with dataframe before save:", str(e))
         print(traceback.format_exc())
     
-    # Write file and confirm output
-    output_path = "latest_results.csv"
-    print("Attempting to save data to:", output_path)
+    if shard is not None:
+        # The merge step publishes; a shard only leaves its rows and manifest behind
+        run_report['failed_symbols'] = sorted(bad_tickers)
+        try:
+            path = write_shard_output(df, run_id, shard_index, shard_count, universe, run_report)
+            print(f"✅ Shard {shard_index}/{shard_count} written to {path}")
+            print(f"   Publish once all shards are done: python etl.py --merge {shard_count} --run-id {run_id}")
+        except Exception as e:
+            print(f"❌ Failed to write shard output: {e}")
+            print(traceback.format_exc())
+            raise SystemExit(1)
+        return
+    
+    # Incremental runs also publish the changed rows, so live apps can apply them in place
+    if can_do_incremental:
+        publish_and_refresh(df, run_report, base_df=existing_df, base_version=base_version, expected_version=base_version, state=state)
+    else:
+        publish_and_refresh(df, run_report, expected_version=base_version, state=state)
+    
+    # Show files in directory so you know file is truly there
+    print("Files in cwd:", os.listdir(os.getcwd()))
+
+def main_out_of_core(memory_limit=None):
+    """Full refresh that streams symbols through the pipeline in memory-bounded chunks (see etl_streaming)"""
+    print("\n=== OUT-OF-CORE ETL STARTED ===")
+    tickers = get_sp500_symbols()
+    start_date = "2024-01-01"
+    end_date = date.today().strftime("%Y-%m-%d")
+    min_days_needed = 65
+    rolling_vol_days = 21
+    rolling_drawdown_days = 63
+    download_time = datetime.now().strftime('%Y-%m-%d %H:%M')
+    
+    def fetch_symbol(ticker):
+        try:
+            data = yf.download(ticker, start=start_date, end=end_date, auto_adjust=True, prepost=True, threads=True, progress=False)
+        except Exception as e:
+            print(f"  ❌ Error downloading {ticker}: {e}")
+            return None
+        if data.empty or len(data) < min_days_needed:
+            print(f"  ⚠️ Insufficient data for {ticker}: {len(data)} rows")
+            return None
+        data = standardize_download(data, ticker)
+        data['download_time'] = download_time
+        return data
+    
+    def transform(df):
+        # Analytics and quality flags depend only on a symbol's own rows, so a chunk of whole
+        # symbols gets the same values as the full frame. The one frame-wide rule (each symbol's
+        # first, return-less row is dropped once any extreme move is found) applies per chunk.
+        df = compute_rolling_analytics(df, rolling_vol_days, rolling_drawdown_days)
+        return validate_data_quality(df, min_days_needed)
+    
+    run_report = {'mode': 'full', 'base_version': current_version(), 'adjustments': []}
     try:
-        df.to_csv(output_path, index=False)
-        print("✅ Data saved. File size:", os.path.getsize(output_path), "bytes")
+        version, bad_tickers, stats = stream_to_version(
+            tickers, fetch_symbol, transform,
+            rows_per_symbol=len(pd.bdate_range(start_date, end_date)),
+            memory_limit=memory_limit, run_report=run_report,
+        )
     except Exception as e:
-        print(f"❌ Failed to save output CSV: {e}")
+        print(f"❌ Out-of-core run failed; nothing was published: {e}")
         print(traceback.format_exc())
+        return None
     
-    # Show files in directory so you know file is truly there
-    print("Files in cwd:", os.listdir(os.getcwd()))
+    print(f"\n=== OUT-OF-CORE SUMMARY ===")
+    print(f"  {stats['rows']:,} rows, {stats['symbols']} symbols in {stats['chunks']} chunk(s), {stats['elapsed_s']}s")
+    print(f"  Memory limit {stats['memory_limit_mb']} MB, peak RSS {stats['peak_rss_mb']} MB")
+    if 'warning' in stats:
+        print(f"  ⚠️ {stats['warning']}")
+    if bad_tickers:
+        print(f"  ⚠️ {len(bad_tickers)} symbol(s) failed: {bad_tickers[:10]}")
+    if version is None:
+        print("No data fetched — check your internet connection and ticker list.")
+        return None
+    print(f"✅ Published version {version} to {data_dir()}")
+    # The history database, universe correlation index and cache warm-up each load the whole
+    # dataset, which would undo the memory bound; they are refreshed by the next regular run
+    print("ℹ️ Skipped history database, universe correlation and cache warm-up (whole-dataset steps)")
+    return version
+
+def verify_rolling_state(rolling_vol_days=21, rolling_drawdown_days=63):
+    """Check the saved rolling state against a full recompute over the current version; returns the problems"""
+    state = load_state(rolling_vol_days, rolling_drawdown_days)
+    if state is None:
+        return [f"No rolling state saved for windows {rolling_vol_days}/{rolling_drawdown_days}"]
+    version = current_version()
+    problems = check_state(state, read_dataset(version))
+    if state.version != version:
+        problems.insert(0, f"State was saved for version {state.version}, current is {version}")
+    return problems
+
+# === STAGED PIPELINE ===
+# The default run: the same steps as main() as explicit stages (see etl_pipeline), so a rerun
+# only repeats the stages whose inputs or parameters changed, and a single stage can be rerun
+# from the stored outputs of the ones before it.
+PIPELINE_DEFAULTS = {
+    'debug_only_a_few': False,
+    'start_date': "2024-01-01",
+    'min_days_needed': 65,
+    'rolling_vol_days': 21,
+    'rolling_drawdown_days': 63,
+    'batch_size': 1,
+    'delay_between_batches': 10,
+}
+STANDARD_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'symbol', 'Date']
+
+def stage_universe(inputs, config):
+    if config['debug_only_a_few']:
+        return ['AAPL', 'MSFT', 'GOOGL']
+    return get_sp500_symbols()
+
+def stage_base(inputs, config):
+    """What fetch needs to know about the published dataset; a new version with the same last date
+    and symbols hashes the same, so it does not trigger a refetch"""
+    existing_df, last_date, existing_symbols = get_last_update_info(config['base_version'])
+    return {'last_date': last_date, 'symbols': sorted(existing_symbols)}
+
+def stage_fetch(inputs, config):
+    tickers, base = inputs['universe'], inputs['base']
+    can_do_incremental, reason = should_do_incremental_update(base['last_date'], base['symbols'], tickers)
+    print(f"Update decision: {reason}")
+    if can_do_incremental:
+        frames, failed = fetch_incremental_data(
+            tickers, base['last_date'], config['end_date'], config['min_days_needed'],
+            config['batch_size'], config['delay_between_batches'],
+        )
+    else:
+        frames, failed = fetch_full_history(
+            tickers, config['start_date'], config['end_date'], config['min_days_needed'], config['batch_size'],
+        )
+    print(f"Fetched {len(frames)} symbols, {len(failed)} failed")
+    if not frames:
+        # Raising keeps the empty fetch out of the stage store, so the next run downloads again
+        raise RuntimeError("No data fetched — check your internet connection and ticker list.")
+    return {
+        'raw': {'frames': frames, 'download_time': datetime.now().strftime('%Y-%m-%d %H:%M')},
+        'report': {'mode': 'incremental' if can_do_incremental else 'full', 'failed': sorted(failed)},
+    }
+
+def standardize_frames(frames, download_time):
+    """Raw per-symbol downloads -> one frame in the standardized column layout"""
+    standardized = []
+    for frame in frames:
+        if isinstance(frame.columns, pd.MultiIndex):
+            frame = frame.copy()
+            frame.columns = frame.columns.get_level_values(0)
+        standardized.append(frame[STANDARD_COLUMNS])
+    df = pd.concat(standardized, ignore_index=True) if standardized else pd.DataFrame(columns=STANDARD_COLUMNS)
+    df['download_time'] = download_time
+    return df
+
+def stage_standardize(inputs, config):
+    fetched = inputs['fetch.raw']
+    return standardize_frames(fetched['frames'], fetched['download_time'])
+
+def stage_merge(inputs, config):
+    """(symbol, Date)-sorted dataset to analyse, plus the run report for the published version"""
+    fetched, new_df = inputs['fetch.report'], inputs['standardize']
+    run_report = {'mode': fetched['mode'], 'base_version': config['base_version'], 'adjustments': [], 'failed_symbols': fetched['failed']}
+    if fetched['mode'] == 'full':
+        return {'df': new_df.sort_values(['symbol', 'Date']).reset_index(drop=True), 'report': run_report}
+    
+    existing_df = get_last_update_info(config['base_version'])[0]
+    if new_df.empty:
+        print("No new data fetched - using existing data")
+        return {'df': existing_df, 'report': run_report}
+    adjustments = detect_adjustments(existing_df, new_df)
+    stored_df, new_df = apply_adjustments(existing_df, new_df, adjustments, config['start_date'], config['end_date'])
+    for event in adjustments:
+        print(f"🔧 {event['symbol']}: adjustment factor {event['factor']} over {event['overlap_days']} overlapping day(s) -> {event['action']}")
+    run_report['adjustments'] = adjustments
+    return {'df': append_merge(stored_df, keep_published_analytics(new_df, stored_df)), 'report': run_report}
+
+def stage_analytics(inputs, config):
+    df = inputs['merge.df']
+    counts = df['symbol'].value_counts()
+    df = df[~df['symbol'].isin(counts.index[counts < config['min_days_needed']])].reset_index(drop=True)
+    state = None
+    if inputs['merge.report']['mode'] == 'incremental':
+        state = load_state(config['rolling_vol_days'], config['rolling_drawdown_days'])
+    df, quality, state = run_analytics(df, config['rolling_vol_days'], config['rolling_drawdown_days'], state)
+    # The extended state travels to the publish stage as plain arrays, which hash by content
+    return {'df': df, 'quality': quality, 'state': state.arrays() if state is not None else None}
+
+def stage_quality(inputs, config):
+    return validate_data_quality(inputs['analytics.df'], config['min_days_needed'], flags=inputs['analytics.quality'])
+
+def stage_snapshot(inputs, config):
+    return build_snapshot(inputs['quality'])
+
+def stage_publish(inputs, config):
+    df = inputs['quality']
+    # Rebuilding on top of a new version can reproduce the same rows; don't publish them twice
+    dataset_hash = content_hash(df)
+    current = current_version()
+    if read_run_report(current).get('dataset_hash') == dataset_hash:
+        print(f"⏭️  Dataset unchanged since version {current}; not republishing")
+        return current
+    run_report = {**inputs['merge.report'], 'dataset_hash': dataset_hash}
+    base_df = None
+    if run_report['mode'] == 'incremental' and run_report['base_version'] in published_versions():
+        base_df = get_last_update_info(run_report['base_version'])[0]
+        # Rows kept from a rolling state carry analytics as read back from the CSV, so the
+        # hash above misses a rebuild that only reproduces the current version
+        if run_report['base_version'] == current and same_rows(df, base_df):
+            print(f"⏭️  Dataset unchanged since version {current}; not republishing")
+            return current
+    version = publish_and_refresh(
+        df, run_report, base_df=base_df,
+        base_version=run_report['base_version'] if base_df is not None else None, snapshot=inputs['snapshot'],
+        rolling_vol_days=config['rolling_vol_days'], rolling_drawdown_days=config['rolling_drawdown_days'],
+        expected_version=run_report['base_version'],
+        state=RollingState.from_arrays(inputs['analytics.state']) if inputs['analytics.state'] is not None else None,
+    )
+    if version is None:
+        raise RuntimeError("Publish failed")
+    return version
+
+PIPELINE = [
+    Stage('universe', stage_universe, params=['debug_only_a_few']),
+    Stage('base', stage_base, params=['base_version']),
+    # A fetch with failed downloads is retried by the next run rather than reused
+    Stage('fetch', stage_fetch, inputs=['universe', 'base'], outputs=['raw', 'report'],
+          params=['start_date', 'end_date', 'min_days_needed', 'batch_size', 'delay_between_batches'],
+          is_valid=lambda outputs: not outputs['fetch.report']['failed']),
+    Stage('standardize', stage_standardize, inputs=['fetch.raw']),
+    Stage('merge', stage_merge, inputs=['fetch.report', 'standardize'], outputs=['df', 'report'],
+          params=['base_version', 'start_date', 'end_date']),
+    Stage('analytics', stage_analytics, inputs=['merge.df', 'merge.report'], outputs=['df', 'quality', 'state'],
+          params=['min_days_needed', 'rolling_vol_days', 'rolling_drawdown_days'], revision=2),
+    Stage('quality', stage_quality, inputs=['analytics.df', 'analytics.quality'], params=['min_days_needed']),
+    Stage('snapshot', stage_snapshot, inputs=['quality']),
+    # A stored publish only counts while its version is still the current one
+    Stage('publish', stage_publish, inputs=['quality', 'snapshot', 'merge.report', 'analytics.state'],
+          params=['rolling_vol_days', 'rolling_drawdown_days'],
+          is_valid=lambda outputs: outputs['publish'] == current_version()),
+]
+
+def run_staged(start=None, stop=None, force=False, **overrides):
+    """Run the staged pipeline; overrides replace PIPELINE_DEFAULTS (e.g. rolling_vol_days=30)"""
+    print("\n=== STAGED ETL STARTED ===")
+    config = {
+        **PIPELINE_DEFAULTS,
+        'end_date': date.today().strftime("%Y-%m-%d"),
+        'base_version': current_version(),
+        **overrides,
+    }
+    try:
+        report = run_pipeline(PIPELINE, config, start=start, stop=stop, force=force)
+    except Exception as e:
+        print(f"❌ Staged ETL failed: {e}")
+        print(traceback.format_exc())
+        return None
+    
+    print("\n=== STAGE SUMMARY ===")
+    for entry in report:
+        timing = f" {entry['elapsed_s']}s" if 'elapsed_s' in entry else ""
+        print(f"  {entry['stage']:<12} {entry['status']}{timing}")
+    return report
+
+# === TARGETED REFRESH ===
+def refresh_symbols(symbols, start_date="2024-01-01", min_days_needed=65, rolling_vol_days=21, rolling_drawdown_days=63):
+    """Refetch and re-analyse only `symbols`, publish them on top of the current version; returns a report
+
+    The new (partial) version carries every other symbol's rows unchanged plus a delta
+    for the refreshed ones, so running apps roll forward instead of reloading. The
+    universe correlation index and cache warm-up are left to the next full run.
+    The download runs unlocked; reading the base version, merging and flipping CURRENT
+    happen under the publish lock, so a version another run published during the
+    download is built on rather than rolled back.
+    """
+    symbols = sorted(set(symbols))
+    fetch_base = current_version()
+    if not os.path.exists(dataset_path(fetch_base)):
+        raise RuntimeError("No published dataset to refresh; run the full ETL first")
+    
+    print(f"\n=== TARGETED REFRESH: {', '.join(symbols)} ===")
+    end_date = date.today().strftime("%Y-%m-%d")
+    frames, failed = fetch_full_history(symbols, start_date, end_date, min_days_needed)
+    report = {'mode': 'partial', 'base_version': fetch_base, 'symbols': symbols, 'failed_symbols': sorted(failed), 'adjustments': []}
+    if not frames:
+        return {**report, 'version': None, 'refreshed': []}
+    
+    new_df = standardize_frames(frames, datetime.now().strftime('%Y-%m-%d %H:%M'))
+    new_df = compute_rolling_analytics(new_df.sort_values(['symbol', 'Date']).reset_index(drop=True), rolling_vol_days, rolling_drawdown_days)
+    new_df = validate_data_quality(new_df, min_days_needed)
+    refreshed = sorted(new_df['symbol'].unique())
+    
+    with publish_lock():
+        base_version = current_version()
+        if base_version != fetch_base:
+            print(f"🔁 {base_version} was published during the refresh; merging onto it instead of {fetch_base}")
+        existing_df = get_last_update_info(base_version)[0]
+        if existing_df is None:
+            raise RuntimeError("No published dataset to refresh; run the full ETL first")
+        report['base_version'] = base_version
+        if set(new_df.columns) == set(existing_df.columns):
+            new_df = new_df[existing_df.columns]
+        
+        # Whole symbol histories are replaced: a refetch can also re-adjust older bars
+        df = pd.concat([existing_df[~existing_df['symbol'].isin(refreshed)], new_df], ignore_index=True)
+        df = df.sort_values(['symbol', 'Date'], kind='stable').reset_index(drop=True)
+        version = publish_and_refresh(df, report, base_df=existing_df, base_version=base_version, universe_wide=False,
+                                      rolling_vol_days=rolling_vol_days, rolling_drawdown_days=rolling_drawdown_days,
+                                      expected_version=base_version)
+    if version is None:
+        raise RuntimeError("Publish failed")
+    return {**report, 'version': version, 'refreshed': refreshed}
+
+class SymbolRefreshQueue:
+    """Process-wide queue of targeted refreshes, shared by every app session.
+
+    Refreshes run one at a time on a single worker thread, each on top of the version
+    the previous one published. A symbol that is already queued or being refreshed is
+    not fetched again; the request waits for that refresh instead. New symbols join the
+    refresh that is queued next, so overlapping baskets cost one fetch per symbol.
+    """
+    
+    def __init__(self, refresh_fn=refresh_symbols):
+        self._refresh_fn = refresh_fn
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="symbol-refresh")
+        self._inflight = {}   # symbol -> Future of the refresh that covers it
+        self._queued = None   # (symbol set, Future) of the refresh that has not started yet
+    
+    def request(self, symbols):
+        """Futures of the refreshes covering symbols; each resolves to refresh_symbols' report"""
+        futures = []
+        with self._lock:
+            for symbol in dict.fromkeys(symbols):
+                future = self._inflight.get(symbol)
+                if future is None:
+                    if self._queued is None:
+                        batch = set()
+                        self._queued = (batch, self._executor.submit(self._run, batch))
+                    batch, future = self._queued
+                    batch.add(symbol)
+                    self._inflight[symbol] = future
+                if future not in futures:
+                    futures.append(future)
+        return futures
+    
+    def _run(self, batch):
+        # Once started, the batch is closed: later requests queue a new one
+        with self._lock:
+            if self._queued is not None and self._queued[0] is batch:
+                self._queued = None
+            symbols = sorted(batch)
+        try:
+            return self._refresh_fn(symbols)
+        finally:
+            with self._lock:
+                for symbol in symbols:
+                    self._inflight.pop(symbol, None)
+
+_symbol_refresh_queue = SymbolRefreshQueue()
+
+def request_symbol_refresh(symbols):
+    """Queue a targeted refresh of symbols (deduplicated across sessions); returns futures of reports"""
+    return _symbol_refresh_queue.request(symbols)
+
+def merge_and_publish(shard_count, run_id):
+    """Validate that all shards of a run are complete and consistent, then publish them as one version"""
+    print(f"\n=== MERGING {shard_count} SHARD(S) OF RUN {run_id} ===")
+    manifests, problems = validate_shards(run_id, shard_count)
+    if problems:
+        print("❌ Shards are not ready to publish:")
+        for problem in problems:
+            print(f"   - {problem}")
+        return None
+    
+    df = merge_shards(run_id, shard_count, manifests)
+    run_report = merged_run_report(manifests)
+    print(f"✅ Merged {len(df):,} rows, {df['symbol'].nunique()} symbols from {shard_count} shard(s)")
+    if run_report['missing_symbols']:
+        print(f"⚠️ {len(run_report['missing_symbols'])} symbol(s) produced no rows: {run_report['missing_symbols'][:10]}")
+    
+    # Shards record the version they started from; if it is still published, ship a delta against it
+    base_version = run_report['base_version']
+    base_df = read_dataset(base_version) if base_version in published_versions() else None
+    return publish_and_refresh(df, run_report, base_df=base_df, base_version=base_version if base_df is not None else None,
+                               expected_version=base_version)
+
+def launch_local(shard_count, run_id):
+    """Run all shards as separate local processes, then merge; exercises the multi-node path on one machine"""
+    import subprocess
+    import sys
+    
+    print(f"\n=== LAUNCHING {shard_count} LOCAL SHARD PROCESS(ES) FOR RUN {run_id} ===")
+    # Output left by an earlier attempt of the same run id must not stand in for a failed shard
+    remove_run(run_id)
+    processes = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), "--shard", f"{i}/{shard_count}", "--run-id", run_id])
+        for i in range(shard_count)
+    ]
+    failed = [i for i, process in enumerate(processes) if process.wait() != 0]
+    if failed:
+        print(f"❌ Shard process(es) {failed} exited with an error; not publishing run {run_id}")
+        return None
+    return merge_and_publish(shard_count, run_id)
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="BullBoard ETL")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--shard", type=parse_shard, metavar="i/N", help="process only shard i of N and write it for --merge")
+    mode.add_argument("--merge", type=int, metavar="N", help="validate and publish the N shards of --run-id")
+    mode.add_argument("--launch-local", type=int, metavar="N", help="run N shard processes locally, then merge")
+    mode.add_argument("--out-of-core", action="store_true", help="full refresh in memory-bounded chunks of symbols")
+    mode.add_argument("--monolithic", action="store_true", help="run every step in one pass, without stage skipping")
+    mode.add_argument("--symbols", nargs="+", metavar="SYMBOL", help="refresh only these symbols on top of the current version")
+    mode.add_argument("--intraday", action="store_true", help="stream today's intraday bars into provisional values until interrupted")
+    mode.add_argument("--check-state", action="store_true", help="verify the saved rolling state against a full recompute")
+    mode.add_argument("--replay", metavar="CSV", help="like --intraday, but replay recorded bars (symbol,timestamp,Open,High,Low,Close,Volume)")
+    parser.add_argument("--run-id", default=date.today().strftime("%Y%m%d"), help="identifies the shards of one run (default: today)")
+    parser.add_argument("--memory-limit-mb", type=float, help=f"memory ceiling for --out-of-core (default: ${MEMORY_LIMIT_ENV} or {DEFAULT_MEMORY_LIMIT_MB})")
+    parser.add_argument("--replay-speed", type=float, default=0.0, help="replay at this multiple of real time (default: as fast as possible)")
+    stages = [stage.name for stage in PIPELINE]
+    parser.add_argument("--stage", choices=stages, help="run only this stage, from the stored outputs of earlier ones")
+    parser.add_argument("--from-stage", choices=stages, help="rerun from this stage on, from the stored outputs of earlier ones")
+    parser.add_argument("--force", action="store_true", help="rerun every stage even if its inputs are unchanged")
+    parser.add_argument("--rolling-vol-days", type=int, default=PIPELINE_DEFAULTS['rolling_vol_days'])
+    parser.add_argument("--rolling-drawdown-days", type=int, default=PIPELINE_DEFAULTS['rolling_drawdown_days'])
+    args = parser.parse_args()
+    
+    if args.stage and args.from_stage:
+        parser.error("--stage and --from-stage are mutually exclusive")
+    
+    if args.symbols:
+        print(refresh_symbols(args.symbols))
+    elif args.check_state:
+        problems = verify_rolling_state(args.rolling_vol_days, args.rolling_drawdown_days)
+        for problem in problems:
+            print(f"❌ {problem}")
+        if problems:
+            raise SystemExit(1)
+        print("✅ Rolling state matches a full recompute")
+    elif args.intraday:
+        run_intraday(poll_yfinance_bars(get_sp500_symbols()))
+    elif args.replay:
+        run_intraday(replay_bars(args.replay, speed=args.replay_speed))
+    elif args.out_of_core:
+        main_out_of_core(int(args.memory_limit_mb * 1024 * 1024) if args.memory_limit_mb else None)
+    elif args.merge:
+        if merge_and_publish(args.merge, args.run_id) is None:
+            raise SystemExit(1)
+    elif args.launch_local:
+        if launch_local(args.launch_local, args.run_id) is None:
+            raise SystemExit(1)
+    elif args.shard or args.monolithic:
+        main(shard=args.shard, run_id=args.run_id)
+    else:
+        run_staged(
+            start=args.stage or args.from_stage, stop=args.stage, force=args.force,
+            rolling_vol_days=args.rolling_vol_days, rolling_drawdown_days=args.rolling_drawdown_days,
+        )
@@ -0,0 +1,203 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from datastore import data_dir
+
+# Staged ETL: the run is a chain of named stages with declared inputs (outputs of earlier
+# stages), outputs and parameters (config keys). Each output is pickled under
+# data/pipeline/<stage>/ next to a manifest holding the hash of everything the stage was
+# computed from and a content hash per output. A stage whose inputs and parameters hash the
+# same as last time is skipped, and since its outputs keep their hashes, so is everything
+# downstream that only depends on them.
+PIPELINE_DIR = "pipeline"
+STAGE_MANIFEST_FILE = "manifest.json"
+
+
+class Stage:
+    """One pipeline step: fn(inputs, config), where inputs maps the declared input names to values.
+
+    Inputs name outputs of earlier stages: "stage" for a stage with a single output,
+    "stage.output" for one of several. A stage declaring outputs returns a dict with
+    exactly those keys; otherwise its return value is its single output. Bump `revision`
+    when fn's logic changes so stored outputs are recomputed. `is_valid`, if given, is
+    asked whether the stored outputs still hold although nothing they were computed from
+    has changed (e.g. that a published version is still the current one).
+    """
+
+    def __init__(self, name, fn, inputs=(), outputs=None, params=(), revision=1, is_valid=None):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs) if outputs else None
+        self.params = tuple(params)
+        self.revision = revision
+        self.is_valid = is_valid
+
+    def artifacts(self):
+        """Names other stages use to refer to this stage's outputs"""
+        if self.outputs is None:
+            return [self.name]
+        return [f"{self.name}.{output}" for output in self.outputs]
+
+    def split(self, value):
+        """Stage return value -> {artifact name: value}"""
+        if self.outputs is None:
+            return {self.name: value}
+        if set(value) != set(self.outputs):
+            raise ValueError(f"Stage {self.name!r} must return outputs {list(self.outputs)}, got {sorted(value)}")
+        return {f"{self.name}.{output}": value[output] for output in self.outputs}
+
+
+def _update_hash(digest, value):
+    if isinstance(value, pd.DataFrame):
+        digest.update(b"frame")
+        digest.update(repr([(str(column), str(dtype)) for column, dtype in value.dtypes.items()]).encode("utf-8"))
+        digest.update(len(value).to_bytes(8, "little"))
+        if len(value.columns):
+            digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, pd.Series):
+        digest.update(f"series:{value.name}:{value.dtype}:{len(value)}".encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(value, index=False).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"array:{value.dtype.str}:{value.shape}".encode("utf-8"))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(b"dict")
+        for key in sorted(value, key=str):
+            digest.update(repr(key).encode("utf-8"))
+            _update_hash(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"seq:{len(value)}".encode("utf-8"))
+        for item in value:
+            _update_hash(digest, item)
+    else:
+        digest.update(repr(value).encode("utf-8"))
+
+
+def content_hash(value):
+    """sha256 of a stage output; frames hash by columns, dtypes and row contents (not the index)"""
+    digest = hashlib.sha256()
+    _update_hash(digest, value)
+    return digest.hexdigest()
+
+
+def stage_key(stage, config, hashes):
+    """Hash of everything a stage's outputs are derived from"""
+    return content_hash({
+        'stage': stage.name,
+        'revision': stage.revision,
+        'params': {param: config.get(param) for param in stage.params},
+        'inputs': {name: hashes[name] for name in stage.inputs},
+    })
+
+
+class StageStore:
+    """Stored stage outputs and manifests under data/pipeline/"""
+
+    def __init__(self, root=None):
+        self.root = root or os.path.join(data_dir(), PIPELINE_DIR)
+
+    def _path(self, stage_name, fname):
+        return os.path.join(self.root, stage_name, fname)
+
+    def manifest(self, stage_name):
+        try:
+            with open(self._path(stage_name, STAGE_MANIFEST_FILE)) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def load(self, artifact):
+        stage_name = artifact.split(".", 1)[0]
+        with open(self._path(stage_name, f"{artifact}.pkl"), "rb") as f:
+            return pickle.load(f)
+
+    def _write(self, path, write):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def save(self, stage_name, values, key, hashes, elapsed):
+        os.makedirs(os.path.join(self.root, stage_name), exist_ok=True)
+        # Outputs first, manifest last: a manifest only ever describes complete output files
+        for artifact, value in values.items():
+            self._write(self._path(stage_name, f"{artifact}.pkl"),
+                        lambda f: pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL))
+        manifest = {
+            'stage': stage_name,
+            'key': key,
+            'outputs': hashes,
+            'elapsed_s': round(elapsed, 3),
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        self._write(self._path(stage_name, STAGE_MANIFEST_FILE), lambda f: f.write(json.dumps(manifest, indent=2).encode("utf-8")))
+
+
+def run_pipeline(stages, config, store=None, start=None, stop=None, force=False):
+    """Run stages in order, skipping any whose inputs and parameters are unchanged; returns a per-stage report.
+
+    With start, stages before it are not run or checked: their stored outputs are used
+    as they are, so e.g. analytics can be recomputed with new parameters without
+    refetching. The start stage always runs; stop ends the run after that stage.
+    force reruns every selected stage.
+    """
+    store = store or StageStore()
+    names = [stage.name for stage in stages]
+    for name in (start, stop):
+        if name is not None and name not in names:
+            raise ValueError(f"Unknown stage {name!r}; stages are {', '.join(names)}")
+    known = set()
+    for stage in stages:
+        missing = [name for name in stage.inputs if name not in known]
+        if missing:
+            raise ValueError(f"Stage {stage.name!r} reads {missing} before any earlier stage produces them")
+        known.update(stage.artifacts())
+    first = names.index(start) if start else 0
+    last = names.index(stop) if stop else len(stages) - 1
+
+    hashes, values, report = {}, {}, []
+
+    def value_of(artifact):
+        if artifact not in values:
+            values[artifact] = store.load(artifact)
+        return values[artifact]
+
+    for position, stage in enumerate(stages[:last + 1]):
+        manifest = store.manifest(stage.name)
+        if position < first:
+            if manifest is None:
+                raise RuntimeError(f"Stage {stage.name!r} has no stored output; run the pipeline from an earlier stage")
+            hashes.update(manifest['outputs'])
+            report.append({'stage': stage.name, 'status': 'stored'})
+            continue
+
+        key = stage_key(stage, config, hashes)
+        requested = start is not None and position == first
+        if not force and not requested and manifest and manifest['key'] == key:
+            if stage.is_valid is None or stage.is_valid({artifact: value_of(artifact) for artifact in stage.artifacts()}):
+                hashes.update(manifest['outputs'])
+                print(f"⏭️  {stage.name}: inputs unchanged, skipped")
+                report.append({'stage': stage.name, 'status': 'skipped'})
+                continue
+
+        print(f"▶️  {stage.name}...")
+        began = time.perf_counter()
+        outputs = stage.split(stage.fn({name: value_of(name) for name in stage.inputs}, config))
+        elapsed = time.perf_counter() - began
+        output_hashes = {artifact: content_hash(value) for artifact, value in outputs.items()}
+        store.save(stage.name, outputs, key, output_hashes, elapsed)
+        values.update(outputs)
+        changed = sorted(artifact for artifact, digest in output_hashes.items()
+                         if manifest is None or manifest['outputs'].get(artifact) != digest)
+        hashes.update(output_hashes)
+        print(f"✅ {stage.name}: {elapsed:.2f}s{'' if changed else ' (outputs unchanged)'}")
+        report.append({'stage': stage.name, 'status': 'ran', 'elapsed_s': round(elapsed, 3), 'changed': changed})
+    return report
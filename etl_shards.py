@@ -0,0 +1,163 @@
+import os
+import json
+import shutil
+import hashlib
+from datetime import datetime
+
+import pandas as pd
+
+from datastore import data_dir, DATA_FILE, KEY_COLUMNS, fsync_file, fsync_dir
+
+# Multi-node ETL: `etl.py --shard i/N` processes the symbols that hash to shard i and writes
+# data/shards/<run_id>/shard-i-of-N/ (results CSV + manifest); `etl.py --merge N` checks that
+# all N shards of the run are present and consistent, then publishes them as one version.
+SHARDS_DIR = "shards"
+MANIFEST_FILE = "manifest.json"
+
+
+def shard_of(symbol, shard_count):
+    """Stable shard for a symbol (independent of process, host and PYTHONHASHSEED)"""
+    digest = hashlib.sha1(symbol.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % shard_count
+
+
+def shard_symbols(symbols, shard_index, shard_count):
+    return [symbol for symbol in symbols if shard_of(symbol, shard_count) == shard_index]
+
+
+def parse_shard(text):
+    """'i/N' -> (i, N), with 0 <= i < N"""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"Shard must look like i/N, got {text!r}")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be in [0, {count}), got {text!r}")
+    return index, count
+
+
+def universe_digest(symbols):
+    """Fingerprint of the symbol universe, so a merge can tell that all shards split the same list"""
+    return hashlib.sha1("\n".join(sorted(set(symbols))).encode("utf-8")).hexdigest()
+
+
+def run_dir(run_id):
+    return os.path.join(data_dir(), SHARDS_DIR, str(run_id))
+
+
+def shard_dir(run_id, shard_index, shard_count):
+    return os.path.join(run_dir(run_id), f"shard-{shard_index}-of-{shard_count}")
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_shard_output(df, run_id, shard_index, shard_count, universe, run_report=None):
+    """Write one shard's rows and manifest; the shard directory appears atomically when complete"""
+    target = shard_dir(run_id, shard_index, shard_count)
+    staging = f"{target}.tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    try:
+        df = df.sort_values(KEY_COLUMNS)
+        data_path = os.path.join(staging, DATA_FILE)
+        df.to_csv(data_path, index=False)
+        assigned = shard_symbols(universe, shard_index, shard_count)
+        written = sorted(df['symbol'].unique())
+        manifest = {
+            'run_id': str(run_id),
+            'shard': shard_index,
+            'shard_count': shard_count,
+            'universe_digest': universe_digest(universe),
+            'assigned_symbols': len(assigned),
+            'symbols': written,
+            'missing_symbols': sorted(set(assigned) - set(written)),
+            'rows': int(len(df)),
+            'sha256': _sha256(data_path),
+            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'run_report': run_report or {},
+        }
+        with open(os.path.join(staging, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2, default=str)
+        for fname in os.listdir(staging):
+            fsync_file(os.path.join(staging, fname))
+        # A rerun of the same shard replaces its previous output
+        shutil.rmtree(target, ignore_errors=True)
+        os.rename(staging, target)
+        fsync_dir(run_dir(run_id))
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return target
+
+
+def validate_shards(run_id, shard_count):
+    """(manifests in shard order, problems); an empty problem list means the run can be merged"""
+    manifests, problems = [], []
+    seen = {}
+    for shard_index in range(shard_count):
+        directory = shard_dir(run_id, shard_index, shard_count)
+        try:
+            with open(os.path.join(directory, MANIFEST_FILE)) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            problems.append(f"shard {shard_index}/{shard_count}: missing")
+            continue
+        except ValueError as e:
+            problems.append(f"shard {shard_index}/{shard_count}: unreadable manifest ({e})")
+            continue
+        manifests.append(manifest)
+
+        if (manifest.get('run_id'), manifest.get('shard'), manifest.get('shard_count')) != (str(run_id), shard_index, shard_count):
+            problems.append(f"shard {shard_index}/{shard_count}: manifest is for another run or shard")
+        data_path = os.path.join(directory, DATA_FILE)
+        if not os.path.exists(data_path) or _sha256(data_path) != manifest.get('sha256'):
+            problems.append(f"shard {shard_index}/{shard_count}: results file missing or does not match its checksum")
+        for symbol in manifest.get('symbols', []):
+            if shard_of(symbol, shard_count) != shard_index:
+                problems.append(f"shard {shard_index}/{shard_count}: {symbol} belongs to shard {shard_of(symbol, shard_count)}")
+            if symbol in seen:
+                problems.append(f"{symbol} written by shards {seen[symbol]} and {shard_index}")
+            seen[symbol] = shard_index
+
+    if len({manifest.get('universe_digest') for manifest in manifests}) > 1:
+        problems.append("shards were run against different symbol universes")
+    if len({manifest.get('run_report', {}).get('base_version') for manifest in manifests}) > 1:
+        problems.append("shards started from different published versions")
+    return manifests, problems
+
+
+def merge_shards(run_id, shard_count, manifests):
+    """All shards' rows as one (symbol, Date)-sorted frame; identical for any shard completion order"""
+    frames = [
+        pd.read_csv(os.path.join(shard_dir(run_id, manifest['shard'], shard_count), DATA_FILE), parse_dates=['Date'])
+        for manifest in sorted(manifests, key=lambda manifest: manifest['shard'])
+    ]
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values(KEY_COLUMNS, kind='stable').reset_index(drop=True)
+
+
+def merged_run_report(manifests):
+    """One run report for the merged version, combining the shards' reports"""
+    reports = [manifest.get('run_report', {}) for manifest in manifests]
+    modes = {report.get('mode') for report in reports}
+    return {
+        'mode': modes.pop() if len(modes) == 1 else 'mixed',
+        'base_version': reports[0].get('base_version') if reports else None,
+        'shards': len(manifests),
+        'adjustments': [event for report in reports for event in report.get('adjustments', [])],
+        'missing_symbols': sorted(symbol for manifest in manifests for symbol in manifest.get('missing_symbols', [])),
+    }
+
+
+def remove_run(run_id):
+    shutil.rmtree(run_dir(run_id), ignore_errors=True)
+
+
+def remove_shard_output(run_id, shard_index, shard_count):
+    shutil.rmtree(shard_dir(run_id, shard_index, shard_count), ignore_errors=True)
@@ -0,0 +1,128 @@
+import gc
+import os
+import sys
+import time
+
+import pandas as pd
+
+from datastore import VersionWriter, KEY_COLUMNS
+
+# Out-of-core ETL: symbols stream through fetch -> standardize -> analytics -> quality -> write
+# in chunks sized to fit a memory ceiling, and every finished chunk is appended to the staged
+# version on disk, so peak memory follows the chunk size rather than the universe size.
+MEMORY_LIMIT_ENV = "BULLBOARD_ETL_MEMORY_MB"
+DEFAULT_MEMORY_LIMIT_MB = 512
+# Peak working memory of a chunk relative to its finished frame: the raw downloads, the
+# standardized copy, the concatenated chunk and the groupby-rolling temporaries coexist
+WORKING_SET_FACTOR = 8
+# Footprint of one finished row before any chunk has been measured (prices, analytics, strings)
+INITIAL_ROW_BYTES = 400
+MAX_CHUNK_SYMBOLS = 500
+
+
+def configured_memory_limit():
+    """Memory ceiling in bytes for out-of-core runs (BULLBOARD_ETL_MEMORY_MB, default 512)"""
+    try:
+        megabytes = float(os.environ.get(MEMORY_LIMIT_ENV, DEFAULT_MEMORY_LIMIT_MB))
+    except ValueError:
+        megabytes = DEFAULT_MEMORY_LIMIT_MB
+    return int(max(1.0, megabytes) * 1024 * 1024)
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None where it cannot be measured"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class ChunkSizer:
+    """Symbols per chunk such that one chunk's working set fits in the memory limit"""
+
+    def __init__(self, memory_limit, rows_per_symbol):
+        self.memory_limit = memory_limit
+        self.symbol_bytes = max(1, rows_per_symbol) * INITIAL_ROW_BYTES
+        self.measured = False
+
+    def next_size(self):
+        return int(min(MAX_CHUNK_SYMBOLS, max(1, self.memory_limit // (self.symbol_bytes * WORKING_SET_FACTOR))))
+
+    def observe(self, df):
+        """Learn the real per-symbol footprint from a finished chunk (the largest seen wins)"""
+        n_symbols = df['symbol'].nunique()
+        if not n_symbols:
+            return
+        symbol_bytes = df.memory_usage(index=True, deep=True).sum() / n_symbols
+        self.symbol_bytes = symbol_bytes if not self.measured else max(self.symbol_bytes, symbol_bytes)
+        self.measured = True
+
+
+def stream_to_version(tickers, fetch_symbol, transform, rows_per_symbol, memory_limit=None, run_report=None):
+    """Publish tickers' processed rows as a new version, holding at most one chunk in memory.
+
+    fetch_symbol(ticker) returns one symbol's standardized rows, or None to skip it;
+    transform(df) turns a (symbol, Date)-sorted chunk of whole symbols into its final rows.
+    rows_per_symbol is the expected history length, used to size chunks until the first
+    one has been measured. Returns (version or None, failed tickers, stats).
+    """
+    memory_limit = memory_limit or configured_memory_limit()
+    sizer = ChunkSizer(memory_limit, rows_per_symbol)
+    pending = sorted(set(tickers))
+    failed = []
+    chunks = 0
+    symbols = 0
+    began = time.perf_counter()
+    print(f"🔧 Out-of-core run: {len(pending)} symbols, memory limit {memory_limit / 2**20:.0f} MB")
+
+    writer = VersionWriter()
+    try:
+        while pending:
+            size = sizer.next_size()
+            batch, pending = pending[:size], pending[size:]
+            chunks += 1
+            print(f"🔧 Chunk {chunks}: {len(batch)} symbol(s) {batch[0]}..{batch[-1]}, {len(pending)} left")
+            frames = []
+            for ticker in batch:
+                frame = fetch_symbol(ticker)
+                if frame is None or frame.empty:
+                    failed.append(ticker)
+                else:
+                    frames.append(frame)
+            if not frames:
+                continue
+            df = pd.concat(frames, ignore_index=True)
+            del frames
+            df = transform(df.sort_values(KEY_COLUMNS).reset_index(drop=True))
+            writer.append(df)
+            sizer.observe(df)
+            symbols += df['symbol'].nunique()
+            del df
+            gc.collect()
+
+        peak = peak_rss_bytes()
+        stats = {
+            'chunks': chunks,
+            'symbols': symbols,
+            'rows': writer.rows,
+            'memory_limit_mb': round(memory_limit / 2**20, 1),
+            'peak_rss_mb': round(peak / 2**20, 1) if peak else None,
+            'elapsed_s': round(time.perf_counter() - began, 2),
+        }
+        if peak and peak > memory_limit:
+            # ChunkSizer only estimates a chunk's working set; a lower limit gives smaller chunks
+            stats['warning'] = (f"Peak RSS {stats['peak_rss_mb']} MB exceeded the {stats['memory_limit_mb']} MB memory limit; "
+                                f"lower {MEMORY_LIMIT_ENV} if the machine has no headroom")
+        if not writer.rows:
+            writer.abort()
+            return None, failed, stats
+        if run_report is not None:
+            run_report = {**run_report, 'out_of_core': stats, 'failed_symbols': sorted(failed)}
+        version = writer.publish(run_report)
+    except Exception:
+        writer.abort()
+        raise
+    return version, failed, stats
@@ -0,0 +1,230 @@
+import os
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+# Optional embedded query backend; set to a database path to enable it in the ETL and the app
+HISTORY_DB_ENV = "BULLBOARD_HISTORY_DB"
+
+# (column, SQLite type) in the order the ETL publishes them
+HISTORY_COLUMNS = (
+    ("symbol", "TEXT NOT NULL"),
+    ("Date", "TEXT NOT NULL"),
+    ("Open", "REAL"),
+    ("High", "REAL"),
+    ("Low", "REAL"),
+    ("Close", "REAL"),
+    ("Volume", "REAL"),
+    ("download_time", "TEXT"),
+    ("daily_return", "REAL"),
+    ("volatility_21", "REAL"),
+    ("rolling_yield_21", "REAL"),
+    ("sharpe_21", "REAL"),
+    ("max_drawdown_63", "REAL"),
+    ("custom_risk_score", "REAL"),
+)
+COLUMN_NAMES = tuple(name for name, _ in HISTORY_COLUMNS)
+
+# WITHOUT ROWID stores rows in primary-key order, so (symbol, Date) is the clustered key:
+# a basket/date-range slice is one contiguous range scan per symbol
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS prices (
+    {", ".join(f'"{name}" {sql_type}' for name, sql_type in HISTORY_COLUMNS)},
+    PRIMARY KEY (symbol, Date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+"""
+
+# Pushed-down equivalents of analytics.SUMMARY_AGGREGATIONS (NULLs skipped like pandas NaN)
+_SUMMARY_SQL = """
+WITH slice AS (
+    SELECT * FROM prices
+    WHERE symbol IN ({placeholders}) AND Date >= ? AND Date <= ?
+),
+bounds AS (
+    SELECT symbol, MIN(Date) AS first_date, MAX(Date) AS last_date FROM slice GROUP BY symbol
+)
+SELECT
+    s.symbol,
+    MIN(s.Date) AS period_start,
+    MAX(s.Date) AS period_end,
+    COUNT(s.Date) AS period_days,
+    AVG(s.Close) AS avg_close,
+    AVG(s.daily_return) AS avg_daily_return,
+    CASE WHEN COUNT(*) > 1 AND f.Close != 0 THEN l.Close / f.Close - 1 END AS total_return,
+    AVG(s.volatility_21) AS volatility_21,
+    AVG(s.rolling_yield_21) AS avg_rolling_yield_21,
+    AVG(s.sharpe_21) AS avg_sharpe_21,
+    AVG(s.max_drawdown_63) AS avg_max_drawdown_63,
+    AVG(s.custom_risk_score) AS avg_custom_risk_score
+FROM slice s
+JOIN bounds b ON b.symbol = s.symbol
+JOIN slice f ON f.symbol = s.symbol AND f.Date = b.first_date
+JOIN slice l ON l.symbol = s.symbol AND l.Date = b.last_date
+GROUP BY s.symbol
+ORDER BY s.symbol
+"""
+
+# Far-future/past ISO dates stand in for an open-ended range
+_MIN_DATE = "0000-01-01"
+_MAX_DATE = "9999-12-31"
+
+
+def _iso_date(value, default):
+    if value is None:
+        return default
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def _to_records(df):
+    """Rows in HISTORY_COLUMNS order with ISO dates and NaN mapped to NULL"""
+    frame = pd.DataFrame({name: df[name] if name in df.columns else None for name in COLUMN_NAMES})
+    frame['Date'] = pd.to_datetime(frame['Date']).dt.strftime("%Y-%m-%d")
+    frame = frame.astype(object).where(frame.notna(), None)
+    return list(frame.itertuples(index=False, name=None))
+
+
+class HistoryStore:
+    """SQLite-backed price history keyed by (symbol, Date).
+
+    Filtering, date slicing and aggregation run inside the engine, so callers only
+    ever hold the rows (or aggregates) they asked for. Each call opens its own
+    connection, which keeps the store safe to share across Streamlit sessions.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self, readonly=True):
+        if readonly:
+            return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        return sqlite3.connect(self.path)
+
+    def _read_sql(self, sql, params=()):
+        with closing(self._connect()) as conn:
+            return pd.read_sql_query(sql, conn, params=list(params))
+
+    # --- writing ---
+    def publish(self, df, dataset_version):
+        """Upsert the published dataset in one transaction and drop the rows no longer in it"""
+        records = _to_records(df)
+        symbol_at, date_at = COLUMN_NAMES.index('symbol'), COLUMN_NAMES.index('Date')
+        placeholders = ", ".join("?" * len(COLUMN_NAMES))
+        with closing(self._connect(readonly=False)) as conn:
+            conn.executescript(_SCHEMA)
+            with conn:  # commits on success, rolls back on any error
+                # Rows of dropped symbols and dates filtered out since the last publish go too
+                conn.execute("CREATE TEMP TABLE published_rows (symbol TEXT, Date TEXT, PRIMARY KEY (symbol, Date))")
+                conn.executemany(
+                    "INSERT OR IGNORE INTO published_rows VALUES (?, ?)",
+                    [(record[symbol_at], record[date_at]) for record in records]
+                )
+                conn.execute(
+                    "DELETE FROM prices WHERE NOT EXISTS "
+                    "(SELECT 1 FROM published_rows p WHERE p.symbol = prices.symbol AND p.Date = prices.Date)"
+                )
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO prices ({', '.join(COLUMN_NAMES)}) VALUES ({placeholders})",
+                    records
+                )
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('dataset_version', ?)", (str(dataset_version),))
+        return len(records)
+
+    # --- metadata ---
+    def dataset_version(self):
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT value FROM meta WHERE key = 'dataset_version'").fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def symbols(self):
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT symbol FROM prices ORDER BY symbol")]
+
+    # --- typed query helpers ---
+    def basket_history(self, symbols, start_date=None, end_date=None, columns=None):
+        """Rows for the given symbols and inclusive date range, ordered by (symbol, Date)"""
+        symbols = list(symbols)
+        columns = list(columns) if columns else list(COLUMN_NAMES)
+        if not symbols:
+            return pd.DataFrame(columns=columns)
+        select = ", ".join(f'"{column}"' for column in columns)
+        sql = (
+            f"SELECT {select} FROM prices "
+            f"WHERE symbol IN ({', '.join('?' * len(symbols))}) AND Date >= ? AND Date <= ? "
+            f"ORDER BY symbol, Date"
+        )
+        df = self._read_sql(sql, [*symbols, _iso_date(start_date, _MIN_DATE), _iso_date(end_date, _MAX_DATE)])
+        if 'Date' in df.columns:
+            df['Date'] = pd.to_datetime(df['Date'])
+        return df
+
+    def column_history(self, column, start_date=None, end_date=None):
+        """(symbol, Date, column) for the whole universe; e.g. daily returns for correlation work"""
+        sql = f'SELECT symbol, Date, "{column}" FROM prices WHERE Date >= ? AND Date <= ? ORDER BY symbol, Date'
+        df = self._read_sql(sql, [_iso_date(start_date, _MIN_DATE), _iso_date(end_date, _MAX_DATE)])
+        df['Date'] = pd.to_datetime(df['Date'])
+        return df
+
+    def date_bounds(self, symbols):
+        """(first, last) date across the given symbols, or (None, None)"""
+        symbols = list(symbols)
+        if not symbols:
+            return None, None
+        with closing(self._connect()) as conn:
+            first, last = conn.execute(
+                f"SELECT MIN(Date), MAX(Date) FROM prices WHERE symbol IN ({', '.join('?' * len(symbols))})",
+                symbols
+            ).fetchone()
+        if first is None:
+            return None, None
+        return pd.Timestamp(first), pd.Timestamp(last)
+
+    def summary_statistics(self, symbols, start_date=None, end_date=None):
+        """Same table as analytics.calculate_summary_statistics, aggregated inside SQLite"""
+        symbols = list(symbols)
+        sql = _SUMMARY_SQL.format(placeholders=", ".join("?" * len(symbols)))
+        summary = self._read_sql(sql, [*symbols, _iso_date(start_date, _MIN_DATE), _iso_date(end_date, _MAX_DATE)])
+        summary['period_start'] = pd.to_datetime(summary['period_start'])
+        summary['period_end'] = pd.to_datetime(summary['period_end'])
+        return summary.astype({'total_return': np.float64})
+
+    def top_n(self, metric, n=10, ascending=False, symbols=None):
+        """Latest row per symbol ranked by metric (NULLs last)"""
+        if metric not in COLUMN_NAMES:
+            raise ValueError(f"Unknown metric column: {metric}")
+        params = []
+        symbol_filter = ""
+        if symbols is not None:
+            symbols = list(symbols)
+            symbol_filter = f"WHERE symbol IN ({', '.join('?' * len(symbols))})"
+            params.extend(symbols)
+        order = "ASC" if ascending else "DESC"
+        sql = f"""
+            WITH latest AS (
+                SELECT symbol, MAX(Date) AS Date FROM prices {symbol_filter} GROUP BY symbol
+            )
+            SELECT p.symbol, p.Date, p."{metric}"
+            FROM prices p JOIN latest USING (symbol, Date)
+            ORDER BY p."{metric}" IS NULL, p."{metric}" {order}
+            LIMIT ?
+        """
+        params.append(int(n))
+        df = self._read_sql(sql, params)
+        df['Date'] = pd.to_datetime(df['Date'])
+        return df
+
+
+def configured_store(expected_version=None):
+    """The store named by BULLBOARD_HISTORY_DB if it exists and matches expected_version"""
+    path = os.environ.get(HISTORY_DB_ENV)
+    if not path or not os.path.exists(path):
+        return None
+    store = HistoryStore(path)
+    if expected_version is not None and store.dataset_version() != str(expected_version):
+        return None
+    return store
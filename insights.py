@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+
+# Insight engine: every tier, score and category for the whole summary table is
+# computed in one vectorized pass and stored as small integer codes. Markdown text
+# is only produced for the rows that are actually rendered.
+
+PERFORMANCE_MESSAGES = (
+    "🚀 **Performance**: {symbol} generated strong {total_return:.1%} returns during the selected period",
+    "📈 **Performance**: {symbol} gained {total_return:.1%} over the analysis period",
+    "📊 **Performance**: {symbol} posted modest {total_return:.1%} returns",
+    "📉 **Performance**: {symbol} declined {abs_total_return:.1%} during the period",
+    "📉 **Performance**: {symbol} experienced significant decline of {abs_total_return:.1%}",
+)
+
+# Indexed by level - 1 (Low, Moderate, High)
+RISK_LEVELS = ("Low", "Moderate", "High")
+VOLATILITY_DESCRIPTIONS = (
+    "Relatively stable price movements ({volatility:.1%} volatility)",
+    "Moderate price fluctuations ({volatility:.1%} volatility)",
+    "Significant price swings ({volatility:.1%} volatility)",
+)
+DRAWDOWN_DESCRIPTIONS = (
+    "Limited downside risk ({max_drawdown:.1%})",
+    "Moderate downside exposure ({max_drawdown:.1%})",
+    "Large peak-to-trough declines ({max_drawdown:.1%})",
+)
+CONSISTENCY_DESCRIPTIONS = (
+    "Consistent return generation (Sharpe: {sharpe:.2f})",
+    "Moderately consistent returns (Sharpe: {sharpe:.2f})",
+    "Inconsistent return patterns (Sharpe: {sharpe:.2f})",
+)
+
+EFFICIENCY_MESSAGES = (
+    "⭐ **Efficiency**: Excellent risk-adjusted performance with Sharpe ratio of {sharpe:.2f}",
+    "✅ **Efficiency**: Good risk-adjusted performance with Sharpe ratio of {sharpe:.2f}",
+    "📊 **Efficiency**: Moderate risk-adjusted performance with Sharpe ratio of {sharpe:.2f}",
+    "⚠️ **Efficiency**: Below-average risk-adjusted performance with Sharpe ratio of {sharpe:.2f}",
+)
+
+TREND_MESSAGES = (
+    "📈 **Trend**: Daily average return of {avg_return:.3%} projects to {annualized_trend:.1%} annualized",
+    "📉 **Trend**: Daily average decline of {abs_avg_return:.3%} projects to {abs_annualized_trend:.1%} annualized",
+    "📊 **Trend**: Flat trend with minimal daily movement averaging {avg_return:.3%}",
+)
+
+QUALITY_MESSAGES = (
+    "🏆 **Quality Score**: High rating of {quality_overall}/100 across key metrics",
+    "📊 **Quality Score**: Moderate rating of {quality_overall}/100 across key metrics",
+    "📊 **Quality Score**: Below-average rating of {quality_overall}/100 across key metrics",
+)
+
+# 0 means "no insight" for the optional context messages
+RELATIVE_MESSAGES = (
+    None,
+    "📊 **Relative Performance**: {symbol} outperformed your selection average by {abs_relative_performance:.1%}",
+    "📊 **Relative Performance**: {symbol} underperformed your selection average by {abs_relative_performance:.1%}",
+)
+RISK_EFFICIENCY_MESSAGES = (
+    None,
+    "🎯 **Risk Efficiency**: {symbol} achieved above-average returns ({total_return:.1%}) with below-average risk ({volatility:.1%})",
+    "⚠️ **Risk-Return Mismatch**: {symbol} shows higher risk ({volatility:.1%}) than average but lower returns ({total_return:.1%})",
+)
+
+RISK_CATEGORIES = ("low-risk", "moderate-risk", "high-risk")
+RETURN_CATEGORIES = ("strong gains", "moderate gains", "modest gains", "negative returns")
+
+PERFORMANCE_INDICATORS = (
+    "🚀 Strong Performer",
+    "📈 Positive",
+    "📊 Modest Gains",
+    "📉 Declining",
+    "⚠️ Significant Decline",
+)
+
+
+def _tier(conditions, default):
+    """Index of the first true condition per row (np.select over a threshold ladder)"""
+    return np.select(conditions, list(range(len(conditions))), default=default).astype(np.int8)
+
+
+def _bounded_score(values):
+    # Mirrors min(100, max(0, x)) semantics: NaN scores count as 0
+    return np.clip(np.nan_to_num(values, nan=0.0), 0, 100)
+
+
+def build_insight_table(summary, portfolio_context):
+    """Compute every insight tier, score and category for all symbols at once"""
+    total_return = summary['total_return'].to_numpy(dtype=np.float64)
+    volatility = summary['volatility_21'].to_numpy(dtype=np.float64)
+    sharpe = summary['avg_sharpe_21'].to_numpy(dtype=np.float64)
+    avg_return = summary['avg_rolling_yield_21'].to_numpy(dtype=np.float64)
+    max_drawdown = summary['avg_max_drawdown_63'].to_numpy(dtype=np.float64)
+    risk_score = summary['avg_custom_risk_score'].to_numpy(dtype=np.float64)
+
+    market_avg = portfolio_context.get('avg_return', 0)
+    market_volatility = portfolio_context.get('avg_volatility', 0.05)
+
+    # Quality metrics (0-100 scale)
+    quality_consistency = _bounded_score((sharpe + 1) * 40)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        quality_efficiency = np.where(risk_score > 0, _bounded_score((total_return / risk_score) * 5), 0.0)
+    quality_growth = _bounded_score((avg_return * 252 + 0.1) * 200)
+    # Ratings are reported and tiered at one decimal place
+    quality_overall = (quality_consistency * 0.4 + quality_efficiency * 0.4 + quality_growth * 0.2).round(1)
+
+    relative_performance = total_return - market_avg
+    significant = np.abs(relative_performance) > 0.05
+
+    table = pd.DataFrame({
+        'symbol': summary['symbol'].to_numpy(),
+        'total_return': total_return,
+        'volatility_21': volatility,
+        'avg_sharpe_21': sharpe,
+        'avg_rolling_yield_21': avg_return,
+        'avg_max_drawdown_63': max_drawdown,
+        'relative_performance': relative_performance,
+        'quality_consistency': quality_consistency.round(1),
+        'quality_efficiency': quality_efficiency.round(1),
+        'quality_growth': quality_growth.round(1),
+        'quality_overall': quality_overall,
+        'performance_code': _tier([total_return > 0.20, total_return > 0.05, total_return > 0, total_return > -0.10], 4),
+        'volatility_level': 3 - _tier([volatility > 0.08, volatility > 0.05], 2),
+        'drawdown_level': 3 - _tier([max_drawdown > 0.20, max_drawdown > 0.10], 2),
+        'consistency_level': 3 - _tier([sharpe < 0.5, sharpe < 1.0], 2),
+        'efficiency_code': _tier([sharpe > 1.2, sharpe > 0.8, sharpe > 0.3], 3),
+        'trend_code': _tier([avg_return > 0.001, avg_return < -0.001], 2),
+        'quality_code': _tier([quality_overall > 70, quality_overall > 50], 2),
+        'relative_code': np.select(
+            [significant & (relative_performance > 0), significant], [1, 2], default=0
+        ).astype(np.int8),
+        'risk_efficiency_code': np.select(
+            [(volatility < market_volatility * 0.8) & (total_return > market_avg),
+             (volatility > market_volatility * 1.2) & (total_return < market_avg)],
+            [1, 2], default=0
+        ).astype(np.int8),
+        'return_category': _tier([total_return > 0.15, total_return > 0.05, total_return > 0], 3),
+        'indicator_code': _tier([total_return > 0.15, total_return > 0.05, total_return > 0, total_return > -0.10], 4),
+    })
+    return table
+
+
+def risk_profile(row):
+    """Level/score/description per risk factor for one insight-table row"""
+    values = {
+        'volatility': row['volatility_21'],
+        'max_drawdown': row['avg_max_drawdown_63'],
+        'sharpe': row['avg_sharpe_21'],
+    }
+    profile = {}
+    for factor, level_column, descriptions in (
+        ('volatility', 'volatility_level', VOLATILITY_DESCRIPTIONS),
+        ('drawdown', 'drawdown_level', DRAWDOWN_DESCRIPTIONS),
+        ('consistency', 'consistency_level', CONSISTENCY_DESCRIPTIONS),
+    ):
+        level = int(row[level_column])
+        profile[factor] = {
+            'level': RISK_LEVELS[level - 1],
+            'score': level,
+            'description': descriptions[level - 1].format(**values),
+        }
+    return profile
+
+
+def render_insights(row):
+    """Markdown insight lines for one insight-table row (called only when displayed)"""
+    total_return = row['total_return']
+    avg_return = row['avg_rolling_yield_21']
+    values = {
+        'symbol': row['symbol'],
+        'total_return': total_return,
+        'abs_total_return': abs(total_return),
+        'volatility': row['volatility_21'],
+        'max_drawdown': row['avg_max_drawdown_63'],
+        'sharpe': row['avg_sharpe_21'],
+        'avg_return': avg_return,
+        'abs_avg_return': abs(avg_return),
+        'annualized_trend': avg_return * 252,
+        'abs_annualized_trend': abs(avg_return * 252),
+        'quality_overall': row['quality_overall'],
+        'abs_relative_performance': abs(row['relative_performance']),
+    }
+
+    insights = [
+        PERFORMANCE_MESSAGES[row['performance_code']].format(**values),
+        "📊 **Risk Profile**: " + VOLATILITY_DESCRIPTIONS[row['volatility_level'] - 1].format(**values),
+        EFFICIENCY_MESSAGES[row['efficiency_code']].format(**values),
+        TREND_MESSAGES[row['trend_code']].format(**values),
+        QUALITY_MESSAGES[row['quality_code']].format(**values),
+    ]
+    for messages, code in ((RELATIVE_MESSAGES, row['relative_code']), (RISK_EFFICIENCY_MESSAGES, row['risk_efficiency_code'])):
+        if code:
+            insights.append(messages[code].format(**values))
+    insights.append("📊 **Downside Risk**: " + DRAWDOWN_DESCRIPTIONS[row['drawdown_level'] - 1].format(**values))
+    insights.append(
+        f"📋 **Profile**: {row['symbol']} is a {RISK_CATEGORIES[row['volatility_level'] - 1]} stock "
+        f"showing {RETURN_CATEGORIES[row['return_category']]} over your selected timeframe"
+    )
+    return insights
+
+
+def performance_indicator(row):
+    return PERFORMANCE_INDICATORS[row['indicator_code']]
@@ -0,0 +1,53 @@
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+# Samples kept per metric for the admin panel
+MAX_SAMPLES = 200
+
+_samples = {}
+_lock = threading.Lock()
+
+
+def record(name, value, unit=""):
+    """Record one sample of a named metric"""
+    with _lock:
+        entry = _samples.get(name)
+        if entry is None:
+            entry = {"unit": unit, "values": deque(maxlen=MAX_SAMPLES), "count": 0}
+            _samples[name] = entry
+        entry["values"].append(float(value))
+        entry["count"] += 1
+
+
+@contextmanager
+def timed(name):
+    """Record the wall-clock duration of the enclosed block in milliseconds"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000, "ms")
+
+
+def snapshot():
+    """Summary of every metric: sample count, last, mean and max over recent samples"""
+    with _lock:
+        rows = []
+        for name, entry in sorted(_samples.items()):
+            values = entry["values"]
+            rows.append({
+                "metric": name,
+                "unit": entry["unit"],
+                "count": entry["count"],
+                "last": round(values[-1], 2),
+                "mean": round(sum(values) / len(values), 2),
+                "max": round(max(values), 2),
+            })
+        return rows
+
+
+def reset():
+    with _lock:
+        _samples.clear()
@@ -0,0 +1,377 @@
+import os
+import glob
+import json
+import math
+import time
+from collections import deque
+from datetime import datetime
+
+import pandas as pd
+
+from datastore import data_dir, current_version, read_dataset, KEY_COLUMNS
+
+# Intraday ingestion: bar updates for the running session stream in (polled from yfinance
+# with prepost=True, or replayed from a CSV for testing) and per-symbol rolling state turns
+# each one into provisional values for today's row in O(1). The provisional rows are written
+# next to the dataset version they extend; the app merges them into its resident history
+# without reloading it, and ignores them once the ETL has published a newer version.
+INTRADAY_DIR = "intraday"
+PROVISIONAL_META_FILE = "provisional.json"
+PUBLISH_SECONDS = 5.0
+MARKET_TZ = "America/New_York"
+BAR_COLUMNS = ['symbol', 'timestamp', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _add(count, mean, m2, value):
+    count += 1
+    delta = value - mean
+    mean += delta / count
+    return count, mean, m2 + delta * (value - mean)
+
+
+def _remove(count, mean, m2, value):
+    if count <= 1:
+        return 0, 0.0, 0.0
+    new_mean = (count * mean - value) / (count - 1)
+    return count - 1, new_mean, m2 - (value - mean) * (value - new_mean)
+
+
+def _ratio(numerator, denominator):
+    # Float division the way pandas does it: x/0 is +-inf, 0/0 and NaN inputs are NaN
+    if math.isnan(numerator) or math.isnan(denominator):
+        return math.nan
+    if denominator == 0:
+        return math.nan if numerator == 0 else math.copysign(math.inf, numerator)
+    return numerator / denominator
+
+
+class RollingMoments:
+    """Mean and sample std of the last `size` values (Welford updates, NaN-aware like pandas rolling)"""
+
+    def __init__(self, size, values=()):
+        self.size = size
+        self.values = deque()
+        self.count, self.mean, self.m2 = 0, 0.0, 0.0
+        self.nans = 0
+        for value in values:
+            self.push(value)
+
+    def push(self, value):
+        if len(self.values) == self.size:
+            oldest = self.values.popleft()
+            if math.isnan(oldest):
+                self.nans -= 1
+            else:
+                self.count, self.mean, self.m2 = _remove(self.count, self.mean, self.m2, oldest)
+        self.values.append(value)
+        if math.isnan(value):
+            self.nans += 1
+        else:
+            self.count, self.mean, self.m2 = _add(self.count, self.mean, self.m2, value)
+
+    def peek(self, value):
+        """(mean, std) of the window as it would be after push(value), in O(1) and without pushing"""
+        count, mean, m2, nans = self.count, self.mean, self.m2, self.nans
+        length = len(self.values) + 1
+        if length > self.size:
+            length = self.size
+            oldest = self.values[0]
+            if math.isnan(oldest):
+                nans -= 1
+            else:
+                count, mean, m2 = _remove(count, mean, m2, oldest)
+        if math.isnan(value):
+            nans += 1
+        else:
+            count, mean, m2 = _add(count, mean, m2, value)
+        if length < self.size or nans or count < 2:
+            return math.nan, math.nan
+        return mean, math.sqrt(max(m2, 0.0) / (count - 1))
+
+
+class RollingExtrema:
+    """Max and min of the last `size` values from monotonic deques of (index, value)"""
+
+    def __init__(self, size, values=()):
+        self.size = size
+        self.pushed = 0
+        self._max = deque()
+        self._min = deque()
+        for value in values:
+            self.push(value)
+
+    def push(self, value):
+        index = self.pushed
+        self.pushed += 1
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((index, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((index, value))
+        for extremes in (self._max, self._min):
+            if extremes[0][0] <= index - self.size:
+                extremes.popleft()
+
+    def peek(self, value):
+        """(max, min) of the window as it would be after push(value), in O(1) and without pushing"""
+        if min(self.pushed, self.size - 1) + 1 < self.size:
+            return math.nan, math.nan
+        # Only the front entry can be the value that drops out of the window
+        first_kept = self.pushed - self.size + 1
+        result = []
+        for extremes, pick in ((self._max, max), (self._min, min)):
+            front = extremes[0] if extremes and extremes[0][0] >= first_kept else (extremes[1] if len(extremes) > 1 else None)
+            result.append(value if front is None else pick(front[1], value))
+        return tuple(result)
+
+
+class SymbolState:
+    """One symbol's rolling state at the end of the published history, plus its provisional days"""
+
+    def __init__(self, closes, returns, last_date, rolling_vol_days=21, rolling_drawdown_days=63):
+        self.returns = RollingMoments(rolling_vol_days, returns[-rolling_vol_days:])
+        self.closes = RollingExtrema(rolling_drawdown_days, closes[-rolling_drawdown_days:])
+        self.prev_close = closes[-1] if len(closes) else math.nan
+        self.last_date = last_date   # last day in the published dataset
+        self.day = None              # session being aggregated
+        self.bar = None              # its [Open, High, Low, Close, Volume] so far
+        self.bar_time = None         # timestamp and volume of the latest bar folded in
+        self.bar_volume = 0
+        self.rows = {}               # provisional row per session date after last_date
+
+    def update(self, day, timestamp, open_, high, low, close, volume):
+        """Fold one bar into its session's row; returns the row, or None for bars already published or out of order.
+
+        A bar with the same timestamp as the previous one is an update of that (still
+        forming) bar and replaces its volume instead of adding to it.
+        """
+        if day <= self.last_date or (self.day is not None and day < self.day):
+            return None
+        if self.day is not None and day != self.day:
+            self._close_session()
+        if self.day is None:
+            self.day = day
+            self.bar = [open_, high, low, close, volume]
+        elif timestamp < self.bar_time:
+            return None
+        else:
+            bar = self.bar
+            bar[1] = max(bar[1], high)
+            bar[2] = min(bar[2], low)
+            bar[3] = close
+            bar[4] += volume - (self.bar_volume if timestamp == self.bar_time else 0)
+        self.bar_time, self.bar_volume = timestamp, volume
+        row = self._row()
+        self.rows[day] = row
+        return row
+
+    def _close_session(self):
+        # A later session has started: the previous one becomes part of the rolling windows
+        close = self.bar[3]
+        self.returns.push(_ratio(close, self.prev_close) - 1)
+        self.closes.push(close)
+        self.prev_close = close
+        self.day, self.bar = None, None
+
+    def _row(self):
+        open_, high, low, close, volume = self.bar
+        daily_return = _ratio(close, self.prev_close) - 1
+        mean, std = self.returns.peek(daily_return)
+        highest, lowest = self.closes.peek(close)
+        drawdown = _ratio(highest - lowest, highest)
+        return {
+            'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume,
+            'daily_return': daily_return,
+            'volatility_21': std,
+            'rolling_yield_21': mean,
+            'sharpe_21': _ratio(mean, std) * math.sqrt(252),
+            'max_drawdown_63': drawdown,
+            'custom_risk_score': std * 0.7 + drawdown * 0.3,
+        }
+
+
+def session_date(timestamp):
+    """Trading session (naive midnight, like the dataset's Date) a bar timestamp belongs to"""
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(MARKET_TZ).tz_localize(None)
+    return timestamp.normalize()
+
+
+class IntradayIngestor:
+    """Provisional rows for every symbol of a published version, updated in O(1) per bar"""
+
+    def __init__(self, history, base_version, rolling_vol_days=21, rolling_drawdown_days=63):
+        self.base_version = base_version
+        self.columns = list(history.columns)
+        self.rolling_vol_days = rolling_vol_days
+        self.rolling_drawdown_days = rolling_drawdown_days
+        self.states = {}
+        tail = history.groupby('symbol', sort=False).tail(max(rolling_vol_days, rolling_drawdown_days))
+        for symbol, rows in tail.groupby('symbol', sort=False):
+            self.states[symbol] = SymbolState(
+                rows['Close'].to_numpy(dtype=float), rows['daily_return'].to_numpy(dtype=float),
+                rows['Date'].iloc[-1], rolling_vol_days, rolling_drawdown_days,
+            )
+        self.bars = 0
+        self.as_of = None
+
+    @classmethod
+    def from_version(cls, version=None, **kwargs):
+        version = current_version() if version is None else version
+        history = read_dataset(version).sort_values(KEY_COLUMNS).reset_index(drop=True)
+        return cls(history, version, **kwargs)
+
+    def ingest(self, bar):
+        """Apply one bar update (dict with BAR_COLUMNS); returns the symbol's provisional row or None"""
+        state = self.states.get(bar['symbol'])
+        if state is None or not bar['Close'] > 0:
+            return None
+        timestamp = pd.Timestamp(bar['timestamp'])
+        row = state.update(session_date(timestamp), timestamp, bar['Open'], bar['High'], bar['Low'], bar['Close'], bar['Volume'])
+        if row is not None:
+            self.bars += 1
+            self.as_of = bar['timestamp']
+        return row
+
+    def rebase(self, version=None):
+        """Ingestor for a newer published version, carrying over the sessions it does not contain yet"""
+        rebased = IntradayIngestor.from_version(
+            version, rolling_vol_days=self.rolling_vol_days, rolling_drawdown_days=self.rolling_drawdown_days,
+        )
+        for symbol, state in self.states.items():
+            for day, row in sorted(state.rows.items()):
+                # A session's aggregate replays as a single bar with the same totals
+                rebased.ingest({'symbol': symbol, 'timestamp': day, **{column: row[column] for column in BAR_COLUMNS[2:]}})
+        rebased.bars, rebased.as_of = self.bars, self.as_of
+        return rebased
+
+    def provisional_rows(self):
+        """Provisional rows of every symbol, in the dataset's columns and (symbol, Date) order"""
+        as_of = pd.Timestamp(self.as_of).strftime('%Y-%m-%d %H:%M') if self.as_of is not None else None
+        records = [
+            {'symbol': symbol, 'Date': day, 'download_time': as_of, **row}
+            for symbol, state in sorted(self.states.items())
+            for day, row in sorted(state.rows.items())
+        ]
+        return pd.DataFrame.from_records(records, columns=self.columns)
+
+
+def _intraday_dir():
+    return os.path.join(data_dir(), INTRADAY_DIR)
+
+
+def publish_provisional(rows, base_version, as_of=None):
+    """Write provisional rows for base_version; the metadata file is replaced last, atomically"""
+    directory = _intraday_dir()
+    os.makedirs(directory, exist_ok=True)
+    stamp = f"{time.time_ns()}"
+    fname = f"provisional-{stamp}.csv"
+    rows.to_csv(os.path.join(directory, fname), index=False)
+    meta = {
+        'base_version': str(base_version),
+        'stamp': stamp,
+        'file': fname,
+        'rows': int(len(rows)),
+        'symbols': int(rows['symbol'].nunique()) if len(rows) else 0,
+        'as_of': str(as_of) if as_of is not None else None,
+        'written_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    meta_tmp = os.path.join(directory, f"{PROVISIONAL_META_FILE}.tmp")
+    with open(meta_tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(meta_tmp, os.path.join(directory, PROVISIONAL_META_FILE))
+    # Keep the previous file too: a reader may have just picked up its name
+    for old in sorted(glob.glob(os.path.join(directory, "provisional-*.csv")))[:-2]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+    return meta
+
+
+def provisional_meta(version):
+    """Metadata of the provisional rows extending version, or None (none written, or for another version)"""
+    try:
+        with open(os.path.join(_intraday_dir(), PROVISIONAL_META_FILE)) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    return meta if meta.get('base_version') == str(version) and meta.get('rows') else None
+
+
+def read_provisional(meta):
+    """Provisional rows a provisional_meta() entry points at (Date parsed), or None if already replaced"""
+    try:
+        rows = pd.read_csv(os.path.join(_intraday_dir(), meta['file']))
+    except FileNotFoundError:
+        return None
+    rows['Date'] = pd.to_datetime(rows['Date'])
+    return rows
+
+
+def replay_bars(path, speed=0.0):
+    """Bar updates from a CSV with BAR_COLUMNS, in timestamp order (the local stand-in for a live feed).
+
+    speed=0 replays as fast as possible; otherwise gaps between bars are slept through
+    at `speed` times real time.
+    """
+    bars = pd.read_csv(path)
+    bars['timestamp'] = pd.to_datetime(bars['timestamp'])
+    bars = bars.sort_values('timestamp', kind='stable')
+    previous = None
+    for bar in bars[BAR_COLUMNS].to_dict('records'):
+        if speed > 0 and previous is not None:
+            time.sleep(max(0.0, (bar['timestamp'] - previous).total_seconds() / speed))
+        previous = bar['timestamp']
+        yield bar
+
+
+def poll_yfinance_bars(symbols, interval="1m", poll_seconds=60.0):
+    """Live bar updates: polls today's intraday bars (pre/post-market included) and yields the new ones"""
+    import yfinance as yf
+
+    seen = {}
+    while True:
+        raw = yf.download(symbols, period="1d", interval=interval, prepost=True, group_by="ticker",
+                          auto_adjust=True, progress=False, threads=True)
+        for symbol in symbols:
+            try:
+                frame = raw[symbol] if isinstance(raw.columns, pd.MultiIndex) else raw
+            except KeyError:
+                continue
+            frame = frame.dropna(subset=['Close'])
+            # The newest bar is still forming, so it is re-sent until a newer one appears
+            for timestamp, values in frame[frame.index >= seen.get(symbol, frame.index.min())].iterrows():
+                yield {'symbol': symbol, 'timestamp': timestamp, **{column: values[column] for column in BAR_COLUMNS[2:]}}
+            if len(frame):
+                seen[symbol] = frame.index.max()
+        time.sleep(poll_seconds)
+
+
+def run_intraday(bars, version=None, publish_seconds=PUBLISH_SECONDS):
+    """Consume bar updates, publishing provisional rows at most every publish_seconds; returns the ingestor"""
+    ingestor = IntradayIngestor.from_version(version)
+    print(f"📡 Intraday ingestion on top of version {ingestor.base_version} ({len(ingestor.states)} symbols)")
+    last_publish = time.monotonic()
+
+    def publish():
+        nonlocal ingestor, last_publish
+        # The batch ETL published meanwhile: keep today's sessions on top of the new version
+        latest = current_version()
+        if version is None and latest != ingestor.base_version:
+            print(f"🔄 Version {latest} published; rebasing provisional rows")
+            ingestor = ingestor.rebase(latest)
+        rows = ingestor.provisional_rows()
+        if len(rows):
+            meta = publish_provisional(rows, ingestor.base_version, ingestor.as_of)
+            print(f"✅ {meta['rows']} provisional row(s), {ingestor.bars:,} bars, as of {meta['as_of']}")
+        last_publish = time.monotonic()
+
+    for bar in bars:
+        ingestor.ingest(bar)
+        if time.monotonic() - last_publish >= publish_seconds:
+            publish()
+    publish()
+    return ingestor
@@ -0,0 +1,198 @@
+import os
+
+import numpy as np
+
+# Rolling-metric kernels: every ANALYTICS_COLUMN for a (symbol, Date)-sorted close series in
+# one call. The "numba" backend JIT-compiles one fused loop that walks each symbol once,
+# keeping a running window mean/variance and monotonic max/min deques; "numpy" is the
+# vectorized fallback (a few whole-array passes per window), used whenever numba is not installed;
+# "pandas" is the original groupby/rolling path, kept as the reference implementation.
+ROLLING_BACKEND_ENV = "BULLBOARD_ROLLING_BACKEND"
+BACKENDS = ('numba', 'numpy', 'pandas')
+ANNUALIZATION = np.sqrt(252.0)
+N_METRICS = 6
+
+
+def _fused_rolling(starts, close, vol_days, drawdown_days, out):
+    """One pass over each symbol block: out[i] = (return, volatility, yield, sharpe, drawdown, risk)"""
+    n = len(close)
+    window = np.empty(max(vol_days, 1))
+    high_rows = np.empty(max(drawdown_days, 1), dtype=np.int64)
+    low_rows = np.empty(max(drawdown_days, 1), dtype=np.int64)
+    for block in range(len(starts)):
+        start = starts[block]
+        stop = starts[block + 1] if block + 1 < len(starts) else n
+        count, mean, m2, nans, streak = 0, 0.0, 0.0, 0, 0
+        close_nans = 0
+        high_head, high_tail, low_head, low_tail = 0, 0, 0, 0
+        previous_return = np.nan
+        for i in range(start, stop):
+            k = i - start
+            value = close[i] / close[i - 1] - 1.0 if k > 0 else np.nan
+
+            # Returns window: Welford remove/add, NaNs counted instead of added
+            slot = k % vol_days
+            if k >= vol_days:
+                leaving = window[slot]
+                if np.isnan(leaving):
+                    nans -= 1
+                elif count > 1:
+                    removed_mean = (count * mean - leaving) / (count - 1)
+                    m2 -= (leaving - mean) * (leaving - removed_mean)
+                    mean = removed_mean
+                    count -= 1
+                else:
+                    count, mean, m2 = 0, 0.0, 0.0
+            if np.isnan(value):
+                nans += 1
+                streak = 0
+            else:
+                delta = value - mean
+                count += 1
+                mean += delta / count
+                m2 += delta * (value - mean)
+                streak = streak + 1 if value == previous_return else 1
+            window[slot] = value
+            previous_return = value
+
+            # Closes window: row numbers of decreasing highs / increasing lows
+            price = close[i]
+            if k >= drawdown_days and np.isnan(close[i - drawdown_days]):
+                close_nans -= 1
+            if np.isnan(price):
+                close_nans += 1
+            else:
+                while high_tail > high_head and close[high_rows[(high_tail - 1) % drawdown_days]] <= price:
+                    high_tail -= 1
+                high_rows[high_tail % drawdown_days] = i
+                high_tail += 1
+                while low_tail > low_head and close[low_rows[(low_tail - 1) % drawdown_days]] >= price:
+                    low_tail -= 1
+                low_rows[low_tail % drawdown_days] = i
+                low_tail += 1
+            while high_tail > high_head and high_rows[high_head % drawdown_days] <= i - drawdown_days:
+                high_head += 1
+            while low_tail > low_head and low_rows[low_head % drawdown_days] <= i - drawdown_days:
+                low_head += 1
+
+            volatility, rolling_yield, drawdown = np.nan, np.nan, np.nan
+            if k >= vol_days - 1 and nans == 0 and count >= 2:
+                if streak >= vol_days:
+                    # A window of one repeated value: exact, like pandas
+                    rolling_yield, volatility = value, 0.0
+                else:
+                    rolling_yield, volatility = mean, np.sqrt(max(m2, 0.0) / (count - 1))
+            if k >= drawdown_days - 1 and close_nans == 0:
+                high = close[high_rows[high_head % drawdown_days]]
+                drawdown = (high - close[low_rows[low_head % drawdown_days]]) / high
+            out[i, 0] = value
+            out[i, 1] = volatility
+            out[i, 2] = rolling_yield
+            out[i, 3] = rolling_yield / volatility * ANNUALIZATION
+            out[i, 4] = drawdown
+            out[i, 5] = volatility * 0.7 + drawdown * 0.3
+
+
+def _window_sums(values, window):
+    """Sum of each full window of values (entry j covers rows j..j+window-1), added lag by lag"""
+    total = values[window - 1:].copy()
+    for lag in range(1, window):
+        total += values[window - 1 - lag:len(values) - lag]
+    return total
+
+
+def _window_extremes(values, window, ufunc, identity):
+    """ufunc (np.maximum/np.minimum) over each full window, van Herk/Gil-Werman style: prefix and
+    suffix accumulations within fixed segments of `window` rows, so three passes whatever the width"""
+    n = len(values)
+    padded = np.full(-(-n // window) * window, identity)
+    padded[:n] = values
+    segments = padded.reshape(-1, window)
+    prefix = ufunc.accumulate(segments, axis=1).ravel()
+    suffix = ufunc.accumulate(segments[:, ::-1], axis=1)[:, ::-1].ravel()
+    return ufunc(suffix[:n - window + 1], prefix[window - 1:n])
+
+
+def _numpy_rolling(starts, close, vol_days, drawdown_days, out):
+    """Vectorized equivalent of _fused_rolling, one whole-array pass per window lag and metric"""
+    n = len(close)
+    sizes = np.diff(np.r_[starts, n])
+    pos = np.arange(n) - np.repeat(starts, sizes)
+    previous = np.r_[np.nan, close[:-1]]
+    previous[starts] = np.nan
+    out[:] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = close / previous - 1
+        out[:, 0] = returns
+        if vol_days >= 2 and n >= vol_days:
+            ready = pos[vol_days - 1:] >= vol_days
+            mean = _window_sums(returns, vol_days) / vol_days
+            squares, deviation = np.zeros(n - vol_days + 1), np.empty(n - vol_days + 1)
+            for lag in range(vol_days):
+                np.subtract(returns[vol_days - 1 - lag:n - lag], mean, out=deviation)
+                np.multiply(deviation, deviation, out=deviation)
+                squares += deviation
+            # Windows of one repeated value are exact, like pandas
+            repeats = np.cumsum(np.r_[0, returns[1:] == returns[:-1]])
+            constant = repeats[vol_days - 1:] - repeats[:n - vol_days + 1] == vol_days - 1
+            last = returns[vol_days - 1:]
+            out[vol_days - 1:, 1] = np.where(ready, np.where(constant, 0.0, np.sqrt(squares / (vol_days - 1))), np.nan)
+            out[vol_days - 1:, 2] = np.where(ready, np.where(constant, last, mean), np.nan)
+        if drawdown_days >= 1 and n >= drawdown_days:
+            ready = pos[drawdown_days - 1:] >= drawdown_days - 1
+            high = _window_extremes(close, drawdown_days, np.maximum, -np.inf)
+            low = _window_extremes(close, drawdown_days, np.minimum, np.inf)
+            out[drawdown_days - 1:, 4] = np.where(ready, (high - low) / high, np.nan)
+        out[:, 3] = out[:, 2] / out[:, 1] * ANNUALIZATION
+    out[:, 5] = out[:, 1] * 0.7 + out[:, 4] * 0.3
+
+
+_compiled = {}
+
+
+def _numba_kernel():
+    """_fused_rolling compiled by numba, or None when numba is not installed"""
+    if 'kernel' not in _compiled:
+        try:
+            import numba
+        except ImportError:
+            _compiled['kernel'] = None
+        else:
+            _compiled['kernel'] = numba.njit(cache=True, nogil=True, error_model='numpy')(_fused_rolling)
+    return _compiled['kernel']
+
+
+def available_backends():
+    return [backend for backend in BACKENDS if backend != 'numba' or _numba_kernel() is not None]
+
+
+def configured_backend():
+    """Rolling backend (BULLBOARD_ROLLING_BACKEND: numba, numpy or pandas; default: numba if installed, else numpy)"""
+    requested = os.environ.get(ROLLING_BACKEND_ENV, "").strip().lower()
+    if requested in ('numpy', 'pandas'):
+        return requested
+    if _numba_kernel() is not None:
+        return 'numba'
+    if requested == 'numba':
+        print("⚠️ numba is not installed, using the numpy rolling backend")
+    return 'numpy'
+
+
+def rolling_metrics(starts, close, rolling_vol_days=21, rolling_drawdown_days=63, backend='numpy'):
+    """(len(close), 6) float64 array of the ANALYTICS_COLUMNS for symbol blocks beginning at starts"""
+    starts = np.ascontiguousarray(starts, dtype=np.int64)
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    # Column-major: each metric is one contiguous column, as the frame columns it becomes
+    out = np.empty((len(close), N_METRICS), order='F')
+    if backend == 'numba':
+        kernel = _numba_kernel()
+        if kernel is not None:
+            try:
+                kernel(starts, close, rolling_vol_days, rolling_drawdown_days, out)
+                return out
+            except Exception as e:
+                print(f"⚠️ numba rolling kernel failed, using numpy: {e}")
+    elif backend != 'numpy':
+        raise ValueError(f"Unknown rolling backend {backend!r}; kernels are numba and numpy")
+    _numpy_rolling(starts, close, rolling_vol_days, rolling_drawdown_days, out)
+    return out
@@ -0,0 +1,394 @@
+import os
+import json
+
+import numpy as np
+import pandas as pd
+
+from datastore import data_dir
+from rolling_analytics import ANALYTICS_COLUMNS, compute_rolling_analytics, same_analytics
+
+# Persisted rolling state: per symbol, ring buffers of the last closes and daily returns plus
+# running window moments (Welford count/mean/M2), which is all the rolling analytics of the
+# next bars depend on. The ETL advances it by each run's new bars and saves it as one small
+# binary file next to the dataset, so the next run's analytics need no lookback over the
+# history. A symbol whose history no longer ends the way the state remembers (refetched after
+# a split, rows dropped by the quality checks, a new listing) is reseeded from its history.
+STATE_FILE = "rolling_state.npz"
+# Remembered and stored values are compared with this tolerance: the published CSV does not
+# read back bit-for-bit, while real revisions (ADJUSTMENT_TOLERANCE in etl.py) are far larger
+MATCH_RTOL = 1e-12
+MATCH_ATOL = 1e-12
+ARRAY_FIELDS = ('symbols', 'last_date', 'rows', 'closes', 'returns', 'count', 'mean', 'm2', 'nans', 'streak')
+
+
+def _blocks(keys):
+    """(starts, sizes, block of each row, position of each row in its block) of an array of sorted keys"""
+    n = len(keys)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if n else np.zeros(0, dtype=np.int64)
+    sizes = np.diff(np.r_[starts, n])
+    codes = np.repeat(np.arange(len(starts)), sizes)
+    return starts, sizes, codes, np.arange(n) - starts[codes]
+
+
+def _symbol_blocks(df):
+    """_blocks of a symbol-sorted frame plus each block's symbol; only the distinct names are converted"""
+    keys, names = pd.factorize(df['symbol'])
+    return _blocks(keys) + (np.asarray(names, dtype=str),)
+
+
+def _daily_returns(close, starts):
+    """Close-to-close returns within each symbol block, like pct_change(fill_method=None)"""
+    previous = np.r_[np.nan, close[:-1]]
+    previous[starts] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return close / previous - 1
+
+
+def same_values(a, b):
+    return np.isclose(a, b, rtol=MATCH_RTOL, atol=MATCH_ATOL, equal_nan=True)
+
+
+class RollingState:
+    """Rolling-window state of every symbol at the end of its history, one array row per symbol.
+
+    closes[i] holds symbol i's last rolling_drawdown_days closes and returns[i] its last
+    rolling_vol_days returns, both as ring buffers indexed by (row number % size);
+    count/mean/m2 are the running moments of the non-NaN returns in the window and nans
+    the number of NaN ones (pandas rolling yields NaN while any are in the window).
+    streak counts the identical returns ending the window: like pandas, a window of one
+    repeated value has exactly that mean and zero volatility, not float residue.
+    """
+
+    __slots__ = ('rolling_vol_days', 'rolling_drawdown_days', 'version') + ARRAY_FIELDS
+
+    def __init__(self, rolling_vol_days=21, rolling_drawdown_days=63, version=None):
+        self.rolling_vol_days = rolling_vol_days
+        self.rolling_drawdown_days = rolling_drawdown_days
+        self.version = version
+        self.symbols = np.zeros(0, dtype=str)
+        self.last_date = np.zeros(0, dtype='datetime64[D]')
+        self.rows = np.zeros(0, dtype=np.int64)
+        self.closes = np.zeros((0, rolling_drawdown_days))
+        self.returns = np.zeros((0, rolling_vol_days))
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros(0)
+        self.m2 = np.zeros(0)
+        self.nans = np.zeros(0, dtype=np.int64)
+        self.streak = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @classmethod
+    def from_history(cls, df, rolling_vol_days=21, rolling_drawdown_days=63, version=None):
+        """State at the end of df, a (symbol, Date)-sorted history; only each symbol's tail is read"""
+        state = cls(rolling_vol_days, rolling_drawdown_days, version)
+        if df.empty:
+            return state
+        starts, sizes, codes, pos, names = _symbol_blocks(df)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        returns = _daily_returns(close, starts)
+        ends = starts + sizes - 1
+        n_symbols = len(starts)
+
+        state.symbols = names
+        state.last_date = df['Date'].to_numpy().astype('datetime64[D]')[ends]
+        state.rows = sizes.astype(np.int64)
+        state.closes = np.full((n_symbols, rolling_drawdown_days), np.nan)
+        tail = pos >= sizes[codes] - rolling_drawdown_days
+        state.closes[codes[tail], pos[tail] % rolling_drawdown_days] = close[tail]
+        state.returns = np.full((n_symbols, rolling_vol_days), np.nan)
+        tail = pos >= sizes[codes] - rolling_vol_days
+        state.returns[codes[tail], pos[tail] % rolling_vol_days] = returns[tail]
+
+        # Slots not filled yet (short histories) are NaN too but are not in the window
+        filled = np.minimum(sizes, rolling_vol_days)
+        state.nans = (np.isnan(state.returns).sum(axis=1) - (rolling_vol_days - filled)).astype(np.int64)
+        state.count = (filled - state.nans).astype(np.int64)
+        state.mean = np.nansum(state.returns, axis=1) / np.maximum(state.count, 1)
+        state.m2 = np.nansum((state.returns - state.mean[:, None]) ** 2, axis=1)
+
+        # Window in row order: trailing run of equal returns (NaN and unfilled slots break it)
+        window = state.returns[np.arange(n_symbols)[:, None], (state.rows[:, None] + np.arange(rolling_vol_days)) % rolling_vol_days]
+        equal = window[:, 1:] == window[:, :-1]
+        run = np.cumprod(equal[:, ::-1], axis=1).sum(axis=1) + 1
+        state.streak = np.where(np.isnan(window[:, -1]), 0, run).astype(np.int64)
+        state._settle(np.arange(n_symbols), window[:, -1])
+        return state
+
+    def _settle(self, index, value):
+        """Exact moments for windows that hold one repeated value"""
+        constant = self.streak[index] >= self.rolling_vol_days
+        self.mean[index] = np.where(constant, value, self.mean[index])
+        self.m2[index] = np.where(constant, 0.0, self.m2[index])
+
+    def _lookup(self, symbols):
+        """(index into the state, found) for each of symbols"""
+        index = np.searchsorted(self.symbols, symbols)
+        clipped = np.minimum(index, max(len(self.symbols) - 1, 0))
+        found = (index < len(self.symbols)) & (self.symbols[clipped] == symbols) if len(self.symbols) else np.zeros(len(symbols), dtype=bool)
+        return clipped, found
+
+    def _take(self, index):
+        state = RollingState(self.rolling_vol_days, self.rolling_drawdown_days, self.version)
+        for field in ARRAY_FIELDS:
+            setattr(state, field, getattr(self, field)[index])
+        return state
+
+    def _combine(self, other):
+        """This state and other's symbols (disjoint) in one symbol-sorted state"""
+        order = np.argsort(np.r_[self.symbols, other.symbols], kind='stable')
+        for field in ARRAY_FIELDS:
+            setattr(self, field, np.concatenate([getattr(self, field), getattr(other, field)])[order])
+
+    def _analytics(self, index):
+        """ANALYTICS_COLUMNS of the latest row of the symbols at index, from the state alone"""
+        vol_days, drawdown_days = self.rolling_vol_days, self.rolling_drawdown_days
+        rows, count = self.rows[index], self.count[index]
+        daily_return = np.where(rows > 0, self.returns[index, (rows - 1) % vol_days], np.nan)
+        ready = (rows >= vol_days) & (self.nans[index] == 0) & (count >= 2)
+        rolling_yield = np.where(ready, self.mean[index], np.nan)
+        volatility = np.where(ready, np.sqrt(np.maximum(self.m2[index], 0.0) / np.maximum(count - 1, 1)), np.nan)
+        window = self.closes[index]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = (rolling_yield / volatility) * np.sqrt(252)
+            high, low = window.max(axis=1), window.min(axis=1)
+            drawdown = np.where(rows >= drawdown_days, (high - low) / high, np.nan)
+        risk = volatility * 0.7 + drawdown * 0.3
+        return np.column_stack([daily_return, volatility, rolling_yield, sharpe, drawdown, risk])
+
+    def _push(self, index, close):
+        """Append one bar to each of the (distinct) symbols at index, in O(1) per symbol"""
+        vol_days, drawdown_days = self.rolling_vol_days, self.rolling_drawdown_days
+        rows = self.rows[index]
+        slot = rows % vol_days
+        previous = np.where(rows > 0, self.closes[index, (rows - 1) % drawdown_days], np.nan)
+        previous_return = np.where(rows > 0, self.returns[index, (rows - 1) % vol_days], np.nan)
+        count, mean, m2 = self.count[index], self.mean[index], self.m2[index]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            value = close / previous - 1
+
+            # The return leaving the window
+            leaving = self.returns[index, slot]
+            full = rows >= vol_days
+            remove = full & ~np.isnan(leaving)
+            remaining = np.maximum(count - 1, 0)
+            removed_mean = np.where(remaining > 0, (count * mean - leaving) / np.maximum(remaining, 1), 0.0)
+            removed_m2 = np.where(remaining > 0, m2 - (leaving - mean) * (leaving - removed_mean), 0.0)
+            count = np.where(remove, remaining, count)
+            mean = np.where(remove, removed_mean, mean)
+            m2 = np.where(remove, removed_m2, m2)
+            nans = self.nans[index] - (full & np.isnan(leaving))
+
+            # The new one
+            add = ~np.isnan(value)
+            delta = value - mean
+            added_mean = mean + delta / (count + 1)
+            self.m2[index] = np.where(add, m2 + delta * (value - added_mean), m2)
+            self.mean[index] = np.where(add, added_mean, mean)
+            self.count[index] = np.where(add, count + 1, count)
+            self.nans[index] = nans + ~add
+            self.streak[index] = np.where(add, np.where(value == previous_return, self.streak[index] + 1, 1), 0)
+        self._settle(index, value)
+
+        self.returns[index, slot] = value
+        self.closes[index, rows % drawdown_days] = close
+        self.rows[index] = rows + 1
+
+    def advance(self, symbols, dates, closes):
+        """Append new bars ((symbol, date)-sorted, all after their symbol's last date); returns their analytics"""
+        index, found = self._lookup(symbols)
+        if not found.all():
+            raise ValueError(f"No rolling state for {sorted(set(symbols[~found]))[:5]}")
+        if (dates <= self.last_date[index]).any():
+            raise ValueError("Bars must come after the state's last date")
+        values = np.empty((len(index), len(ANALYTICS_COLUMNS)))
+        steps = _blocks(symbols)[3]
+        # One vectorized step per bar depth: every symbol's first new bar, then its second, ...
+        for step in range(int(steps.max()) + 1 if len(steps) else 0):
+            selected = np.flatnonzero(steps == step)
+            at = index[selected]
+            self._push(at, closes[selected])
+            self.last_date[at] = dates[selected]
+            values[selected] = self._analytics(at)
+        return values
+
+    def _continuable(self, df):
+        """Per-row arrays of df (a (symbol, Date)-sorted history) and, per symbol block, whether
+        its rows up to the state's last date end with exactly the closes and returns held here"""
+        vol_days, drawdown_days = self.rolling_vol_days, self.rolling_drawdown_days
+        dates = df['Date'].to_numpy().astype('datetime64[D]')
+        close = df['Close'].to_numpy(dtype=np.float64)
+        starts, sizes, codes, pos, names = _symbol_blocks(df)
+        if not len(self):
+            return names, dates, close, codes, np.zeros(len(df), dtype=bool), np.zeros(len(starts), dtype=bool), np.zeros(len(starts), dtype=np.int64)
+        index, known = self._lookup(names)
+
+        # Rows at or before the state's last date form a prefix of each symbol's block
+        row_index = index[codes]
+        stored_row = known[codes] & (dates <= self.last_date[row_index])
+        stored = np.bincount(codes, weights=stored_row, minlength=len(starts)).astype(np.int64)
+        rows = self.rows[index]
+        matched = known & (stored > 0)
+        matched &= dates[starts + np.maximum(stored - 1, 0)] == self.last_date[index]
+        matched &= np.minimum(stored, drawdown_days) == np.minimum(rows, drawdown_days)
+        matched &= np.minimum(stored, vol_days) == np.minimum(rows, vol_days)
+
+        back = stored[codes] - 1 - pos
+        remembered = rows[codes] - 1 - back
+        returns = _daily_returns(close, starts)
+        differs = np.zeros(len(df), dtype=bool)
+        tail = stored_row & (back < drawdown_days)
+        differs[tail] = ~same_values(close[tail], self.closes[row_index[tail], remembered[tail] % drawdown_days])
+        tail = stored_row & (back < vol_days)
+        differs[tail] |= ~same_values(returns[tail], self.returns[row_index[tail], remembered[tail] % vol_days])
+        matched &= np.bincount(codes, weights=differs, minlength=len(starts)) == 0
+        return names, dates, close, codes, stored_row, matched, index
+
+    def extend(self, df):
+        """Bring the state to the end of df, a (symbol, Date)-sorted history with unique keys.
+
+        Symbols whose rows up to the state's last date still end with the remembered
+        closes and returns are advanced by their later rows; the others (new, refetched,
+        or with rows dropped) are reseeded from df, and symbols missing from df dropped.
+        Returns (positions in df of the advanced rows, their ANALYTICS_COLUMNS values,
+        reseeded symbols).
+        """
+        names, dates, close, codes, stored_row, matched, index = self._continuable(df)
+        reseed = ~matched[codes]
+        fresh = RollingState.from_history(df[reseed], self.rolling_vol_days, self.rolling_drawdown_days)
+        kept = self._take(index[matched])
+        kept._combine(fresh)
+        for field in ARRAY_FIELDS:
+            setattr(self, field, getattr(kept, field))
+
+        positions = np.flatnonzero(~reseed & ~stored_row)
+        values = self.advance(names[codes[positions]], dates[positions], close[positions])
+        return positions, values, sorted(fresh.symbols.tolist())
+
+    def resync(self, df):
+        """Match a state just extended to a history with df, that history minus some rows (the
+        quality checks): symbols whose row count or last date changed are reseeded from df and
+        symbols missing from df dropped. Returns the reseeded symbols."""
+        starts, sizes, _, _, names = _symbol_blocks(df)
+        index, known = self._lookup(names)
+        last_dates = df['Date'].to_numpy().astype('datetime64[D]')[starts + sizes - 1]
+        kept = known & (self.rows[index] == sizes) & (self.last_date[index] == last_dates)
+        fresh = RollingState.from_history(df[np.repeat(~kept, sizes)], self.rolling_vol_days, self.rolling_drawdown_days)
+        state = self._take(index[kept])
+        state._combine(fresh)
+        for field in ARRAY_FIELDS:
+            setattr(self, field, getattr(state, field))
+        return sorted(fresh.symbols.tolist())
+
+    def current(self):
+        """(symbol, Date, ANALYTICS_COLUMNS) of every symbol's latest row, from the state alone"""
+        df = pd.DataFrame({'symbol': self.symbols, 'Date': self.last_date.astype('datetime64[ns]')})
+        values = self._analytics(np.arange(len(self)))
+        for i, column in enumerate(ANALYTICS_COLUMNS):
+            df[column] = values[:, i]
+        return df
+
+    def arrays(self):
+        """The state as a dict of plain arrays, as saved; e.g. to hand it from one pipeline stage to another"""
+        meta = {'version': self.version, 'rolling_vol_days': self.rolling_vol_days, 'rolling_drawdown_days': self.rolling_drawdown_days}
+        return {'meta': np.array(json.dumps(meta)), **{field: getattr(self, field) for field in ARRAY_FIELDS}}
+
+    @classmethod
+    def from_arrays(cls, data):
+        meta = json.loads(str(data['meta']))
+        state = cls(meta['rolling_vol_days'], meta['rolling_drawdown_days'], meta['version'])
+        for field in ARRAY_FIELDS:
+            setattr(state, field, data[field])
+        return state
+
+    def save(self, path):
+        """Write the state as one uncompressed .npz (no pickles), replacing path atomically"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **self.arrays())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_arrays(data)
+
+
+def state_path():
+    return os.path.join(data_dir(), STATE_FILE)
+
+
+def load_state(rolling_vol_days=21, rolling_drawdown_days=63):
+    """The saved rolling state, or None when there is none for these window sizes.
+
+    It need not belong to the version being extended: extend() only continues symbols
+    whose histories still end the way the state remembers.
+    """
+    try:
+        state = RollingState.load(state_path())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️ Unreadable rolling state, ignoring it: {e}")
+        return None
+    if (state.rolling_vol_days, state.rolling_drawdown_days) != (rolling_vol_days, rolling_drawdown_days):
+        return None
+    return state
+
+
+def update_state(df, version, rolling_vol_days=21, rolling_drawdown_days=63, state=None):
+    """Save the rolling state at the end of a published dataset, for that version.
+
+    state is the one the run's analytics already extended (to df before its quality
+    checks): only the symbols those checks changed are reseeded. Without it, the saved
+    state is advanced to the end of df (advanced_rows in the report).
+    """
+    advanced_rows = None
+    if state is not None:
+        reseeded = state.resync(df)
+    else:
+        state = load_state(rolling_vol_days, rolling_drawdown_days) or RollingState(rolling_vol_days, rolling_drawdown_days)
+        positions, _, reseeded = state.extend(df)
+        advanced_rows = len(positions)
+    state.version = version
+    os.makedirs(data_dir(), exist_ok=True)
+    state.save(state_path())
+    return {'symbols': len(state), 'advanced_rows': advanced_rows, 'reseeded': len(reseeded), 'bytes': os.path.getsize(state_path())}
+
+
+def check_state(state, df, rtol=1e-9):
+    """Problems found comparing the state with a full recompute of df's analytics; empty when consistent"""
+    problems = []
+    expected = compute_rolling_analytics(
+        df[['symbol', 'Date', 'Close']].sort_values(['symbol', 'Date']).reset_index(drop=True),
+        state.rolling_vol_days, state.rolling_drawdown_days,
+    ).groupby('symbol').tail(1)
+    actual = state.current()
+    missing = sorted(set(expected['symbol']) - set(actual['symbol']))
+    extra = sorted(set(actual['symbol']) - set(expected['symbol']))
+    if missing:
+        problems.append(f"{len(missing)} symbol(s) missing from the state, e.g. {missing[:5]}")
+    if extra:
+        problems.append(f"{len(extra)} symbol(s) in the state but not in the history, e.g. {extra[:5]}")
+
+    names, _, _, _, _, matched, _ = state._continuable(df.sort_values(['symbol', 'Date']))
+    broken = names[np.isin(names, state.symbols) & ~matched]
+    if len(broken):
+        problems.append(f"{len(broken)} symbol(s) whose buffered closes or returns differ from the history, e.g. {broken.tolist()[:5]}")
+
+    both = expected.merge(actual, on='symbol', suffixes=('', '_state'))
+    stale = both['symbol'][both['Date'] != both['Date_state']]
+    if len(stale):
+        problems.append(f"{len(stale)} symbol(s) whose state ends on another date, e.g. {stale.tolist()[:5]}")
+    wanted = both[ANALYTICS_COLUMNS].to_numpy(dtype=np.float64)
+    got = both[[f"{column}_state" for column in ANALYTICS_COLUMNS]].to_numpy(dtype=np.float64)
+    same = same_analytics(got, wanted, rtol=rtol)
+    for i, column in enumerate(ANALYTICS_COLUMNS):
+        wrong = ~same[:, i]
+        if wrong.any():
+            diff = got[wrong, i] - wanted[wrong, i]
+            worst = np.nanmax(np.abs(diff)) if (~np.isnan(diff)).any() else np.nan
+            problems.append(f"{column}: {int(wrong.sum())} symbol(s) differ from a full recompute "
+                            f"(max abs diff {worst:.3g}), e.g. {both['symbol'][wrong].tolist()[:5]}")
+    return problems
@@ -0,0 +1,177 @@
+import bisect
+import math
+import re
+import unicodedata
+from collections import defaultdict
+
+# Ranking tiers; fuzzy matches are scaled by trigram similarity below FUZZY_SCORE
+EXACT_TICKER_SCORE = 100
+TICKER_PREFIX_SCORE = 80
+EXACT_TOKEN_SCORE = 70
+TOKEN_PREFIX_SCORE = 60
+SUBSTRING_SCORE = 40
+FUZZY_SCORE = 30
+MIN_FUZZY_SIMILARITY = 0.3
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    """Casefold, strip accents and collapse punctuation to single spaces"""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def tokenize(text):
+    return normalize(text).split()
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance_at_most_one(a, b):
+    """True if a and b differ by at most one insertion, deletion, substitution or swap"""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diffs = [i for i in range(la) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return len(diffs) == 2 and diffs[1] == diffs[0] + 1 and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]]
+    if la > lb:
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+class SymbolSearchIndex:
+    """Ticker and company-name search with prefix lookup and typo-tolerant ranking.
+
+    Every ticker and name token is kept in a sorted list so a prefix query is a
+    bisect range scan, and a trigram inverted index supplies candidates for
+    substring and misspelled queries. Build once, then query per keystroke.
+    """
+
+    def __init__(self, entries):
+        self.symbols = []
+        self.names = []
+        self._norm_symbols = []
+        self._norm_names = []
+        token_postings = defaultdict(set)
+        self._trigram_postings = defaultdict(set)
+
+        for entry_id, (symbol, name) in enumerate(entries):
+            self.symbols.append(symbol)
+            self.names.append(name)
+            norm_symbol = normalize(symbol).replace(" ", "")
+            norm_name = normalize(name)
+            self._norm_symbols.append(norm_symbol)
+            self._norm_names.append(norm_name)
+            for token in {norm_symbol, *norm_name.split()}:
+                if not token:
+                    continue
+                token_postings[token].add(entry_id)
+                for gram in trigrams(token):
+                    self._trigram_postings[gram].add(entry_id)
+
+        self._tokens = sorted(token_postings)
+        self._token_postings = [frozenset(token_postings[token]) for token in self._tokens]
+        self._token_trigrams = {}
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _prefix_matches(self, prefix):
+        lo = bisect.bisect_left(self._tokens, prefix)
+        hi = bisect.bisect_left(self._tokens, prefix + "\uffff")
+        for i in range(lo, hi):
+            yield self._tokens[i], self._token_postings[i]
+
+    def _score_term(self, term, single_term=False, limit=None):
+        """Best score per entry for one normalized query term"""
+        scores = {}
+
+        def offer(entry_id, score):
+            if score > scores.get(entry_id, 0):
+                scores[entry_id] = score
+
+        for token, postings in self._prefix_matches(term):
+            exact = token == term
+            for entry_id in postings:
+                if self._norm_symbols[entry_id] == token:
+                    offer(entry_id, EXACT_TICKER_SCORE if exact else TICKER_PREFIX_SCORE)
+                else:
+                    offer(entry_id, EXACT_TOKEN_SCORE if exact else TOKEN_PREFIX_SCORE)
+
+        # Prefix hits always outrank substring/fuzzy hits, so a single-term query with
+        # enough of them never needs the (slower) trigram pass
+        if single_term and limit is not None and len(scores) >= limit:
+            return scores
+
+        term_grams = trigrams(term)
+        # Leading "  x" grams are shared by a large share of tokens; they still count
+        # towards similarity but are too unselective to generate candidates
+        selective_grams = [gram for gram in term_grams if not gram.startswith("  ")] or list(term_grams)
+        min_shared = max(1, math.ceil(MIN_FUZZY_SIMILARITY * len(selective_grams)))
+        postings = sorted((self._trigram_postings.get(gram, frozenset()) for gram in selective_grams), key=len)
+        # Pigeonhole: an entry sharing min_shared grams must appear in one of the rarest
+        # len - min_shared + 1 posting lists, so only those generate candidates
+        candidates = set().union(*postings[:len(postings) - min_shared + 1])
+
+        for entry_id in candidates:
+            if scores.get(entry_id, 0) >= SUBSTRING_SCORE:
+                continue
+            if sum(entry_id in posting for posting in postings) < min_shared:
+                continue
+            if len(term) >= 3 and (term in self._norm_symbols[entry_id] or term in self._norm_names[entry_id]):
+                offer(entry_id, SUBSTRING_SCORE)
+                continue
+            best = self._fuzzy_similarity(term, term_grams, entry_id)
+            if best >= MIN_FUZZY_SIMILARITY:
+                offer(entry_id, FUZZY_SCORE * best)
+        return scores
+
+    def _fuzzy_similarity(self, term, term_grams, entry_id):
+        best = 0.0
+        for token in {self._norm_symbols[entry_id], *self._norm_names[entry_id].split()}:
+            if _edit_distance_at_most_one(term, token) and len(term) >= 3:
+                return 1.0
+            grams = self._token_trigrams.get(token)
+            if grams is None:
+                grams = self._token_trigrams[token] = trigrams(token)
+            similarity = len(term_grams & grams) / len(term_grams | grams)
+            best = max(best, similarity)
+        return best
+
+    def search(self, query, limit=10):
+        """Ranked (symbol, company name, score) matches; every query term must match"""
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        combined = None
+        for term in terms:
+            term_scores = self._score_term(term, single_term=len(terms) == 1, limit=limit)
+            if combined is None:
+                combined = term_scores
+            else:
+                combined = {
+                    entry_id: combined[entry_id] + score
+                    for entry_id, score in term_scores.items()
+                    if entry_id in combined
+                }
+            if not combined:
+                return []
+
+        ranked = sorted(combined.items(), key=lambda item: (-item[1], self.symbols[item[0]]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(self.symbols[i], self.names[i], round(score, 1)) for i, score in ranked]
@@ -0,0 +1,516 @@
+import re
+
+# Stylesheets for the app. They are combined and minified once per process; the app
+# emits the result in a single <style> element per script run.
+
+BASE_CSS = """
+    /* Import Google Fonts */
+    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
+    
+    /* Global Styles */
+    .main > div {
+        padding-top: 2rem;
+    }
+    
+    h1, h2, h3 {
+        font-family: 'Inter', sans-serif;
+        font-weight: 600;
+    }
+    
+    /* Enhanced Header Styling */
+   .main-header {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 50%, #f093fb 100%);
+    padding: 2.5rem 2rem;
+    border-radius: 20px;
+    color: white;
+    margin-bottom: 2rem;
+    box-shadow: 0 12px 40px rgba(102, 126, 234, 0.3);
+    position: relative;
+    overflow: hidden;
+}
+
+.main-header::before {
+    content: '';
+    position: absolute;
+    top: 0;
+    left: 0;
+    right: 0;
+    bottom: 0;
+    background: url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100"><defs><pattern id="grain" width="100" height="100" patternUnits="userSpaceOnUse"><circle cx="25" cy="25" r="1" fill="white" opacity="0.1"/><circle cx="75" cy="75" r="1" fill="white" opacity="0.1"/><circle cx="50" cy="10" r="0.5" fill="white" opacity="0.1"/><circle cx="20" cy="80" r="0.5" fill="white" opacity="0.1"/></pattern></defs><rect width="100" height="100" fill="url(%23grain)"/></svg>');
+    pointer-events: none;
+}
+
+.header-content {
+    display: flex;
+    justify-content: space-between;
+    align-items: center;
+    flex-wrap: wrap;
+    position: relative;
+    z-index: 1;
+}
+
+.logo-section {
+    display: flex;
+    align-items: center;
+    gap: 1rem;
+}
+
+.logo-icon {
+    font-size: 3.5rem;
+    filter: drop-shadow(2px 2px 4px rgba(0,0,0,0.3));
+}
+
+.logo-text h1 {
+    margin: 0;
+    font-size: 3rem;
+    font-weight: 800;
+    background: linear-gradient(45deg, #ffffff, #f8f9ff);
+    -webkit-background-clip: text;
+    -webkit-text-fill-color: transparent;
+    background-clip: text;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
+}
+
+.tagline {
+    font-size: 1.2rem;
+    font-weight: 500;
+    opacity: 0.95;
+    margin-top: 0.25rem;
+}
+
+.value-props {
+    display: flex;
+    gap: 2rem;
+    flex-wrap: wrap;
+}
+
+.prop-item {
+    display: flex;
+    flex-direction: column;
+    align-items: center;
+    gap: 0.5rem;
+    padding: 1rem;
+    background: rgba(255, 255, 255, 0.15);
+    border-radius: 12px;
+    backdrop-filter: blur(10px);
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    transition: transform 0.3s ease;
+}
+
+.prop-item:hover {
+    transform: translateY(-3px);
+    background: rgba(255, 255, 255, 0.2);
+}
+
+.prop-icon {
+    font-size: 1.8rem;
+}
+
+.prop-text {
+    font-size: 0.9rem;
+    font-weight: 600;
+    text-align: center;
+    white-space: nowrap;
+}
+
+.header-subtitle {
+    text-align: center;
+    margin-top: 1.5rem;
+    font-size: 1rem;
+    opacity: 0.9;
+    font-weight: 400;
+    position: relative;
+    z-index: 1;
+}
+
+/* Responsive adjustments */
+@media (max-width: 768px) {
+    .header-content {
+        flex-direction: column;
+        gap: 1.5rem;
+        text-align: center;
+    }
+    
+    .value-props {
+        justify-content: center;
+        gap: 1rem;
+    }
+    
+    .logo-text h1 {
+        font-size: 2.5rem;
+    }
+    
+    .tagline {
+        font-size: 1rem;
+    }
+}
+    
+/* Metric Cards - Fixed height and text positioning */
+.metric-card {
+    background: linear-gradient(145deg, #ffffff 0%, #f8fafc 50%, #ffffff 100%);
+    border: 1px solid #e2e8f0;
+    border-radius: 20px;
+    padding: 20px;
+    box-shadow: 
+        0 4px 6px -1px rgba(0, 0, 0, 0.1),
+        0 2px 4px -1px rgba(0, 0, 0, 0.06),
+        inset 0 1px 0 rgba(255, 255, 255, 0.6);
+    height: 160px; /* Increased from 140px */
+    display: flex;
+    flex-direction: column;
+    justify-content: space-between;
+    margin: 8px 0;
+    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+    position: relative;
+    overflow: hidden;
+}
+
+.metric-card:hover {
+    transform: translateY(-4px) scale(1.02);
+    box-shadow: 
+        0 12px 25px rgba(102, 126, 234, 0.15),
+        0 8px 10px rgba(0, 0, 0, 0.1),
+        inset 0 1px 0 rgba(255, 255, 255, 0.6);
+    border-color: rgba(102, 126, 234, 0.3);
+}
+
+.metric-card::before {
+    content: '';
+    position: absolute;
+    top: 0;
+    left: 0;
+    width: 5px;
+    height: 100%;
+    background: linear-gradient(180deg, #667eea 0%, #764ba2 100%);
+    border-radius: 0 2px 2px 0;
+}
+
+.metric-card::after {
+    content: '';
+    position: absolute;
+    top: -50%;
+    right: -50%;
+    width: 100px;
+    height: 100px;
+    background: radial-gradient(circle, rgba(102, 126, 234, 0.05) 0%, transparent 70%);
+    border-radius: 50%;
+}
+
+.metric-header {
+    display: flex;
+    align-items: center;
+    margin-bottom: 12px;
+    position: relative;
+    z-index: 1;
+}
+
+.metric-icon {
+    font-size: 18px;
+    margin-right: 10px;
+    filter: drop-shadow(0 1px 2px rgba(0, 0, 0, 0.1));
+}
+
+.metric-title {
+    font-size: 11px !important;
+    font-weight: 700 !important;
+    color: #64748b !important;
+    text-transform: uppercase !important;
+    letter-spacing: 0.8px !important;
+    line-height: 1.2 !important;
+}
+
+.metric-value {
+    font-size: 28px !important; /* Slightly smaller to make room */
+    font-weight: 800 !important;
+    color: #1e293b !important;
+    margin: 8px 0 12px 0 !important; /* Added bottom margin */
+    line-height: 1.1 !important;
+    position: relative;
+    z-index: 1;
+    text-shadow: 0 1px 2px rgba(0, 0, 0, 0.05);
+}
+
+.metric-subtitle {
+    font-size: 13px !important; /* Slightly smaller but still readable */
+    color: #667eea !important;
+    font-weight: 600 !important;
+    position: relative;
+    z-index: 1;
+    text-transform: capitalize;
+    line-height: 1.2 !important;
+    margin-bottom: 4px !important; /* Add bottom margin */
+    display: block !important; /* Ensure it displays properly */
+}
+
+/* Section Headers - Keep existing styles */
+.section-header {
+    display: flex;
+    align-items: center;
+    margin: 2rem 0 1.5rem 0;
+    padding-bottom: 0.75rem;
+    border-bottom: 2px solid #e2e8f0;
+}
+
+.section-icon {
+    font-size: 1.5rem;
+    margin-right: 0.75rem;
+}
+
+.section-header h2 {
+    margin: 0 !important;
+    color: #ffffff !important;
+    font-weight: 600 !important;
+    font-size: 1.5rem !important;
+}
+
+/* Fix for dark theme text visibility */
+h1, h2, h3, h4, h5, h6 {
+    color: #ffffff !important;
+}
+
+.main .block-container {
+    color: #ffffff;
+}
+
+/* Additional refinements */
+.element-container {
+    margin-bottom: 0 !important;
+}
+
+/* Responsive adjustments for cards */
+@media (max-width: 768px) {
+    .metric-card {
+        height: 120px;
+        padding: 16px;
+    }
+    
+    .metric-value {
+        font-size: 24px !important;
+    }
+    
+    .metric-title {
+        font-size: 10px !important;
+    }
+}
+
+/* Section Headers - Fixed colors */
+.section-header {
+    display: flex;
+    align-items: center;
+    margin: 2rem 0 1.5rem 0;
+    padding-bottom: 0.75rem;
+    border-bottom: 2px solid #e2e8f0;
+}
+
+.section-icon {
+    font-size: 1.5rem;
+    margin-right: 0.75rem;
+}
+
+.section-header h2 {
+    margin: 0 !important;
+    color: #ffffff !important;
+    font-weight: 600 !important;
+    font-size: 1.5rem !important;
+}
+
+/* Fix for dark theme text visibility */
+h1, h2, h3, h4, h5, h6 {
+    color: #ffffff !important;
+}
+
+.main .block-container {
+    color: #ffffff;
+}
+    
+    /* Status Cards */
+    .status-card {
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+        border-left: 4px solid;
+    }
+    
+    .status-success {
+        background: #d5f4e6;
+        border-color: #2ecc71;
+        color: #27ae60;
+    }
+    
+    .status-warning {
+        background: #fef9e7;
+        border-color: #f39c12;
+        color: #e67e22;
+    }
+    
+    .status-info {
+        background: #ebf3fd;
+        border-color: #3498db;
+        color: #2980b9;
+    }
+    
+    /* AI Insight Cards */
+    .ai-insight {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        padding: 1rem;
+        border-radius: 8px;
+        margin: 0.5rem 0;
+        border-left: 4px solid #ffd700;
+    }
+    
+    /* Section Headers */
+    .section-header {
+        display: flex;
+        align-items: center;
+        margin: 2rem 0 1rem 0;
+        padding-bottom: 0.5rem;
+        border-bottom: 2px solid #ecf0f1;
+    }
+    
+    .section-icon {
+        font-size: 1.5rem;
+        margin-right: 0.5rem;
+    }
+    
+    /* Hide Streamlit Branding */
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+"""
+
+# Ultra-Sleek Financial Theme with Animated Starfield
+THEME_CSS = """
+.stApp {
+    background: 
+        radial-gradient(2px 2px at 20px 30px, rgba(255,255,255,0.15), transparent),
+        radial-gradient(2px 2px at 40px 70px, rgba(255,255,255,0.1), transparent),
+        radial-gradient(1px 1px at 90px 40px, rgba(255,255,255,0.1), transparent),
+        radial-gradient(1px 1px at 130px 80px, rgba(255,255,255,0.1), transparent),
+        radial-gradient(2px 2px at 160px 30px, rgba(255,255,255,0.1), transparent),
+        linear-gradient(135deg, #0c0c0c 0%, #1a1a2e 15%, #16213e 35%, #0f3460 55%, #533483 75%, #7b2d26 95%, #2c1810 100%) !important;
+    background-size: 
+        200px 100px,
+        300px 120px,
+        150px 200px,
+        250px 150px,
+        180px 90px,
+        100% 100% !important;
+    background-attachment: fixed !important;
+    animation: starfieldMove 25s linear infinite, gradientPulse 15s ease-in-out infinite !important;
+}
+
+@keyframes starfieldMove {
+    0% {
+        background-position: 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0% 50%;
+    }
+    100% {
+        background-position: 200px 100px, -300px 120px, 150px -200px, -250px 150px, 180px -90px, 100% 50%;
+    }
+}
+
+@keyframes gradientPulse {
+    0%, 100% {
+        background-position: 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0px 0px, 0% 50%;
+    }
+    50% {
+        background-position: 100px 50px, 150px 60px, 75px 100px, 125px 75px, 90px 45px, 100% 50%;
+    }
+}
+
+/* Enhanced text with subtle glow */
+.stMarkdown, .stText, p, span {
+    color: #f8f9fa !important;
+    text-shadow: 0 0 10px rgba(248, 249, 250, 0.1) !important;
+}
+
+h1, h2, h3, h4, h5, h6 {
+    color: #ffffff !important;
+    text-shadow: 0 0 15px rgba(255, 255, 255, 0.2) !important;
+}
+
+/* Premium button styling with enhanced gradient */
+.stButton > button {
+    background: linear-gradient(45deg, 
+        rgba(123, 45, 38, 0.9) 0%, 
+        rgba(83, 52, 131, 0.9) 25%, 
+        rgba(15, 52, 96, 0.9) 50%, 
+        rgba(83, 52, 131, 0.9) 75%, 
+        rgba(123, 45, 38, 0.9) 100%) !important;
+    background-size: 200% 200% !important;
+    color: white !important;
+    border: 1px solid rgba(255, 255, 255, 0.3) !important;
+    border-radius: 10px !important;
+    font-weight: bold !important;
+    box-shadow: 
+        0 4px 15px rgba(0, 0, 0, 0.3),
+        inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
+    transition: all 0.4s ease !important;
+    animation: buttonShimmer 3s ease-in-out infinite !important;
+}
+
+@keyframes buttonShimmer {
+    0%, 100% {
+        background-position: 0% 50%;
+    }
+    50% {
+        background-position: 100% 50%;
+    }
+}
+
+.stButton > button:hover {
+    background-position: 100% 50% !important;
+    transform: translateY(-2px) scale(1.02) !important;
+    box-shadow: 
+        0 8px 25px rgba(123, 45, 38, 0.4),
+        0 4px 15px rgba(83, 52, 131, 0.3),
+        inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
+    border-color: rgba(255, 255, 255, 0.5) !important;
+}
+
+/* Sleek input styling with glow effects */
+.stSelectbox > div > div,
+.stTextInput > div > div > input {
+    background: rgba(255, 255, 255, 0.08) !important;
+    border: 1px solid rgba(255, 255, 255, 0.15) !important;
+    border-radius: 10px !important;
+    color: #f8f9fa !important;
+    backdrop-filter: blur(10px) !important;
+    box-shadow: 
+        inset 0 1px 3px rgba(0, 0, 0, 0.2),
+        0 1px 3px rgba(255, 255, 255, 0.1) !important;
+    transition: all 0.3s ease !important;
+}
+
+.stSelectbox > div > div:focus,
+.stTextInput > div > div > input:focus {
+    border-color: rgba(123, 45, 38, 0.7) !important;
+    box-shadow: 
+        0 0 0 3px rgba(123, 45, 38, 0.15),
+        inset 0 1px 3px rgba(0, 0, 0, 0.2),
+        0 1px 8px rgba(123, 45, 38, 0.3) !important;
+    background: rgba(255, 255, 255, 0.12) !important;
+}
+
+/* Enhanced metric containers */
+div[data-testid="metric-container"] {
+    background: rgba(255, 255, 255, 0.05) !important;
+    border: 1px solid rgba(255, 255, 255, 0.1) !important;
+    border-radius: 12px !important;
+    backdrop-filter: blur(15px) !important;
+    box-shadow: 
+        0 8px 32px rgba(0, 0, 0, 0.3),
+        inset 0 1px 0 rgba(255, 255, 255, 0.1) !important;
+}
+"""
+
+
+def minify_css(css):
+    """Drop comments and collapse whitespace"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return css.strip()
+
+
+APP_STYLE_TAG = f"<style>{minify_css(BASE_CSS + THEME_CSS)}</style>"
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+from rolling_analytics import ANALYTICS_COLUMNS, _pandas_rolling_analytics, same_analytics
+from rolling_state import RollingState, check_state
+
+VOL_DAYS, DRAWDOWN_DAYS = 21, 63
+
+
+def _history(n_symbols=20, n_days=300, seed=11):
+    """(symbol, Date)-sorted closes with flat stretches (some longer than both windows) and NaN gaps"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=n_days)
+    frames = []
+    for i in range(n_symbols):
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.01, n_days))
+        for _ in range(rng.integers(1, 4)):
+            start = rng.integers(0, n_days - 10)
+            close[start:start + rng.integers(5, 150)] = close[start]
+        if i % 5 == 0:
+            close[rng.integers(0, n_days, 3)] = np.nan
+        frames.append(pd.DataFrame({'symbol': f"S{i:02d}", 'Date': dates, 'Close': close}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _expected(df):
+    return _pandas_rolling_analytics(df.copy(), VOL_DAYS, DRAWDOWN_DAYS)[ANALYTICS_COLUMNS].to_numpy()
+
+
+def _assert_matches(values, expected):
+    same = same_analytics(values, expected)
+    mismatched = {ANALYTICS_COLUMNS[j]: np.flatnonzero(~same[:, j]).tolist() for j in range(same.shape[1]) if not same[:, j].all()}
+    assert not mismatched, f"rows differing from pandas: {mismatched}"
+
+
+def test_extend_matches_pandas_after_flat_stretches():
+    # Regression: after a long flat stretch pandas leaves ~1e-10 of volatility where the state gives 0
+    df = _history()
+    expected = _expected(df)
+    for cut in (30, 100, 200, 290):
+        state = RollingState.from_history(df[df['Date'] < df['Date'].unique()[cut]], VOL_DAYS, DRAWDOWN_DAYS)
+        positions, values, reseeded = state.extend(df)
+        assert reseeded == []
+        assert len(positions) == (len(df['Date'].unique()) - cut) * df['symbol'].nunique()
+        _assert_matches(values, expected[positions])
+    assert check_state(state, df) == []
+
+
+def test_extend_reseeds_changed_and_new_symbols():
+    df = _history(n_symbols=6)
+    old = df[df['Date'] < df['Date'].unique()[250]]
+    state = RollingState.from_history(old[old['symbol'] != 'S05'], VOL_DAYS, DRAWDOWN_DAYS)
+    revised = df.copy()
+    revised.loc[revised['symbol'] == 'S01', 'Close'] *= 0.5  # e.g. refetched after a split
+    positions, values, reseeded = state.extend(revised)
+    assert reseeded == ['S01', 'S05']
+    assert not revised['symbol'].iloc[positions].isin(reseeded).any()
+    _assert_matches(values, _expected(revised)[positions])
+    assert check_state(state, revised) == []
+
+
+def test_resync_reseeds_symbols_that_lost_rows():
+    df = _history(n_symbols=6)
+    state = RollingState.from_history(df[df['Date'] < df['Date'].unique()[250]], VOL_DAYS, DRAWDOWN_DAYS)
+    state.extend(df)
+    # As if the quality checks dropped a row of S02 and all of S03
+    kept = df[~((df['symbol'] == 'S02') & (df['Date'] == df['Date'].unique()[260])) & (df['symbol'] != 'S03')]
+    assert state.resync(kept) == ['S02']
+    assert state.symbols.tolist() == ['S00', 'S01', 'S02', 'S04', 'S05']
+    assert check_state(state, kept) == []
+
+
+def test_save_and_load_round_trip(tmp_path):
+    state = RollingState.from_history(_history(n_symbols=3), VOL_DAYS, DRAWDOWN_DAYS, version='v1')
+    path = str(tmp_path / "rolling_state.npz")
+    state.save(path)
+    loaded = RollingState.load(path)
+    assert loaded.version == 'v1'
+    pd.testing.assert_frame_equal(loaded.current(), state.current())
+    copied = RollingState.from_arrays(state.arrays())
+    pd.testing.assert_frame_equal(copied.current(), state.current())
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from datastore import DATA_DIR_ENV, VersionWriter, current_version, read_dataset, read_partition
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(DATA_DIR_ENV, str(tmp_path))
+
+
+def _chunk(symbols, n_days=5):
+    dates = pd.bdate_range("2025-01-01", periods=n_days)
+    return pd.DataFrame({
+        'symbol': np.repeat(symbols, n_days),
+        'Date': np.tile(dates, len(symbols)),
+        'Close': np.arange(len(symbols) * n_days, dtype=np.float64) + 0.5,
+        # Multi-byte characters: byte offsets and character counts differ
+        'download_time': "2025-01-01 18:00 €",
+    })
+
+
+def test_partitions_read_back_by_byte_range():
+    chunks = [_chunk(['AAA', 'ÄBB']), _chunk(['ÇCC']), _chunk(['ÉAA', 'ÉÉÉ'])]
+    writer = VersionWriter()
+    for chunk in chunks:
+        writer.append(chunk)
+    version = writer.publish()
+    assert current_version() == version
+
+    for chunk in chunks:
+        for symbol in chunk['symbol'].unique():
+            partition = read_partition(version, symbol)
+            pd.testing.assert_frame_equal(partition.reset_index(drop=True), chunk.reset_index(drop=True), check_dtype=False)
+    full = read_dataset(version)
+    assert len(full) == sum(len(chunk) for chunk in chunks)
+    assert read_partition(version, 'ÿÿÿ').empty
+
+
+def test_chunks_must_arrive_in_symbol_order():
+    writer = VersionWriter()
+    writer.append(_chunk(['BBB']))
+    with pytest.raises(ValueError):
+        writer.append(_chunk(['AAA']))
+    writer.abort()
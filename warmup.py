@@ -0,0 +1,118 @@
+import time
+
+import pandas as pd
+
+from analytics import calculate_summary_statistics, build_portfolio_context, SUMMARY_METRICS
+from charts import (
+    normalized_performance_series, cached_figure_spec, basket_figure_inputs,
+    create_risk_return_scatter, create_performance_chart, create_portfolio_metrics_chart,
+    create_correlation_heatmap, DEFAULT_POINT_BUDGET,
+)
+from compute_cache import get_cache, make_key
+from correlation import build_wide_returns, IncrementalCorrelation
+from datastore import current_version, read_dataset
+from insights import build_insight_table
+from reference_data import QUICK_CATEGORIES, SECTOR_MAPPING
+
+# Cache warm-up: precompute what the app shows for its most common entry points
+# (quick categories and sectors, default date range) under exactly the keys the
+# app looks up, so the first click after a publish is served from cache.
+# The app shares these caches by name; across processes they are shared through
+# the disk tier (BULLBOARD_CACHE_DIR).
+
+
+def entry_point_baskets(unique_symbols):
+    """(label, basket) for every quick category and sector, ordered the way the UI builds them"""
+    available = set(unique_symbols)
+    baskets = []
+    for category_name, stocks in QUICK_CATEGORIES.items():
+        # A category click appends its stocks in listed order, skipping unknown symbols
+        basket = list(dict.fromkeys(stock for stock in stocks if stock in available))
+        if basket:
+            baskets.append((f"category:{category_name}", basket))
+    for sector, stocks in SECTOR_MAPPING.items():
+        # Sector selections are offered sorted
+        basket = sorted(set(stocks) & available)
+        if basket:
+            baskets.append((f"sector:{sector}", basket))
+    return baskets
+
+
+def default_analysis_window(df, symbols):
+    """Rows for a basket over its full date range, as the app's date picker defaults to"""
+    filtered_df = df[df['symbol'].isin(symbols)]
+    if filtered_df.empty:
+        return filtered_df, None, None
+    start_date = filtered_df['Date'].min().date()
+    end_date = filtered_df['Date'].max().date()
+    filtered_df = filtered_df[
+        (filtered_df['Date'] >= pd.to_datetime(start_date)) &
+        (filtered_df['Date'] <= pd.to_datetime(end_date))
+    ]
+    return filtered_df, start_date, end_date
+
+
+def warm_basket(df, version, symbols, correlation_engine):
+    """Summary, insight table and all four chart specs for one basket"""
+    filtered_df, start_date, end_date = default_analysis_window(df, symbols)
+    if filtered_df.empty:
+        return False
+
+    summary_key = make_key(version, symbols, (start_date, end_date), SUMMARY_METRICS)
+    summary = get_cache("summary_statistics", max_bytes=64 * 1024 * 1024).get_or_compute(
+        summary_key, lambda: calculate_summary_statistics(filtered_df, SUMMARY_METRICS)
+    )
+    if summary.empty:
+        return False
+
+    portfolio_context = build_portfolio_context(summary, symbols)
+    get_cache("insight_tables", max_bytes=32 * 1024 * 1024).get_or_compute(
+        summary_key, lambda: build_insight_table(summary, portfolio_context)
+    )
+
+    cached_figure_spec(version, "risk_return", summary_key[1:], lambda: create_risk_return_scatter(summary))
+    cached_figure_spec(
+        version, "performance",
+        basket_figure_inputs(symbols, start_date, end_date, DEFAULT_POINT_BUDGET),
+        lambda: create_performance_chart(normalized_performance_series(filtered_df, symbols, DEFAULT_POINT_BUDGET))
+    )
+    cached_figure_spec(version, "portfolio_metrics", summary_key[1:], lambda: create_portfolio_metrics_chart(summary))
+    if len(symbols) > 1:
+        def build_heatmap():
+            correlation_engine.set_basket(symbols)
+            return create_correlation_heatmap(correlation_engine.correlation(symbols, start_date, end_date))
+        cached_figure_spec(
+            version, "correlation_heatmap", basket_figure_inputs(symbols, start_date, end_date), build_heatmap
+        )
+    return True
+
+
+def warm_entry_point_caches(df=None, version=None):
+    """Warm every quick-category and sector basket for the published dataset; returns a run report"""
+    start = time.perf_counter()
+    if version is None:
+        version = current_version()
+    if df is None:
+        df = read_dataset(version)
+
+    wide = get_cache("wide_returns", max_bytes=256 * 1024 * 1024).get_or_compute(
+        (version,), lambda: build_wide_returns(df)
+    )
+    correlation_engine = IncrementalCorrelation(wide)
+
+    baskets = entry_point_baskets(sorted(df['symbol'].unique()))
+    warmed, failed = 0, []
+    for label, symbols in baskets:
+        try:
+            if warm_basket(df, version, symbols, correlation_engine):
+                warmed += 1
+        except Exception as e:
+            failed.append(f"{label}: {e}")
+
+    return {
+        'dataset_version': version,
+        'baskets': len(baskets),
+        'warmed': warmed,
+        'failed': failed,
+        'elapsed_s': round(time.perf_counter() - start, 2),
+    }